@@ -0,0 +1,538 @@
+#!/usr/bin/env python
+
+########################################################################
+# Bench.py:
+# This is the Benchmark Module of PETRUS tool
+#
+#  Project:        PETRUS
+#  File:           Bench.py
+#  Date(YY/MM/DD): 01/02/21
+#
+#   Author: GNSS Academy
+#   Copyright 2021 GNSS Academy
+#
+# -----------------------------------------------------------------
+# Date       | Author             | Action
+# -----------------------------------------------------------------
+#
+# Usage:
+#   Bench.py $BENCH_DIR [$SUITE [$BASELINE_FILE]]
+#
+# Times the PETRUS processing on fixed synthetic scenarios written by
+# ScenGen.py under BENCH_DIR (generated on the first run and reused
+# afterwards). SUITE (ALL) may be:
+#   MICRO: each stage of the epoch hot path (reading of the OBS, SAT
+#          and LOS files, Preprocessing, Corrections and SPVT with the
+#          epoch by epoch and the block engines, Performances,
+#          PREPRO/CORR/POS/PERF writers and POS plots) on
+#          BENCH_MICRO_EPOCHS epochs of one receiver
+#   E2E:   whole Petrus.py runs of one day of BENCH_E2E_RCVRS receivers
+#   ALL:   both of them
+# The results are written to BENCH_DIR/BENCH_RESULTS.json. If a
+# BASELINE_FILE (results of a previous run) is given, the benchmarks
+# slower than the baseline by more than BENCH_TOLERANCE are reported
+# as regressions and the exit status is 1
+########################################################################
+
+
+# Import External and Internal functions and Libraries
+#----------------------------------------------------------------------
+import sys, os
+import time, json, platform, subprocess
+import numpy as np
+from io import StringIO
+from contextlib import redirect_stdout
+from itertools import islice
+from collections import OrderedDict
+from COMMON import GnssConstants as Const
+from COMMON.Dates import convertJulianDay2YearMonthDay
+from COMMON.Dates import convertYearMonthDay2Doy
+from InputOutput import readConf
+from InputOutput import processConf
+from InputOutput import readRcvr
+from InputOutput import createOutputFile
+from InputOutput import openDataFile
+from InputOutput import openInputFile, closeInputFile
+from InputOutput import readObsEpochs
+from InputOutput import readCorrectInputs
+from InputOutput import generatePreproFile
+from InputOutput import generateCorrFile
+from InputOutput import generatePosFile
+from InputOutput import generatePerfFile
+from InputOutput import generateTimingFile
+from InputOutput import PreproHdr, CorrHdr, PosHdr, PerfHdr
+from InputOutput import ObsIdx, SatIdx, LosIdx, ServiceLevels
+from Preprocessing import initPrevPreproObsInfo, runPreProcMeas
+from Corrections import runCorrectMeas, runCorrectMeasBlock
+from Spvt import computeSpvtSolution, computeSpvtSolutionBlock
+from Perf import initPerfInfo, updatePerfEpoch, computePerf
+from ScenGen import generateScenario
+
+# Benchmark parameters
+#----------------------------------------------------------------------
+BENCH_REPEATS = 5                       # Repetitions of each micro benchmark
+BENCH_PLOT_REPEATS = 1                  # Repetitions of the plots benchmark
+BENCH_MICRO_EPOCHS = 1800               # Epochs of the micro benchmarks
+BENCH_MICRO_SATS = 24                   # Satellites of the micro scenario
+BENCH_E2E_RCVRS = [1, 10, 100]          # Receivers of the end-to-end runs
+BENCH_E2E_SAMPLING_RATE = 30            # Sampling rate of the end-to-end runs [s]
+BENCH_TOLERANCE = 0.10                  # Relative slowdown reported as regression
+
+# Configuration of the end-to-end runs: the PERF figures are not
+# generated, as they would hide the scaling of the processing
+BenchE2EConf = OrderedDict([("PERF_OUT", "0")])
+
+#----------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+#----------------------------------------------------------------------
+
+def displayUsage():
+    sys.stderr.write("ERROR: Please provide path to the benchmark directory, "\
+        "optionally followed by the suite (MICRO, E2E or ALL) and the path "\
+        "to a baseline results file\n")
+
+def setConfParam(ConfFile, Key, Value):
+
+    # Purpose: set the value of a configuration parameter, replacing
+    #          its line in the configuration file or appending it
+
+    # Parameters
+    # ==========
+    # ConfFile: str
+    #         Path to the configuration file
+    # Key: str
+    #         Configuration parameter
+    # Value: str
+    #         Value of the configuration parameter
+
+    # Returns
+    # =======
+    # Nothing
+
+    with open(ConfFile, 'r') as f:
+        Lines = f.readlines()
+
+    Lines = [Line for Line in Lines if Line.split()[:1] != [Key]]
+    Lines.append("%s %s\n" % (Key, Value))
+
+    with open(ConfFile, 'w') as f:
+        f.writelines(Lines)
+
+# End of setConfParam()
+
+def prepareScenario(Scen, NRcvr, SamplingRate, ConfParams):
+
+    # Purpose: generate a benchmark scenario of one day, if it does not
+    #          exist yet, and set its configuration parameters
+
+    # Parameters
+    # ==========
+    # Scen: str
+    #         Scenario directory
+    # NRcvr: int
+    #         Number of receivers
+    # SamplingRate: int
+    #         Observations sampling rate [s]
+    # ConfParams: dict
+    #         Configuration parameters to be set
+
+    # Returns
+    # =======
+    # ConfFile: str
+    #         Path to the configuration file
+
+    ConfFile = Scen + '/CFG/petrus.cfg'
+
+    # The scenario is generated once, with as many processes as
+    # available CPUs, and reused by the next runs
+    if not os.path.isfile(ConfFile):
+        generateScenario(Scen, NRcvr, 1, BENCH_MICRO_SATS, SamplingRate, 2, 0)
+
+    for Key, Value in ConfParams.items():
+        setConfParam(ConfFile, Key, Value)
+
+    return ConfFile
+
+# End of prepareScenario()
+
+def runBench(Results, Name, Repeats, NEpochs, Func, *Args):
+
+    # Purpose: time a benchmark, keeping the best and median wall times
+    #          of several repetitions
+
+    # Parameters
+    # ==========
+    # Results: dict
+    #         Benchmark results, updated with the benchmark
+    # Name: str
+    #         Benchmark name
+    # Repeats: int
+    #         Number of repetitions
+    # NEpochs: int
+    #         Number of epochs processed by each repetition
+    # Func: function
+    #         Benchmarked function
+    # Args: list
+    #         Arguments of Func
+
+    # Returns
+    # =======
+    # Result: any
+    #         Result of the last repetition of Func
+
+    Times = []
+    for Repeat in range(Repeats):
+        Wall = time.perf_counter()
+        Result = Func(*Args)
+        Times.append(time.perf_counter() - Wall)
+
+    Results[Name] = OrderedDict({
+        "Time": min(Times),                         # Best wall time [s]
+        "Median": float(np.median(Times)),          # Median wall time [s]
+        "Repeats": Repeats,                         # Number of repetitions
+        "Epochs": NEpochs,                          # Epochs per repetition
+        "EpochsPerSec": NEpochs / min(Times) if min(Times) > 0 else 0.0,
+    })
+
+    print("%-28s %10.4f %10.4f %8d %12.1f" % \
+        (Name, Results[Name]["Time"], Results[Name]["Median"],
+        NEpochs, Results[Name]["EpochsPerSec"]))
+
+    return Result
+
+# End of runBench()
+
+def benchReadObs(ObsFile, NEpochs):
+    fobs = openDataFile(ObsFile)
+    fobs.readline()
+    ObsEpochs = list(islice(readObsEpochs(fobs), NEpochs))
+    closeInputFile(fobs)
+
+    return ObsEpochs
+
+def benchPrepro(Conf, RcvrInfo, ObsEpochs):
+    PrevPreproObsInfo = initPrevPreproObsInfo(Conf)
+
+    return [runPreProcMeas(Conf, RcvrInfo, ObsInfo, PrevPreproObsInfo) \
+        for ObsInfo in ObsEpochs]
+
+def benchReadInputs(Conf, SatFile, LosFile, Sods):
+    # Read SAT and LOS info of the epochs as Petrus.py does
+    fsat = openInputFile(SatFile, SatIdx, Conf["INPUT_CACHE"])
+    flos = openInputFile(LosFile, LosIdx, Conf["INPUT_CACHE"])
+    Inputs = []
+    SodInputs = -1
+    for Sod in Sods:
+        if SodInputs < Sod:
+            SatInfo, LosInfo, SodInputs = readCorrectInputs(fsat, flos, Sod)
+        Inputs.append((SatInfo, LosInfo))
+    closeInputFile(fsat)
+    closeInputFile(flos)
+
+    return Inputs
+
+def benchCorr(Conf, RcvrInfo, EpochsInfo):
+    return [runCorrectMeas(Conf, RcvrInfo, PreproObsInfo, SatInfo, LosInfo) \
+        for PreproObsInfo, SatInfo, LosInfo in EpochsInfo]
+
+def benchSpvt(Conf, RcvrInfo, CorrInfoList):
+    return [computeSpvtSolution(Conf, RcvrInfo, CorrInfo) \
+        for CorrInfo in CorrInfoList]
+
+def benchCorrBlock(Conf, RcvrInfo, EpochsInfo):
+    # Blocks of CORR_BLOCK_EPOCHS epochs, as Petrus.py corrects them
+    CorrInfoList = []
+    for Epoch in range(0, len(EpochsInfo), Const.CORR_BLOCK_EPOCHS):
+        CorrInfoList.extend(runCorrectMeasBlock(Conf, RcvrInfo,
+            EpochsInfo[Epoch:Epoch + Const.CORR_BLOCK_EPOCHS]))
+
+    return CorrInfoList
+
+def benchSpvtBlock(Conf, RcvrInfo, CorrInfoList):
+    # Blocks of CORR_BLOCK_EPOCHS epochs, as Petrus.py solves them
+    PosInfoList = []
+    for Epoch in range(0, len(CorrInfoList), Const.CORR_BLOCK_EPOCHS):
+        PosInfoList.extend(computeSpvtSolutionBlock(Conf, RcvrInfo,
+            CorrInfoList[Epoch:Epoch + Const.CORR_BLOCK_EPOCHS]))
+
+    return PosInfoList
+
+def benchPerf(Conf, Rcvr, RcvrInfo, Doy, PosInfoList):
+    PerfInfo = OrderedDict({})
+    VpeHistInfo = OrderedDict({})
+    initPerfInfo(Conf, list(ServiceLevels), Rcvr, RcvrInfo, Doy, PerfInfo, VpeHistInfo)
+    for PosInfo in PosInfoList:
+        if len(PosInfo) > 0:
+            for Service, PerfInfoSer in PerfInfo.items():
+                if Service != "NPA":
+                    updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer)
+    for PerfInfoSer in PerfInfo.values():
+        computePerf(PerfInfoSer)
+
+    return PerfInfo
+
+def benchWriter(OutFile, Hdr, WriteFunc, InfoList, *WriteArgs):
+    # Messages of the repetitions are not displayed
+    with redirect_stdout(StringIO()):
+        f = createOutputFile(OutFile, Hdr)
+    for Info in InfoList:
+        WriteFunc(f, Info, *WriteArgs)
+    f.close()
+
+def runMicroSuite(BenchDir, Results):
+
+    # Purpose: time each stage of the epoch hot path on the first
+    #          BENCH_MICRO_EPOCHS epochs of the micro scenario
+
+    # Parameters
+    # ==========
+    # BenchDir: str
+    #         Benchmark directory
+    # Results: dict
+    #         Benchmark results, updated with the micro benchmarks
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Get the micro scenario, sampled at 1 Hz
+    Scen = BenchDir + '/MICRO'
+    ConfFile = prepareScenario(Scen, 1, 1, OrderedDict({}))
+
+    # Read the configuration and the receiver
+    Conf = processConf(readConf(ConfFile))
+    RcvrInfo = readRcvr(Scen + '/INP/RCVR/RCVR.dat')
+    Rcvr = list(RcvrInfo.keys())[0]
+    Year, Month, Day = convertJulianDay2YearMonthDay(Conf["INI_DATE_JD"])
+    Doy = convertYearMonthDay2Doy(Year, Month, Day)
+    Suffix = "%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
+
+    print("\nINFO: Micro benchmarks on %d epochs of %s" % (BENCH_MICRO_EPOCHS, Suffix))
+    print("%-28s %10s %10s %8s %12s" % \
+        ("BENCHMARK", "BEST[s]", "MEDIAN[s]", "EPOCHS", "EPOCHS/s"))
+
+    # Each stage is fed with the results of the previous one
+    ObsEpochs = runBench(Results, "readObsEpochs", BENCH_REPEATS, BENCH_MICRO_EPOCHS,
+        benchReadObs, Scen + '/INP/OBS/OBS_' + Suffix, BENCH_MICRO_EPOCHS)
+    NEpochs = len(ObsEpochs)
+
+    PreproObsInfoList = runBench(Results, "runPreProcMeas", BENCH_REPEATS, NEpochs,
+        benchPrepro, Conf, RcvrInfo[Rcvr], ObsEpochs)
+
+    Sods = [int(float(ObsInfo[0][ObsIdx["SOD"]])) for ObsInfo in ObsEpochs]
+    Inputs = runBench(Results, "readCorrectInputs", BENCH_REPEATS, NEpochs,
+        benchReadInputs, Conf, Scen + '/OUT/SAT/SAT_' + Suffix,
+        Scen + '/OUT/LOS/LOS_' + Suffix, Sods)
+
+    # Epochs with SAT and LOS info, as Petrus.py corrects them
+    EpochsInfo = [(PreproObsInfo, SatInfo, LosInfo) \
+        for PreproObsInfo, (SatInfo, LosInfo) in zip(PreproObsInfoList, Inputs) \
+            if SatInfo != [] and LosInfo != []]
+
+    CorrInfoList = runBench(Results, "runCorrectMeas", BENCH_REPEATS, len(EpochsInfo),
+        benchCorr, Conf, RcvrInfo[Rcvr], EpochsInfo)
+
+    PosInfoList = runBench(Results, "computeSpvtSolution", BENCH_REPEATS, len(CorrInfoList),
+        benchSpvt, Conf, RcvrInfo[Rcvr], CorrInfoList)
+
+    # Whole-epoch Corrections engine and block SPVT engine
+    BlockConf = dict(Conf)
+    BlockConf["CORR_ENGINE"] = 1
+    BlockConf["SPVT_ENGINE"] = 1
+
+    runBench(Results, "runCorrectMeasBlock", BENCH_REPEATS, len(EpochsInfo),
+        benchCorrBlock, BlockConf, RcvrInfo[Rcvr], EpochsInfo)
+
+    runBench(Results, "computeSpvtSolutionBlock", BENCH_REPEATS, len(CorrInfoList),
+        benchSpvtBlock, BlockConf, RcvrInfo[Rcvr], CorrInfoList)
+
+    PerfInfo = runBench(Results, "updatePerfEpoch", BENCH_REPEATS, len(PosInfoList),
+        benchPerf, Conf, Rcvr, RcvrInfo[Rcvr], Doy, PosInfoList)
+
+    # Writers
+    runBench(Results, "generatePreproFile", BENCH_REPEATS, NEpochs,
+        benchWriter, Scen + '/OUT/PPVE/PREPRO_OBS_' + Suffix, PreproHdr,
+        generatePreproFile, PreproObsInfoList)
+
+    runBench(Results, "generateCorrFile", BENCH_REPEATS, len(CorrInfoList),
+        benchWriter, Scen + '/OUT/CORR/CORR_' + Suffix, CorrHdr,
+        generateCorrFile, CorrInfoList)
+
+    PosInfoList = [PosInfo for PosInfo in PosInfoList if len(PosInfo) > 0]
+    PosFile = Scen + '/OUT/SPVT/POS_' + Suffix
+    runBench(Results, "generatePosFile", BENCH_REPEATS, len(PosInfoList),
+        benchWriter, PosFile, PosHdr, generatePosFile, PosInfoList, Rcvr)
+
+    # One PERF row per service level
+    runBench(Results, "generatePerfFile", BENCH_REPEATS, len(PerfInfo),
+        benchWriter, Scen + '/OUT/PERF/PERF_' + Suffix, PerfHdr,
+        generatePerfFile, PerfInfo.values())
+
+    # The plots are saved under the scenario given as first argument.
+    # A failure of the plotting stack is recorded without stopping the
+    # benchmarks
+    Argv = sys.argv[:]
+    sys.argv[1:] = [Scen]
+    try:
+        from PosPlots import generatePosPlots
+        runBench(Results, "generatePosPlots", BENCH_PLOT_REPEATS, len(PosInfoList),
+            generatePosPlots, Conf, PosFile)
+    except Exception as Error:
+        sys.stderr.write("WARNING: generatePosPlots failed: %s: %s\n" % \
+            (type(Error).__name__, Error))
+        Results["generatePosPlots"] = OrderedDict({
+            "Error": "%s: %s" % (type(Error).__name__, Error),
+        })
+    finally:
+        sys.argv[:] = Argv
+
+# End of runMicroSuite()
+
+def runE2ESuite(BenchDir, Results):
+
+    # Purpose: time whole Petrus.py runs of one day of BENCH_E2E_RCVRS
+    #          receivers
+
+    # Parameters
+    # ==========
+    # BenchDir: str
+    #         Benchmark directory
+    # Results: dict
+    #         Benchmark results, updated with the end-to-end benchmarks
+
+    # Returns
+    # =======
+    # Nothing
+
+    PetrusPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Petrus.py')
+
+    # Generate the scenarios before timing any run
+    Scens = OrderedDict({})
+    for NRcvr in BENCH_E2E_RCVRS:
+        Scens[NRcvr] = BenchDir + '/E2E_%03d' % NRcvr
+        prepareScenario(Scens[NRcvr], NRcvr, BENCH_E2E_SAMPLING_RATE, BenchE2EConf)
+
+    print("\nINFO: End-to-end benchmarks at %d s sampling rate" % BENCH_E2E_SAMPLING_RATE)
+    print("%-28s %10s %10s %8s %12s" % \
+        ("BENCHMARK", "BEST[s]", "MEDIAN[s]", "EPOCHS", "EPOCHS/s"))
+
+    for NRcvr, Scen in Scens.items():
+        LogFile = Scen + '/BENCH_LOG.txt'
+
+        # Function running Petrus.py on the scenario, with its messages
+        # saved to the log file
+        def runPetrus():
+            with open(LogFile, 'w') as flog:
+                Status = subprocess.call([sys.executable, PetrusPath, Scen],
+                    stdout=flog, stderr=subprocess.STDOUT)
+            if Status != 0:
+                sys.stderr.write("ERROR: Petrus.py failed on %s (see %s)\n" % \
+                    (Scen, LogFile))
+                sys.exit(1)
+
+        runBench(Results, "Petrus_%03d" % NRcvr, 1,
+            NRcvr * Const.S_IN_D // BENCH_E2E_SAMPLING_RATE, runPetrus)
+
+# End of runE2ESuite()
+
+def compareBench(Results, BaselineFile):
+
+    # Purpose: compare the benchmark results with a baseline
+
+    # Parameters
+    # ==========
+    # Results: dict
+    #         Benchmark results
+    # BaselineFile: str
+    #         Path to the baseline results file
+
+    # Returns
+    # =======
+    # Regressions: list
+    #         Benchmarks slower than the baseline by more than
+    #         BENCH_TOLERANCE
+
+    with open(BaselineFile, 'r') as f:
+        Baseline = json.load(f)["Benchmarks"]
+
+    print("\nINFO: Comparison with baseline: %s (tolerance %.0f%%)" % \
+        (BaselineFile, 100 * BENCH_TOLERANCE))
+    print("%-28s %10s %10s %8s" % ("BENCHMARK", "BASE[s]", "TIME[s]", "RATIO"))
+
+    Regressions = []
+    for Name, Report in Results["Benchmarks"].items():
+        # Failed benchmarks or benchmarks not in the baseline cannot be
+        # compared
+        if "Time" not in Report or "Time" not in Baseline.get(Name, {}) or \
+            Baseline[Name]["Time"] <= 0:
+            continue
+
+        Ratio = Report["Time"] / Baseline[Name]["Time"]
+        Status = ""
+        if Ratio > 1.0 + BENCH_TOLERANCE:
+            Status = "REGRESSION"
+            Regressions.append(Name)
+
+        print("%-28s %10.4f %10.4f %8.3f %s" % \
+            (Name, Baseline[Name]["Time"], Report["Time"], Ratio, Status))
+
+    return Regressions
+
+# End of compareBench()
+
+#######################################################
+# MAIN BODY
+#######################################################
+
+if __name__ == "__main__":
+    # Check InputOutput Arguments
+    if len(sys.argv) < 2 or len(sys.argv) > 4:
+        displayUsage()
+        sys.exit()
+
+    # Extract the arguments
+    BenchDir = os.path.abspath(sys.argv[1])
+    Suite = sys.argv[2].upper() if len(sys.argv) > 2 else "ALL"
+    BaselineFile = sys.argv[3] if len(sys.argv) > 3 else None
+
+    # Check the arguments
+    if Suite not in ["MICRO", "E2E", "ALL"]:
+        displayUsage()
+        sys.exit(1)
+
+    if BaselineFile is not None and not os.path.isfile(BaselineFile):
+        sys.stderr.write("ERROR: Baseline file %s does not exist\n" % BaselineFile)
+        sys.exit(1)
+
+    # Initialize the results with the platform information
+    Results = OrderedDict({})
+    Results["Date"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    Results["Python"] = platform.python_version()
+    Results["Numpy"] = np.__version__
+    Results["Platform"] = platform.platform()
+    Results["Cpus"] = os.cpu_count()
+    Results["Suite"] = Suite
+    Results["Benchmarks"] = OrderedDict({})
+
+    # Run the benchmarks
+    if Suite in ["MICRO", "ALL"]:
+        runMicroSuite(BenchDir, Results["Benchmarks"])
+
+    if Suite in ["E2E", "ALL"]:
+        runE2ESuite(BenchDir, Results["Benchmarks"])
+
+    # Write the results
+    generateTimingFile(BenchDir + '/BENCH_RESULTS.json', Results)
+
+    # Compare with the baseline, if given
+    if BaselineFile is not None:
+        Regressions = compareBench(Results, BaselineFile)
+
+        if len(Regressions) > 0:
+            sys.stderr.write("ERROR: %d benchmarks regressed: %s\n" % \
+                (len(Regressions), ", ".join(Regressions)))
+            sys.exit(1)
+
+#######################################################
+# End of Bench.py
+#######################################################
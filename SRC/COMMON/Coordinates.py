@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 # Ref.: ESA_GNSS-Book_TM-23_Vol_I.pdf Section B.1.2 (Appendix B)
 def xyz2llh(x,y,z):
@@ -36,3 +37,13 @@ def llh2xyz(lon,lat,h):
     Z = ((1-0.0066943799901)*N + h)*(math.sin(math.radians(lat))) 
 
     return X,Y,Z
+
+# Same as llh2xyz, for arrays of positions
+def llh2xyzArray(lon,lat,h):
+    N = (6378137.0 / np.sqrt(1 - 0.0066943799901*(np.sin(np.radians(lat))**2)))
+
+    X = (N+h)*(np.cos(np.radians(lat))*np.cos(np.radians(lon)))
+    Y = (N+h)*(np.cos(np.radians(lat))*np.sin(np.radians(lon)))
+    Z = ((1-0.0066943799901)*N + h)*(np.sin(np.radians(lat)))
+
+    return X,Y,Z
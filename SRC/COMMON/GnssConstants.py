@@ -177,3 +177,20 @@ MAX_NUM_USRS = 1000
 
 # Maximum number of Receivers in RCVR (dimensioning constant)
 MAX_NUM_RCVR = 1000
+
+# Maximum number of parallel receiver-day jobs (dimensioning constant)
+MAX_NUM_JOBS = 1024
+
+# Number of epochs processed together by the whole-epoch Corrections
+# engine and the block SPVT engine
+CORR_BLOCK_EPOCHS = 300
+
+# Resolution of the HPE and VPE histograms in meters
+PERF_HIST_RES = 0.001
+
+# Range of the HPE and VPE histograms in meters (larger errors fall in
+# overflow bins)
+PERF_HIST_RANGE = 100.0
+
+# Default compression level of compressed output files (1 to 9)
+COMPRESSION_LEVEL = 6
@@ -4,13 +4,6 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 import numpy as np
-import conda
-CondaFileDir = conda.__file__
-CondaDir = CondaFileDir.split('lib')[0]
-ProjLib = os.path.join(os.path.join(CondaDir, 'share'), 'proj')
-os.environ["PROJ_LIB"] = ProjLib
-from mpl_toolkits.basemap import Basemap
-from scipy.stats import norm
 
 import warnings
 import matplotlib.cbook
@@ -176,6 +169,13 @@ def prepareColorBar(PlotConf, ax, Values, Polar = 0):
     return normalize, cmap
 
 def drawMap(PlotConf, ax,):
+    import conda
+    CondaFileDir = conda.__file__
+    CondaDir = CondaFileDir.split('lib')[0]
+    ProjLib = os.path.join(os.path.join(CondaDir, 'share'), 'proj')
+    os.environ["PROJ_LIB"] = ProjLib
+    from mpl_toolkits.basemap import Basemap
+
     Map = Basemap(projection = 'cyl',
     llcrnrlat  = PlotConf["LatMin"]-0,
     urcrnrlat  = PlotConf["LatMax"]+0,
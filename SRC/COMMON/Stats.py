@@ -1,6 +1,5 @@
-from collections import OrderedDict
+import numpy as np
 from numpy import sqrt
-from scipy.special import erfinv
 
 def updateMin(CurrentMin, Value):
     return min(CurrentMin, Value)
@@ -8,41 +7,88 @@ def updateMin(CurrentMin, Value):
 def updateMax(CurrentMax, Value):
     return max(CurrentMax, Value)
 
-def updateHist(Hist, Value, Resolution):
-    Bin = float(int(Value/Resolution)) * Resolution
-    if Bin in Hist:
-        Hist[Bin] = Hist[Bin] + 1
+def initHist(Resolution, Range):
+    # Histogram of non-negative values with fixed bins of Resolution
+    # width: a preallocated counts array covers [0, Range) and values
+    # beyond fall in sparse overflow bins, so no sample is lost
+    return {
+        "Res": Resolution,                                              # Bin width
+        "Counts": np.zeros(int(round(Range / Resolution)), dtype=np.int64), # Bin counts
+        "Overflow": {},                                                 # Overflow bin counts per bin index
+    }
+
+def updateHist(Hist, Value):
+    Idx = int(Value/Hist["Res"])
+    if Idx < len(Hist["Counts"]):
+        Hist["Counts"][Idx] += 1
 
     else:
-        Hist[Bin] = 1
-
-def computeCdfFromHistogram(Histogram, NSamples):
-    # Sort histogram
-    SortedHist = OrderedDict({})
-    for key in sorted(Histogram.keys()):
-        SortedHist[key] = Histogram[key]
-    Cdf = OrderedDict({})
-    Sigmas = OrderedDict({})
-    CumulatedSamples = 0
-    for Bin, Samples in SortedHist.items():
-        CumulatedSamples = CumulatedSamples + Samples
-        Cdf[Bin] = float(CumulatedSamples) / NSamples
-        # Compute Sigmas
-        Sigmas[Bin] = float(Bin/(sqrt(2)*erfinv(Cdf[Bin])))
-
-    return Cdf, Sigmas
-
-def computePercentile(Cdf, Percentile):
-    for Bin, Freq in Cdf.items():
-        if (Freq * 100) > Percentile:
-            return Bin
+        Hist["Overflow"][Idx] = Hist["Overflow"].get(Idx, 0) + 1
+
+def getHistBins(Hist):
+    # Get the lower bound and the number of samples of the non-empty
+    # bins, sorted
+    Idx = np.flatnonzero(Hist["Counts"])
+    Samples = Hist["Counts"][Idx]
+    if len(Hist["Overflow"]) > 0:
+        OverIdx = sorted(Hist["Overflow"].keys())
+        Idx = np.concatenate([Idx, OverIdx])
+        Samples = np.concatenate([Samples, [Hist["Overflow"][i] for i in OverIdx]])
+
+    return Idx.astype(float) * Hist["Res"], Samples
+
+def computeCdfFromHistogram(Hist, NSamples):
+    Bins, Samples = getHistBins(Hist)
+    Cdf = np.cumsum(Samples) / float(NSamples)
+    # Compute Sigmas
+    from scipy.special import erfinv
+    Sigmas = Bins/(sqrt(2)*erfinv(Cdf))
+
+    return Bins, Cdf, Sigmas
+
+def computePercentile(Bins, Cdf, Percentile):
+    Above = np.flatnonzero((Cdf * 100) > Percentile)
+    if len(Above) > 0:
+        return Bins[Above[0]].item()
 
     return Cdf
 
-def computeOverbound(Sigmas, ThresholdBin):
-    SigmaOver = 0.0
-    for Bin, Sigma in Sigmas.items():
-        if Bin >= ThresholdBin:
-            SigmaOver = updateMax(SigmaOver, Sigma)
+def computeOverbound(Bins, Sigmas, ThresholdBin):
+    SigmaOver = np.max(Sigmas[Bins >= ThresholdBin], initial=0.0)
+
+    return SigmaOver.item()
+
+def mergeHist(HistA, HistB):
+    # Add the samples of two histograms with the same bins
+    Overflow = dict(HistA["Overflow"])
+    for Idx, Samples in HistB["Overflow"].items():
+        Overflow[Idx] = Overflow.get(Idx, 0) + Samples
+
+    return {
+        "Res": HistA["Res"],
+        "Counts": HistA["Counts"] + HistB["Counts"],
+        "Overflow": Overflow,
+    }
+
+def packHist(Hist):
+    # Get a JSON serializable copy of the histogram, keeping only the
+    # non-empty bins
+    Idx = np.flatnonzero(Hist["Counts"])
+    return {
+        "Res": Hist["Res"],
+        "NBins": len(Hist["Counts"]),
+        "Idx": Idx.tolist(),
+        "Samples": Hist["Counts"][Idx].tolist(),
+        "Overflow": [[Idx, Samples] for Idx, Samples in sorted(Hist["Overflow"].items())],
+    }
+
+def unpackHist(Packed):
+    # Rebuild a histogram from its packed copy
+    Hist = {
+        "Res": Packed["Res"],
+        "Counts": np.zeros(Packed["NBins"], dtype=np.int64),
+        "Overflow": {Idx: Samples for Idx, Samples in Packed["Overflow"]},
+    }
+    Hist["Counts"][Packed["Idx"]] = Packed["Samples"]
 
-    return SigmaOver
\ No newline at end of file
+    return Hist
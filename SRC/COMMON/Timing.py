@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+import time
+import numpy as np
+from collections import OrderedDict
+
+def initTiming():
+
+    # Purpose: initialize the timing of the processing stages of a
+    #          receiver-day: wall and CPU time, number of calls and
+    #          duration of each call per stage
+
+    # Parameters
+    # ==========
+    # None
+
+    # Returns
+    # =======
+    # Timing: dict
+    #         Timing information, started at the current time
+
+    return {
+        "Epochs": 0,                                # Number of epochs read
+        "Wall": time.perf_counter(),                # Start wall time
+        "Cpu": time.process_time(),                 # Start CPU time
+        "Stages": OrderedDict({}),                  # Timing per stage
+    }
+
+# End of initTiming()
+
+def initStage(Timing, Stage):
+
+    # Purpose: get the timing of a stage, initializing it if needed
+
+    # Parameters
+    # ==========
+    # Timing: dict
+    #         Timing information, as given by initTiming
+    # Stage: str
+    #         Stage name
+
+    # Returns
+    # =======
+    # StageInfo: dict
+    #         Timing of the stage
+
+    if Stage not in Timing["Stages"]:
+        Timing["Stages"][Stage] = {
+            "Calls": 0,                             # Number of calls
+            "Wall": 0.0,                            # Wall time [s]
+            "Cpu": 0.0,                             # CPU time of the calling thread [s]
+            "Times": [],                            # Wall time of each call [s]
+        }
+
+    return Timing["Stages"][Stage]
+
+# End of initStage()
+
+def updateStage(StageInfo, Wall, Cpu):
+
+    # Purpose: add a call to the timing of a stage
+
+    # Parameters
+    # ==========
+    # StageInfo: dict
+    #         Timing of the stage, as given by initStage
+    # Wall: float
+    #         Wall time of the call [s]
+    # Cpu: float
+    #         CPU time of the call [s]
+
+    # Returns
+    # =======
+    # Nothing
+
+    StageInfo["Calls"] += 1
+    StageInfo["Wall"] += Wall
+    StageInfo["Cpu"] += Cpu
+    StageInfo["Times"].append(Wall)
+
+# End of updateStage()
+
+def timeStage(Timing, Func, Stage=None):
+
+    # Purpose: get a version of Func recording its timing under Stage.
+    #          If timing is not activated, Func itself is returned, so
+    #          that it has no overhead
+
+    # Parameters
+    # ==========
+    # Timing: dict
+    #         Timing information, as given by initTiming (None if
+    #         timing is not activated)
+    # Func: function
+    #         Function to be timed
+    # Stage: str
+    #         Stage name (Func name by default)
+
+    # Returns
+    # =======
+    # timedFunc: function
+    #         Func recording its timing
+
+    if Timing is None:
+        return Func
+
+    StageInfo = initStage(Timing, Stage if Stage is not None else Func.__name__)
+
+    def timedFunc(*Args, **KwArgs):
+        Wall = time.perf_counter()
+        Cpu = time.thread_time()
+        Result = Func(*Args, **KwArgs)
+        updateStage(StageInfo, time.perf_counter() - Wall, time.thread_time() - Cpu)
+
+        return Result
+
+    return timedFunc
+
+# End of timeStage()
+
+def timeEpochs(Timing, Epochs, Stage):
+
+    # Purpose: get an iterator over Epochs recording the time spent
+    #          getting each epoch under Stage and the time spent
+    #          processing it (until the next one is requested) under
+    #          "EPOCH". If timing is not activated, Epochs itself is
+    #          returned
+
+    # Parameters
+    # ==========
+    # Timing: dict
+    #         Timing information, as given by initTiming (None if
+    #         timing is not activated)
+    # Epochs: iterable
+    #         Epochs to be processed
+    # Stage: str
+    #         Name of the stage reading the epochs
+
+    # Returns
+    # =======
+    # Epochs: iterator
+    #         Epochs recording their timing
+
+    if Timing is None:
+        return Epochs
+
+    return timedEpochs(Timing, iter(Epochs), initStage(Timing, Stage),
+        initStage(Timing, "EPOCH"))
+
+# End of timeEpochs()
+
+def timedEpochs(Timing, Epochs, StageInfo, EpochInfo):
+
+    # Purpose: generator behind timeEpochs, yielding the epochs and
+    #          recording the reading and processing time of each one
+
+    # Parameters
+    # ==========
+    # Timing: dict
+    #         Timing information, as given by initTiming
+    # Epochs: iterator
+    #         Epochs to be processed
+    # StageInfo: dict
+    #         Timing of the stage reading the epochs
+    # EpochInfo: dict
+    #         Timing of the processing of the epochs
+
+    # Returns
+    # =======
+    # Epoch: any
+    #         Each epoch of Epochs (yielded)
+
+    while True:
+        Wall = time.perf_counter()
+        Cpu = time.thread_time()
+        try:
+            Epoch = next(Epochs)
+        except StopIteration:
+            StageInfo["Wall"] += time.perf_counter() - Wall
+            StageInfo["Cpu"] += time.thread_time() - Cpu
+            return
+        Timing["Epochs"] += 1
+
+        EpochWall = time.perf_counter()
+        EpochCpu = time.thread_time()
+        updateStage(StageInfo, EpochWall - Wall, EpochCpu - Cpu)
+
+        yield Epoch
+
+        updateStage(EpochInfo, time.perf_counter() - EpochWall, time.thread_time() - EpochCpu)
+
+# End of timedEpochs()
+
+def computeTiming(Timing, Label):
+
+    # Purpose: summarize the timing of each stage: wall and CPU times,
+    #          number of calls, epochs per second of stage time and call
+    #          latency percentiles
+
+    # Parameters
+    # ==========
+    # Timing: dict
+    #         Timing information, as given by initTiming
+    # Label: str
+    #         Label of the report (receiver-day or ALL)
+
+    # Returns
+    # =======
+    # Report: dict
+    #         Timing report of the whole run and of each stage
+
+    Report = OrderedDict({})
+    Report["Label"] = Label
+    Report["Epochs"] = Timing["Epochs"]
+    Report["Wall"] = time.perf_counter() - Timing["Wall"]
+    Report["Cpu"] = time.process_time() - Timing["Cpu"]
+    Report["Stages"] = OrderedDict({})
+
+    for Stage, StageInfo in Timing["Stages"].items():
+        # Stages not run (e.g. the other Corrections engine) are skipped
+        if StageInfo["Calls"] == 0:
+            continue
+
+        Times = np.array(StageInfo["Times"])
+        Report["Stages"][Stage] = OrderedDict({
+            "Calls": StageInfo["Calls"],
+            "Wall": StageInfo["Wall"],
+            "Cpu": StageInfo["Cpu"],
+            "EpochsPerSec": Timing["Epochs"] / StageInfo["Wall"] \
+                if StageInfo["Wall"] > 0 else 0.0,
+            "P50": float(np.percentile(Times, 50)),
+            "P99": float(np.percentile(Times, 99)),
+        })
+
+    return Report
+
+# End of computeTiming()
+
+def printTiming(Report):
+
+    # Purpose: display a timing report as a table of stages
+
+    # Parameters
+    # ==========
+    # Report: dict
+    #         Timing report, as given by computeTiming
+
+    # Returns
+    # =======
+    # Nothing
+
+    print("\nINFO: Stage timing of %s (%d epochs, %.3f s wall, %.3f s CPU)" % \
+        (Report["Label"], Report["Epochs"], Report["Wall"], Report["Cpu"]))
+    print("%-28s %8s %10s %10s %6s %12s %10s %10s" % \
+        ("STAGE", "CALLS", "WALL[s]", "CPU[s]", "WALL%", "EPOCHS/s", "P50[ms]", "P99[ms]"))
+
+    for Stage, StageReport in Report["Stages"].items():
+        print("%-28s %8d %10.3f %10.3f %6.1f %12.1f %10.3f %10.3f" % \
+            (Stage, StageReport["Calls"], StageReport["Wall"], StageReport["Cpu"],
+            100.0 * StageReport["Wall"] / Report["Wall"] if Report["Wall"] > 0 else 0.0,
+            StageReport["EpochsPerSec"], 1e3 * StageReport["P50"], 1e3 * StageReport["P99"]))
+
+# End of printTiming()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 import numpy as np
 from COMMON import GnssConstants as Const
-from COMMON.Coordinates import llh2xyz
+from COMMON.Coordinates import llh2xyz, llh2xyzArray
 
 def buildResidualsVector(CorrInfo, PosInfo):
     PsrResiduals = []
@@ -27,7 +27,7 @@ def wlsq(Conf, CorrInfo, PosInfo, SMatrix):
     i = 0
     NormRcvrPosDelta = 9999.9
 
-    while i <= Conf["MAX_LSQ_ITER"] and NormRcvrPosDelta > Const.LSQ_DELTA_EPS:
+    while i <= Conf["PARAMS"].MaxLsqIter and NormRcvrPosDelta > Const.LSQ_DELTA_EPS:
 
         PsrResiduals = buildResidualsVector(CorrInfo, PosInfo)
 
@@ -51,6 +51,53 @@ def wlsq(Conf, CorrInfo, PosInfo, SMatrix):
         i += 1
 
     # If the wlsq iterative filter converges
-    if i < Conf["MAX_LSQ_ITER"]:
+    if i < Conf["PARAMS"].MaxLsqIter:
         # PA solution achieved
         PosInfo["Sol"] = 1
+
+def wlsqBlock(Conf, SatPos, CorrPsr, RcvrLlh, SMatrix, Active):
+
+    # Same iterative filter as wlsq, run at once for a block of epochs
+    # SatPos: (NEpochs, NSats, 3), CorrPsr: (NEpochs, NSats) and
+    # SMatrix: (NEpochs, 4, NSats) are padded to the maximum number of
+    # satellites (padded columns of SMatrix are zero)
+    # RcvrLlh: (NEpochs, 3) a priori receiver positions
+    # Active: epochs to be solved
+    # Returns the estimated Lon, Lat, Alt, Clk, Epe, Npe, Hpe, Vpe and
+    # the number of iterations per epoch
+
+    Lon, Lat, Alt = [np.array(RcvrLlh[:, Col]) for Col in range(3)]
+    Clk, Epe, Npe, Hpe, Vpe = [np.zeros(len(RcvrLlh)) for Field in range(5)]
+    Iter = np.zeros(len(RcvrLlh), dtype=int)
+    NormRcvrPosDelta = np.full(len(RcvrLlh), 9999.9)
+
+    Active = Active & (Iter <= Conf["PARAMS"].MaxLsqIter) & (NormRcvrPosDelta > Const.LSQ_DELTA_EPS)
+
+    while Active.any():
+
+        # Build the residuals vectors of the active epochs
+        RcvrPos = np.stack(llh2xyzArray(Lon[Active], Lat[Active], Alt[Active]), axis=-1)
+        GeomRange = np.linalg.norm(SatPos[Active] - RcvrPos[:, np.newaxis, :], axis=2)
+        PsrResiduals = CorrPsr[Active] - Clk[Active][:, np.newaxis] - GeomRange
+
+        RcvrPosDelta = np.matmul(SMatrix[Active], PsrResiduals[:, :, np.newaxis])[:, :, 0]
+
+        NormRcvrPosDelta[Active] = np.linalg.norm(RcvrPosDelta, axis=1)
+
+        # Update Rcvr estimated Position in Geodetic (LLH) and Clock Bias
+        Lat[Active] = Lat[Active] + np.rad2deg(RcvrPosDelta[:, 1] / Const.EARTH_RADIUS)
+        Lon[Active] = Lon[Active] + np.rad2deg(RcvrPosDelta[:, 0] / (Const.EARTH_RADIUS * np.cos(np.deg2rad(Lat[Active]))))
+        Alt[Active] = Alt[Active] + RcvrPosDelta[:, 2]
+        Clk[Active] = Clk[Active] + RcvrPosDelta[:, 3]
+
+        # Estimate ENU Position Errors and HPE and VPE
+        Epe[Active] = Epe[Active] + RcvrPosDelta[:, 0]
+        Npe[Active] = Npe[Active] + RcvrPosDelta[:, 1]
+        Hpe[Active] = np.sqrt(Epe[Active] * Epe[Active] + Npe[Active] * Npe[Active])
+        Vpe[Active] = Vpe[Active] + RcvrPosDelta[:, 2]
+
+        Iter[Active] += 1
+
+        Active = Active & (Iter <= Conf["PARAMS"].MaxLsqIter) & (NormRcvrPosDelta > Const.LSQ_DELTA_EPS)
+
+    return Lon, Lat, Alt, Clk, Epe, Npe, Hpe, Vpe, Iter
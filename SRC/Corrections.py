@@ -27,6 +27,7 @@ sys.path.insert(0, Common)
 from collections import OrderedDict
 from COMMON import GnssConstants as Const
 from InputOutput import RcvrIdx, SatIdx, LosIdx
+from InputOutput import convertEpochRows
 import numpy as np
 
 IgpIdx2Vertex = {
@@ -79,7 +80,7 @@ def computeSigmaFlt(SatInfo, CorrectInfo):
     # Reference: MOPS-DO-229D Section A.4.5.1
 
     # If RSS==0
-    if(SatInfo[SatIdx["RSS"]]=='0'):
+    if(int(SatInfo[SatIdx["RSS"]]) == 0):
         # Compute non-root-sum-squared
         CorrectInfo["SigmaFlt"] = (\
             (float(SatInfo[SatIdx["SIGMAUDRE"]]) * float(SatInfo[SatIdx["DELTAUDRE"]])) + \
@@ -124,7 +125,7 @@ def computeUisdAndUire(PreproInfo, LosInfo, CorrectInfo):
     # Reference: MOPS-DO-229D Section A.4.4.10.3
 
     # Rectangular interpolation
-    if(LosInfo[LosIdx["INTERP"]] == '0'):
+    if(int(LosInfo[LosIdx["INTERP"]]) == 0):
         # Case of IPP between S85 and N85
         if (float(LosInfo[LosIdx["IPPLAT"]]) < 85.0) and\
             (float(LosInfo[LosIdx["IPPLAT"]]) > -85.0):
@@ -246,20 +247,20 @@ def computeSigmaTropo(TropoMpp):
     return SigmaTropo
 
 def computeSigmaAirborne(Conf, Elev, CorrectInfo):
-    if Conf["EQUIPMENT_CLASS"] == 1:
+    if Conf["PARAMS"].EquipmentClass == 1:
         SigmaAirborne = 5
 
     else:
         SigmaMpSquare = (0.13+0.53*np.exp(-Elev/10.0))**2
-        if Conf["AIR_ACC_DESIG"] == 'A':
-            if Elev > Conf["ELEV_NOISE_TH"]:
+        if Conf["PARAMS"].AirAccDesig == 'A':
+            if Elev > Conf["PARAMS"].ElevNoiseTh:
                 SigmaNoiseDivSquare = 0.15 ** 2
 
             else:
                 SigmaNoiseDivSquare = 0.36 ** 2
 
-        elif Conf["AIR_ACC_DESIG"] == 'B':
-            if Elev > Conf["ELEV_NOISE_TH"]:
+        elif Conf["PARAMS"].AirAccDesig == 'B':
+            if Elev > Conf["PARAMS"].ElevNoiseTh:
                 SigmaNoiseDivSquare = 0.11 ** 2
 
             else:
@@ -338,6 +339,10 @@ def runCorrectMeas(Conf, Rcvr, PreproObsInfo, SatInfo, LosInfo):
     #         Corrected measurements for current epoch per sat
     #         CorrInfo["G01"]["CorrectedPsr"]
 
+    # If the whole-epoch engine is activated
+    if Conf["CORR_ENGINE"] == 1:
+        return runCorrectMeasBlock(Conf, Rcvr, [(PreproObsInfo, SatInfo, LosInfo)])[0]
+
     # Initialize output
     CorrInfo = OrderedDict({})
 
@@ -536,3 +541,447 @@ def runCorrectMeas(Conf, Rcvr, PreproObsInfo, SatInfo, LosInfo):
             SatCorrInfo["EntGps"] = EntGpsSum / EntGpsN if EntGpsN else np.nan
 
     return CorrInfo
+
+
+# Whole-epoch (vectorized) Corrections engine
+#----------------------------------------------------------------------
+# LOS columns of the IGP fields of the vertices (V1, V2, V3) used by the
+# triangular interpolation, for each value of the LOS INTERP field.
+# Vertices are derived as in computeUisdAndUire(). Index 0 (rectangular
+# interpolation) is only a placeholder
+IgpTriangleCols = OrderedDict({})
+for Field in ["IGP_%s_LON", "IGP_%s_LAT", "GIVD_%s", "GIVE_%s"]:
+    IgpTriangleCols[Field] = [[0] * 5 for Vertex in range(3)]
+for Interp in range(1, 5):
+    Idx2 = (Interp + 2) % 4
+    if Idx2==0: Idx2=4
+    Vertex2 = IgpIdx2Vertex[Idx2]
+    Vertex1 = (Vertex2.replace('S', 'N') if 'S' in Vertex2 else Vertex2.replace('N', 'S'))
+    Vertex3 = (Vertex2.replace('E', 'W') if 'E' in Vertex2 else Vertex2.replace('W', 'E'))
+    for Field, Cols in IgpTriangleCols.items():
+        for i, Vertex in enumerate((Vertex1, Vertex2, Vertex3)):
+            Cols[i][Interp] = LosIdx[Field % Vertex]
+for Field, Cols in IgpTriangleCols.items():
+    IgpTriangleCols[Field] = np.array(Cols)
+
+def pow2(x):
+    # Elementwise x**2 through the C library pow(), as Python and NumPy
+    # scalars do (x**2 on arrays is computed as x*x, which may differ
+    # in the last bit)
+    return np.float_power(x, 2)
+
+
+def dotRows(A, B):
+    # Row-wise dot product of two N x 3 arrays.
+    # Each row goes through the same dot kernel as np.dot() on a pair of
+    # 3-vectors
+    return np.matmul(A[:, np.newaxis, :], B[:, :, np.newaxis])[:, 0, 0]
+
+
+def rewrapLonArray(Longitude):
+    Wrap = np.abs(Longitude) > 180.0
+    if Wrap.any():
+        # Longitude/abs(Longitude) is exactly sign(Longitude) where used
+        return np.where(Wrap, Longitude - np.sign(Longitude) * 360.0, Longitude)
+
+    return Longitude
+
+
+def rewrapLatArray(Latitude):
+    Wrap = np.abs(Latitude) > 90.0
+    if Wrap.any():
+        # Latitude/abs(Latitude) is exactly sign(Latitude) where used
+        return np.where(Wrap, Latitude - np.sign(Latitude) * 180.0, Latitude)
+
+    return Latitude
+
+
+def computeUisdAndUireArray(Mpp, Los):
+    # Reference: MOPS-DO-229D Section A.4.4.10.3
+    # Vectorized version of computeUisdAndUire() over the rows of the
+    # LOS array
+
+    Interp = Los[:, LosIdx["INTERP"]].astype(int)
+    IppLon = Los[:, LosIdx["IPPLON"]]
+    IppLat = Los[:, LosIdx["IPPLAT"]]
+    Rect = (Interp == 0)
+
+    # Rectangular interpolation
+    if Rect.any():
+        # Case of IPP between S85 and N85
+        xpp = rewrapLonArray(IppLon - Los[:, LosIdx["IGP_SW_LON"]])/\
+            rewrapLonArray(Los[:, LosIdx["IGP_SE_LON"]] - Los[:, LosIdx["IGP_SW_LON"]])
+        ypp = rewrapLatArray(IppLat - Los[:, LosIdx["IGP_SW_LAT"]])/\
+            rewrapLatArray(Los[:, LosIdx["IGP_NW_LAT"]] - Los[:, LosIdx["IGP_SW_LAT"]])
+
+        # Case of IPP beyond S85 or N85
+        Polar = (IppLat >= 85.0) | (IppLat <= -85.0)
+        if Polar.any():
+            yppPolar = (np.abs(IppLat) - 85.0) / 10.0
+            DeltaLon = rewrapLonArray(IppLon - Los[:, LosIdx["IGP_SW_LON"]])
+            xppPolar = ((DeltaLon/90.0) * (1.0 - (2.0 * yppPolar))) + yppPolar
+            xpp = np.where(Polar, xppPolar, xpp)
+            ypp = np.where(Polar, yppPolar, ypp)
+
+        # Compute the interpolation weights
+        W1 = xpp * ypp
+        W2 = (1 - xpp) * ypp
+        W3 = (1 - xpp) * (1 - ypp)
+        W4 = xpp * (1 - ypp)
+
+        # Compute UISD
+        Uisd = Mpp * (\
+            (W1 * Los[:, LosIdx["GIVD_NE"]]) +\
+            (W2 * Los[:, LosIdx["GIVD_NW"]]) +\
+            (W3 * Los[:, LosIdx["GIVD_SW"]]) +\
+            (W4 * Los[:, LosIdx["GIVD_SE"]])
+        )
+
+        # Compute UIRE
+        SigmaUire = np.sqrt(\
+            pow2(Mpp) * (\
+                (W1 * pow2(Los[:, LosIdx["GIVE_NE"]])) +\
+                (W2 * pow2(Los[:, LosIdx["GIVE_NW"]])) +\
+                (W3 * pow2(Los[:, LosIdx["GIVE_SW"]])) +\
+                (W4 * pow2(Los[:, LosIdx["GIVE_SE"]]))
+            )
+        )
+
+    # Triangular interpolation
+    if not Rect.all():
+        Rows = np.arange(len(Interp))
+        Interp = np.clip(Interp, 0, 4)
+        Lon = Los[Rows[:, np.newaxis], IgpTriangleCols["IGP_%s_LON"][:, Interp].T]
+        Lat = Los[Rows[:, np.newaxis], IgpTriangleCols["IGP_%s_LAT"][:, Interp].T]
+        Givd = Los[Rows[:, np.newaxis], IgpTriangleCols["GIVD_%s"][:, Interp].T]
+        Give = Los[Rows[:, np.newaxis], IgpTriangleCols["GIVE_%s"][:, Interp].T]
+
+        # Compute xpp
+        xpp = rewrapLonArray(IppLon - Lon[:, 1])/\
+            rewrapLonArray(Lon[:, 2] - Lon[:, 1])
+
+        # Compute ypp
+        ypp = rewrapLatArray(IppLat - Lat[:, 1])/\
+            rewrapLatArray(Lat[:, 0] - Lat[:, 1])
+
+        # Compute the interpolation weights
+        W1 = ypp
+        W2 = 1 - xpp - ypp
+        W3 = xpp
+
+        # Compute UISD
+        UisdTri = Mpp * (\
+            (W1 * Givd[:, 0]) +\
+            (W2 * Givd[:, 1]) +\
+            (W3 * Givd[:, 2])
+        )
+
+        # Compute UIRE
+        SigmaUireTri = np.sqrt(\
+            pow2(Mpp) * (\
+                (W1 * pow2(Give[:, 0])) +\
+                (W2 * pow2(Give[:, 1])) +\
+                (W3 * pow2(Give[:, 2]))
+            )
+        )
+
+        if Rect.any():
+            Uisd = np.where(Rect, Uisd, UisdTri)
+            SigmaUire = np.where(Rect, SigmaUire, SigmaUireTri)
+        else:
+            Uisd = UisdTri
+            SigmaUire = SigmaUireTri
+
+    return Uisd, SigmaUire
+
+
+def computeTropoMppArray(Elev):
+    TropoMpp = (1.001/(np.sqrt(0.002001+pow2(np.sin(np.radians(Elev))))))
+
+    # Low elevations
+    Low = (Elev < 4)
+    if Low.any():
+        TropoMpp = np.where(Low, TropoMpp*(1+0.015*pow2(np.maximum(0,4-Elev))), TropoMpp)
+        TropoMpp = np.where(Elev < 2, np.nan, TropoMpp)
+
+    return TropoMpp
+
+
+def computeSigmaAirborneArray(Conf, Elev):
+    if Conf["PARAMS"].EquipmentClass == 1:
+        SigmaAirborne = np.full(len(Elev), 5.0)
+
+    else:
+        SigmaMpSquare = pow2(0.13+0.53*np.exp(-Elev/10.0))
+        if Conf["PARAMS"].AirAccDesig == 'A':
+            SigmaNoiseDivSquare = np.where(Elev > Conf["PARAMS"].ElevNoiseTh,
+                0.15 ** 2, 0.36 ** 2)
+
+        elif Conf["PARAMS"].AirAccDesig == 'B':
+            SigmaNoiseDivSquare = np.where(Elev > Conf["PARAMS"].ElevNoiseTh,
+                0.11 ** 2, 0.15 ** 2)
+
+        SigmaAirborne = np.sqrt(SigmaMpSquare + SigmaNoiseDivSquare)
+
+    return np.sqrt(SigmaNoiseDivSquare), np.sqrt(SigmaMpSquare), SigmaAirborne
+
+
+# Initial values of the corrected measurements of one satellite
+# (see runCorrectMeas())
+CorrInfoTemplate = {
+    "Sod": 0.0,
+    "Doy": 0,
+    "Elevation": 0.0,
+    "Azimuth": 0.0,
+    "IppLon": 0.0,
+    "IppLat": 0.0,
+    "Flag": 1,
+    "SatX": 0.0,
+    "SatY": 0.0,
+    "SatZ": 0.0,
+    "SatClk": 0.0,
+    "Uisd": 0.0,
+    "Std": 0.0,
+    "CorrPsr": 0.0,
+    "GeomRange": 0.0,
+    "PsrResidual": 0.0,
+    "RcvrClk": 0.0,
+    "SigmaFlt": 0,
+    "SigmaUire": 0,
+    "SigmaTropo": 0,
+    "SigmaAirborne": 0.0,
+    "SigmaNoiseDiv": 0.0,
+    "SigmaMultipath": 0.0,
+    "SigmaUere": 0.0,
+    "EntGps": 0.0,
+} # End of CorrInfoTemplate
+
+def sumEpochRows(Values, EpochRow, EpochCol, NEpochs, NCols):
+    # Sum the values of the rows of each epoch, accumulating them from
+    # 0.0 in the rows order, as the loops of runCorrectMeas() do
+    Table = np.zeros((NEpochs, NCols))
+    Table[EpochRow, EpochCol] = Values
+    Sum = 0.0 + Table[:, 0]
+    for Col in range(1, NCols):
+        Sum = Sum + Table[:, Col]
+
+    return Sum
+
+
+def runCorrectMeasBlock(Conf, Rcvr, EpochsInfo):
+
+    # Purpose: whole-epoch version of runCorrectMeas() applied to a block
+    #          of epochs. The SAT and LOS lines of the satellites to be
+    #          corrected are converted once into float arrays and all
+    #          the corrections, sigmas and residuals are computed for all
+    #          the satellites of all the epochs at once.
+    #          Operations are kept in the same order as in the
+    #          satellite-by-satellite functions, so that CORR outputs
+    #          are bit-for-bit identical
+
+    # Parameters
+    # ==========
+    # Conf: dict
+    #         Configuration dictionary
+    # Rcvr: list
+    #         Receiver information: position, masking angle...
+    # EpochsInfo: list
+    #         (PreproObsInfo, SatInfo, LosInfo) of each epoch, as
+    #         given to runCorrectMeas()
+
+    # Returns
+    # =======
+    # CorrInfoList: list
+    #         Corrected measurements of each epoch, as returned by
+    #         runCorrectMeas()
+
+    # Initialize outputs
+    CorrInfoList = []
+
+    # Satellites to be corrected: Epoch index and label
+    CorrEpochs = []
+    CorrLabels = []
+    SatRows = []
+    LosRows = []
+    PreproRows = []
+
+    # Loop over epochs
+    for Epoch, (PreproObsInfo, SatInfo, LosInfo) in enumerate(EpochsInfo):
+        CorrInfo = OrderedDict({})
+
+        # Loop over satellites
+        for SatLabel, SatPrepro in PreproObsInfo.items():
+            # If satellite is in convergence
+            if(SatPrepro["Status"] == 1):
+                # Initialize output info
+                SatCorrInfo = dict(CorrInfoTemplate)
+                SatCorrInfo["Sod"] = SatPrepro["Sod"]
+                SatCorrInfo["Doy"] = SatPrepro["Doy"]
+                SatCorrInfo["Elevation"] = SatPrepro["Elevation"]
+                SatCorrInfo["Azimuth"] = SatPrepro["Azimuth"]
+
+                # If SBAS information is available for current satellite
+                if (SatLabel in SatInfo) and (SatLabel in LosInfo):
+                    # Get IPP Longitude and Latitude
+                    SatCorrInfo["IppLon"] = float(LosInfo[SatLabel][LosIdx["IPPLON"]])
+                    SatCorrInfo["IppLat"] = float(LosInfo[SatLabel][LosIdx["IPPLAT"]])
+
+                    # If satellite is Not Monitored or Don't Use
+                    if(int(SatInfo[SatLabel][SatIdx["UDREI"]]) >= 14):
+                        # Set LoS flag to 0
+                        SatCorrInfo["Flag"] = 0
+
+                    else:
+                        if(int(SatInfo[SatLabel][SatIdx["UDREI"]]) >= 12):
+                            # Set LoS flag to NPA
+                            SatCorrInfo["Flag"] = 2
+
+                        # Add satellite to the block arrays
+                        CorrEpochs.append(Epoch)
+                        CorrLabels.append(SatLabel)
+                        SatRows.append(SatInfo[SatLabel])
+                        LosRows.append(LosInfo[SatLabel])
+                        PreproRows.append([SatPrepro["Elevation"],
+                            SatPrepro["Mpp"], SatPrepro["SmoothC1"]])
+
+                else:
+                    # Set LoS flag to 0
+                    SatCorrInfo["Flag"] = 0
+
+                # Prepare output for the satellite
+                CorrInfo[SatLabel] = SatCorrInfo
+
+            # End of if(SatPrepro["Status"] == 1):
+
+        # End of for SatLabel, SatPrepro in PreproObsInfo.items():
+
+        CorrInfoList.append(CorrInfo)
+
+    # End of for Epoch, (PreproObsInfo, SatInfo, LosInfo) in enumerate(EpochsInfo):
+
+    # If no satellite to correct, nothing else to do
+    if len(CorrLabels) == 0:
+        return CorrInfoList
+
+    # Build the block arrays
+    Sat = convertEpochRows(SatRows, SatIdx)
+    Los = convertEpochRows(LosRows, LosIdx)
+    Prepro = np.array(PreproRows)
+    Elev = Prepro[:, 0]
+    Mpp = Prepro[:, 1]
+    SmoothC1 = Prepro[:, 2]
+    RcvrXyz = np.array(Rcvr[RcvrIdx["XYZ"]][:3])
+
+    # Position of each row in the table of epochs and satellites
+    EpochRow = np.array(CorrEpochs)
+    NSats = np.bincount(EpochRow, minlength=len(EpochsInfo))
+    EpochCol = np.arange(len(EpochRow)) - (np.cumsum(NSats) - NSats)[EpochRow]
+
+    SatPos = Sat[:, SatIdx["SAT-X"]:SatIdx["SAT-Z"] + 1]
+    SatVel = Sat[:, SatIdx["VEL-X"]:SatIdx["VEL-Z"] + 1]
+    Ltc = Sat[:, SatIdx["LTC-X"]:SatIdx["LTC-Z"] + 1]
+
+    # Apply the SBAS corrections to the satellite position and clock
+    # Reference: MOPS-DO-229D Section A.4.4.7
+    CorrSatPos = SatPos + Ltc
+    Dtr = (-2 * dotRows(SatPos, SatVel)) / Const.SPEED_OF_LIGHT
+    SatClk = Sat[:, SatIdx["SAT-CLK"]] + \
+        (-1)*Sat[:, SatIdx["TGD"]] + \
+        Dtr + \
+        Sat[:, SatIdx["FC"]] + \
+        Sat[:, SatIdx["LTC-B"]]
+
+    # Compute the Sigma FLT projected into the User direction as per MOPS
+    # Reference: MOPS-DO-229D Section A.4.5.1
+    SigmaUdre = Sat[:, SatIdx["SIGMAUDRE"]] * Sat[:, SatIdx["DELTAUDRE"]]
+    Eps = Sat[:, SatIdx["EPS-FC"]:SatIdx["EPS-ER"] + 1]
+    # RSS==0: non-root-sum-squared
+    SigmaFlt = SigmaUdre + Eps[:, 0] + Eps[:, 1] + Eps[:, 2] + Eps[:, 3]
+    # RSS==1: root-sum-squared
+    Rss = (Sat[:, SatIdx["RSS"]] != 0)
+    if Rss.any():
+        Eps2 = pow2(Eps)
+        SigmaFlt = np.where(Rss,
+            np.sqrt(pow2(SigmaUdre) + Eps2[:, 0] + Eps2[:, 1] + Eps2[:, 2] + Eps2[:, 3]),
+            SigmaFlt)
+
+    # Compute UISD and UIRE on the IPP using MOPS interpolation
+    Uisd, SigmaUire = computeUisdAndUireArray(Mpp, Los)
+
+    # Get the STD and compute the associated SigmaTROPO
+    Std = Los[:, LosIdx["STD"]]
+    SigmaTropo = 0.12*computeTropoMppArray(Elev)
+
+    # Compute User Airborne Sigma
+    SigmaNoiseDiv, SigmaMultipath, SigmaAirborne = \
+        computeSigmaAirborneArray(Conf, Elev)
+
+    # Compute UERE
+    SigmaUere = np.sqrt(\
+            pow2(SigmaFlt) + \
+            pow2(SigmaUire) + \
+            pow2(SigmaTropo) + \
+            pow2(SigmaAirborne) \
+    )
+
+    # Correct the Smoothed Pseudo Range from Sat Clock, Tropo and Iono delays
+    CorrPsr = SmoothC1 + SatClk - Uisd - Std
+
+    # Compute the Geometrical Range
+    Diff2 = pow2(CorrSatPos - RcvrXyz)
+    GeomRange = np.sqrt(Diff2[:, 0] + Diff2[:, 1] + Diff2[:, 2])
+
+    # Compute the Residual including Receiver Clock estimation
+    PsrResidual = CorrPsr - GeomRange
+
+    # Compute the Receiver Clock estimation of each epoch
+    NCols = NSats.max()
+    Weights = np.float_power(SigmaUere, -2)
+    ResSum = sumEpochRows(Weights * PsrResidual, EpochRow, EpochCol, len(EpochsInfo), NCols)
+    ResN = sumEpochRows(Weights, EpochRow, EpochCol, len(EpochsInfo), NCols)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        RcvrClk = np.where(ResN != 0, ResSum / ResN, np.nan)[EpochRow]
+
+    # Compute ENT-GPS Offset of each epoch
+    Ulos = SatPos - RcvrXyz
+    Ulos = Ulos/np.sqrt(dotRows(Ulos, Ulos))[:, np.newaxis]
+    EntGps = (dotRows(Ltc, Ulos) - \
+        (Sat[:, SatIdx["FC"]] + \
+            Sat[:, SatIdx["LTC-B"]])\
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        EntGps = (sumEpochRows(EntGps, EpochRow, EpochCol, len(EpochsInfo), NCols) / \
+            NSats)[EpochRow]
+
+    # Correct Residuals from Receiver Clock estimation
+    PsrResidual = PsrResidual - RcvrClk
+
+    # Prepare outputs
+    Outputs = OrderedDict({})
+    Outputs["SatX"] = CorrSatPos[:, 0]
+    Outputs["SatY"] = CorrSatPos[:, 1]
+    Outputs["SatZ"] = CorrSatPos[:, 2]
+    Outputs["SatClk"] = SatClk
+    Outputs["SigmaFlt"] = SigmaFlt
+    Outputs["Uisd"] = Uisd
+    Outputs["SigmaUire"] = SigmaUire
+    Outputs["Std"] = Std
+    Outputs["SigmaTropo"] = SigmaTropo
+    Outputs["SigmaNoiseDiv"] = SigmaNoiseDiv
+    Outputs["SigmaMultipath"] = SigmaMultipath
+    Outputs["SigmaAirborne"] = SigmaAirborne
+    Outputs["SigmaUere"] = SigmaUere
+    Outputs["CorrPsr"] = CorrPsr
+    Outputs["GeomRange"] = GeomRange
+    Outputs["PsrResidual"] = PsrResidual
+    Outputs["RcvrClk"] = RcvrClk
+    Outputs["EntGps"] = EntGps
+
+    Keys = list(Outputs.keys())
+    Rows = np.column_stack(list(Outputs.values())).tolist()
+    for Epoch, SatLabel, Row in zip(CorrEpochs, CorrLabels, Rows):
+        CorrInfoList[Epoch][SatLabel].update(zip(Keys, Row))
+
+    return CorrInfoList
+
+# End of runCorrectMeasBlock()
@@ -21,9 +21,17 @@
 # Import External and Internal functions and Libraries
 #----------------------------------------------------------------------
 import sys, os
-from collections import OrderedDict
+import hashlib
+import json
+import pickle
+import gzip, bz2, lzma
+import threading
+import queue
+from collections import OrderedDict, namedtuple
+import numpy as np
 from COMMON.Dates import convertYearMonthDay2JulianDay
 from COMMON import GnssConstants as Const
+from COMMON import Stats
 from COMMON.Coordinates import llh2xyz
 
 
@@ -35,6 +43,63 @@ VALUE = 1
 TH = 1
 CSNEPOCHS = 2
 
+# Service levels configuration columns
+ServiceIdx = OrderedDict({})
+ServiceIdx["FLAG"] = 0
+ServiceIdx["HAL"] = 1
+ServiceIdx["VAL"] = 2
+ServiceIdx["HPE95"] = 3
+ServiceIdx["VPE95"] = 4
+ServiceIdx["VPE1E7"] = 5
+ServiceIdx["AVAI"] = 6
+ServiceIdx["CONT"] = 7
+ServiceIdx["CINT"] = 8
+
+# Service levels
+ServiceLevels = ["OS", "APVI", "LPV200", "CATI", "NPA", "MARITIME", "CUSTOM"]
+
+# Configuration parameters read in the processing loops, converted
+# once by processConf (see compileConf)
+ConfParams = namedtuple("ConfParams", [
+    "SamplingRate",         # Sampling rate [s]
+    "SamplingRateInt",      # Sampling rate [s] as an integer
+    "SamplesPerDay",        # Number of samples in a day
+    "NChannelsGps",         # Number of GPS channels
+    "EquipmentClass",       # Airborne equipment class
+    "AirAccDesig",          # Airborne accuracy designator
+    "ElevNoiseTh",          # Elevation threshold of the airborne noise [deg]
+    "MinCnrOn",             # C/N0 check activated
+    "MinCnr",               # Minimum C/N0 [dB-Hz]
+    "MinNcsOn",             # Cycle slips detection activated
+    "MinNcsTh",             # Cycle slips detection threshold [cycles]
+    "MinNcsEpochs",         # Number of epochs declaring a cycle slip
+    "MaxPsrOutRngOn",       # Pseudorange out-of-range check activated
+    "MaxPsrOutRng",         # Maximum pseudorange [m]
+    "MaxCodeRateOn",        # Code rate check activated
+    "MaxCodeRate",          # Maximum code rate [m/s]
+    "MaxCodeRateStepOn",    # Code rate step check activated
+    "MaxCodeRateStep",      # Maximum code rate step [m/s2]
+    "MaxPhaseRateOn",       # Phase rate check activated
+    "MaxPhaseRate",         # Maximum phase rate [m/s]
+    "MaxPhaseRateStepOn",   # Phase rate step check activated
+    "MaxPhaseRateStep",     # Maximum phase rate step [m/s2]
+    "HatchGapTh",           # Data gap resetting the Hatch filter [s]
+    "HatchGapThInt",        # Data gap resetting the Hatch filter [s] as an integer
+    "HatchTime",            # Hatch filter time constant [s]
+    "HatchConvTime",        # Hatch filter convergence time [s]
+    "MaxLsqIter",           # Maximum number of LSQ iterations
+    "PdopMax",              # Maximum PDOP
+    "Services",             # ServiceParams of each configured service level
+    ])
+
+# Service level limits, converted once by processConf
+ServiceParams = namedtuple("ServiceParams", [
+    "Active",               # Service level activated
+    "Hal",                  # Horizontal alert limit [m]
+    "Val",                  # Vertical alert limit [m]
+    "Cint",                 # Continuity interval [epochs]
+    ])
+
 # RCVR file columns
 RcvrIdx = OrderedDict({})
 RcvrIdx["ACR"]=0
@@ -314,6 +379,14 @@ HistIdx["BINMAX"]=4
 HistIdx["NUMSAM"]=5
 HistIdx["BINFREQ"]=6
 
+# Line templates of the output files: the format of each file column
+# followed by a blank, as written field by field
+PreproLineFmt = " ".join(PreproFmt[:len(PreproIdx)]) + " \n"
+CorrLineFmt = " ".join(CorrFmt[:len(CorrIdx)]) + " \n"
+PosLineFmt = " ".join(PosFmt[:len(PosIdx)]) + " \n"
+PerfLineFmt = " ".join(PerfFmt[:len(PerfIdx)]) + " \n"
+HistLineFmt = " ".join(HistFmt[:len(HistIdx)]) + " \n"
+
 # Input functions
 #----------------------------------------------------------------------
 def checkConfParam(Key, Fields, MinFields, MaxFields, LowLim, UppLim):
@@ -629,6 +702,29 @@ def readConf(CfgFile):
                             # Increment number of read parameters
                             NReadParams = NReadParams + 1
 
+                        # Performances state outputs selection [0:OFF|1:ON]
+                        #--------------------------------------------------------------------
+                        elif Key=='PERF_STATE_OUT':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1, [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Density of Stanford diagrams
+                        #-----------------------------------------------
+                        # 0: Gaussian KDE of the samples (Default)
+                        # 1: Samples per pixel (binned counts), also
+                        #    generating the Stanford diagrams of all the
+                        #    receivers and days if SPVT_OUT is activated
+                        #-----------------------------------------------
+                        elif Key=='STANFORD_DENSITY':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1, [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
                         # Rx Position Information [STATIC|DYN]
                         #-----------------------------------------------
                         # STAT: RIMS static positions
@@ -895,6 +991,137 @@ def readConf(CfgFile):
                             # Increment number of read parameters
                             NReadParams = NReadParams + 1
 
+                        # Number of parallel receiver-day jobs
+                        #-----------------------------------------------
+                        # 1: Sequential processing (Default)
+                        # 0: As many jobs as available CPUs
+                        # N: N jobs in parallel
+                        #-----------------------------------------------
+                        elif Key== 'NJOBS':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1,
+                            [0], [Const.MAX_NUM_JOBS])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Stage timing
+                        #-----------------------------------------------
+                        # 0: Not activated (Default)
+                        # 1: Time, summary table and JSON report of the
+                        #    processing stages per receiver-day
+                        #-----------------------------------------------
+                        elif Key== 'STAGE_TIMING':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1, [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Checkpoints of the receiver-days [s]
+                        #-----------------------------------------------
+                        # 0: Not activated (Default)
+                        # N: State of the receiver-day saved every N
+                        #    seconds of the day, to be resumed with
+                        #    the --resume option of Petrus.py
+                        #-----------------------------------------------
+                        elif Key== 'CHECKPOINT_RATE':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1,
+                            [0], [Const.S_IN_D])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Compression of PREPRO, CORR and POS outputs
+                        #-----------------------------------------------
+                        # 0: None (Default)
+                        # 1: gzip (.gz)
+                        # 2: bzip2 (.bz2)
+                        # 3: xz (.xz)
+                        #-----------------------------------------------
+                        elif Key== 'OUTPUT_COMPRESSION':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1, [0], [3])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Compression level of outputs [1-9]
+                        #-----------------------------------------------
+                        elif Key== 'OUTPUT_COMPRESSION_LEVEL':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1, [1], [9])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Output writer
+                        #-----------------------------------------------
+                        # 0: Outputs written by the processing loop (Default)
+                        # 1: Outputs written by a background thread
+                        #-----------------------------------------------
+                        elif Key== 'OUTPUT_WRITER':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1, [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Number of plot worker processes
+                        #-----------------------------------------------
+                        # 0: Figures rendered by the main process (Default)
+                        # N: N worker processes rendering the figures
+                        #    (Agg backend) while processing goes on
+                        #-----------------------------------------------
+                        elif Key== 'PLOT_JOBS':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1,
+                            [0], [Const.MAX_NUM_JOBS])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Corrections engine
+                        #-----------------------------------------------
+                        # 0: Satellite by satellite (Default)
+                        # 1: Whole epoch, vectorized over satellites
+                        #-----------------------------------------------
+                        elif Key== 'CORR_ENGINE':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1,
+                            [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # SPVT engine
+                        #-----------------------------------------------
+                        # 0: Epoch by epoch (Default)
+                        # 1: Blocks of epochs, with stacked solves
+                        #-----------------------------------------------
+                        elif Key== 'SPVT_ENGINE':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1,
+                            [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
+                        # Binary cache of OBS, SAT and LOS input files
+                        #-----------------------------------------------
+                        # 0: Parse the text files (Default)
+                        # 1: Read the columnar binary cache, building it
+                        #    if missing or out of date
+                        #-----------------------------------------------
+                        elif Key== 'INPUT_CACHE':
+                            # Check parameter and load it in Conf
+                            Conf[Key] = checkConfParam(Key, Fields, 1, 1,
+                            [0], [1])
+
+                            # Increment number of read parameters
+                            NReadParams = NReadParams + 1
+
                         # Service Level Specific Parameters
                         #------------------------------------------------------------
                         # ON/OFF: Service Level Selection [0:OFF|1:ON]
@@ -1007,7 +1234,8 @@ def processConf(Conf):
     # =======
     # Conf: dict
     #         Dictionary containing configuration with
-    #         Julian Days
+    #         Julian Days and default values of optional
+    #         parameters
     
     ConfCopy = Conf.copy()
     for Key in ConfCopy:
@@ -1025,8 +1253,105 @@ def processConf(Conf):
                     )
                 )
 
+    # Set default values of optional parameters
+    if "NJOBS" not in Conf:
+        Conf["NJOBS"] = 1
+    if "INPUT_CACHE" not in Conf:
+        Conf["INPUT_CACHE"] = 0
+    if "CORR_ENGINE" not in Conf:
+        Conf["CORR_ENGINE"] = 0
+    if "SPVT_ENGINE" not in Conf:
+        Conf["SPVT_ENGINE"] = 0
+    if "PERF_STATE_OUT" not in Conf:
+        Conf["PERF_STATE_OUT"] = 0
+    if "STANFORD_DENSITY" not in Conf:
+        Conf["STANFORD_DENSITY"] = 0
+    if "PLOT_JOBS" not in Conf:
+        Conf["PLOT_JOBS"] = 0
+    if "OUTPUT_WRITER" not in Conf:
+        Conf["OUTPUT_WRITER"] = 0
+    if "OUTPUT_COMPRESSION" not in Conf:
+        Conf["OUTPUT_COMPRESSION"] = 0
+    if "OUTPUT_COMPRESSION_LEVEL" not in Conf:
+        Conf["OUTPUT_COMPRESSION_LEVEL"] = Const.COMPRESSION_LEVEL
+
+    if "STAGE_TIMING" not in Conf:
+        Conf["STAGE_TIMING"] = 0
+
+    if "CHECKPOINT_RATE" not in Conf:
+        Conf["CHECKPOINT_RATE"] = 0
+
+    # Convert the parameters read in the processing loops
+    Conf["PARAMS"] = compileConf(Conf)
+
     return Conf
 
+# End of processConf()
+
+
+def compileConf(Conf):
+
+    # Purpose: convert once the configuration parameters read in the
+    #          processing loops (epochs and satellites), so that they
+    #          are read as attributes instead of being looked up and
+    #          converted at each use
+
+    # Parameters
+    # ==========
+    # Conf: dict
+    #         Dictionary containing configuration
+
+    # Returns
+    # =======
+    # Params: ConfParams
+    #         Converted parameters (immutable)
+    #         Params.HatchTime, Params.Services["LPV200"].Hal
+
+    # Get the limits of the configured service levels
+    Services = OrderedDict({})
+    for Service in ServiceLevels:
+        if Service in Conf:
+            Services[Service] = ServiceParams(
+                Active = int(Conf[Service][ServiceIdx["FLAG"]]) == 1,
+                Hal = Conf[Service][ServiceIdx["HAL"]],
+                Val = Conf[Service][ServiceIdx["VAL"]],
+                Cint = int(Conf[Service][ServiceIdx["CINT"]]))
+
+    return ConfParams(
+        SamplingRate = Conf["SAMPLING_RATE"],
+        SamplingRateInt = int(Conf["SAMPLING_RATE"]),
+        SamplesPerDay = 86400 // int(Conf["SAMPLING_RATE"]),
+        NChannelsGps = int(Conf["NCHANNELS_GPS"]),
+        EquipmentClass = Conf["EQUIPMENT_CLASS"],
+        AirAccDesig = Conf["AIR_ACC_DESIG"],
+        ElevNoiseTh = Conf["ELEV_NOISE_TH"],
+        MinCnrOn = Conf["MIN_CNR"][FLAG] == 1,
+        MinCnr = float(Conf["MIN_CNR"][VALUE]),
+        MinNcsOn = Conf["MIN_NCS_TH"][FLAG] == 1,
+        MinNcsTh = float(Conf["MIN_NCS_TH"][TH]),
+        MinNcsEpochs = int(Conf["MIN_NCS_TH"][CSNEPOCHS]),
+        MaxPsrOutRngOn = Conf["MAX_PSR_OUTRNG"][FLAG] == 1,
+        MaxPsrOutRng = float(Conf["MAX_PSR_OUTRNG"][VALUE]),
+        MaxCodeRateOn = Conf["MAX_CODE_RATE"][FLAG] == 1,
+        MaxCodeRate = float(Conf["MAX_CODE_RATE"][VALUE]),
+        MaxCodeRateStepOn = Conf["MAX_CODE_RATE_STEP"][FLAG] == 1,
+        MaxCodeRateStep = float(Conf["MAX_CODE_RATE_STEP"][VALUE]),
+        MaxPhaseRateOn = Conf["MAX_PHASE_RATE"][FLAG] == 1,
+        MaxPhaseRate = float(Conf["MAX_PHASE_RATE"][VALUE]),
+        MaxPhaseRateStepOn = Conf["MAX_PHASE_RATE_STEP"][FLAG] == 1,
+        MaxPhaseRateStep = float(Conf["MAX_PHASE_RATE_STEP"][VALUE]),
+        HatchGapTh = Conf["HATCH_GAP_TH"],
+        HatchGapThInt = int(Conf["HATCH_GAP_TH"]),
+        HatchTime = Conf["HATCH_TIME"],
+        HatchConvTime = Conf["HATCH_STATE_F"] * Conf["HATCH_TIME"],
+        MaxLsqIter = Conf["MAX_LSQ_ITER"],
+        PdopMax = float(Conf["PDOP_MAX"]),
+        Services = Services,
+        )
+
+# End of compileConf()
+
+
 def readRcvr(RcvrFile):
     
     # Purpose: read the RCVR Positions file
@@ -1153,6 +1478,10 @@ def readObsEpoch(f):
     #         second line
     
 
+    # If the OBS file is read through its binary cache
+    if isinstance(f, dict):
+        return readCachedEpoch(f)
+
     EpochInfo = []
     
     # Read one line
@@ -1181,16 +1510,246 @@ def readObsEpoch(f):
 # End of readObsEpoch()
 
 
-def createOutputFile(Path, Hdr):
+# Number of characters of the blocks read from OBS files
+OBS_BLOCK_SIZE = 1 << 20
+
+def readObsEpochs(f):
+
+    # Purpose: read OBS file epoch by epoch, pulling large blocks of text
+    #          and finding the epoch boundaries by SoD, with no per-line
+    #          tell() or seek()
+
+    # Parameters
+    # ==========
+    # f: file descriptor or dict
+    #         OBS file (after its header line) or binary cache
+
+    # Returns
+    # =======
+    # Generator of EpochInfo: list
+    #         list of the split lines, as given by readObsEpoch
+
+    # If the OBS file is read through its binary cache
+    if isinstance(f, dict):
+        EpochInfo = readCachedEpoch(f)
+        while EpochInfo != []:
+            yield EpochInfo
+            EpochInfo = readCachedEpoch(f)
+        return
+
+    SodCol = ObsIdx["SOD"]
+    EpochInfo = []
+    Tail = ""
+
+    while True:
+        # Read one block, keeping its last incomplete line for the next one
+        Block = f.read(OBS_BLOCK_SIZE)
+        Lines = (Tail + Block).split("\n")
+        Tail = Lines.pop() if Block else ""
+
+        for Line in Lines:
+            LineSplit = splitLine(Line)
+
+            # An empty line ends the epoch
+            if not LineSplit:
+                if EpochInfo:
+                    yield EpochInfo
+                    EpochInfo = []
+                continue
+
+            # A new SoD starts a new epoch
+            if EpochInfo and LineSplit[SodCol] != EpochInfo[0][SodCol]:
+                yield EpochInfo
+                EpochInfo = []
+
+            EpochInfo.append(LineSplit)
+
+        # If file ended
+        if not Block:
+            break
+
+    if EpochInfo:
+        yield EpochInfo
+
+# End of readObsEpochs()
+
+
+def readObsEpochsArray(f):
+
+    # Purpose: read OBS file epoch by epoch as typed arrays, converting
+    #          each block of text at once
+
+    # Parameters
+    # ==========
+    # f: file descriptor or dict
+    #         OBS file (after its header line) or binary cache
+
+    # Returns
+    # =======
+    # Generator of EpochArray: numpy array
+    #         float64 array with one row per line and one column per
+    #         ObsIdx entry. The CONST column holds the character code of
+    #         the constellation letter, as in the binary cache
+
+    NCols = len(ObsIdx)
+    SodCol = ObsIdx["SOD"]
+    ConstCol = ObsIdx["CONST"]
+
+    # If the OBS file is read through its binary cache
+    if isinstance(f, dict):
+        while f["EpochPtr"] < len(f["Epochs"]):
+            Start, End = f["Epochs"][f["EpochPtr"]]
+            f["EpochPtr"] += 1
+            yield np.array(f["Data"][Start:End])
+        return
+
+    Pending = np.zeros((0, NCols))
+    Tail = ""
+
+    while True:
+        # Read one block, keeping its last incomplete line for the next one
+        Block = f.read(OBS_BLOCK_SIZE)
+        Text = Tail + Block
+        Tail = ""
+        if Block:
+            Cut = Text.rfind("\n") + 1
+            Text, Tail = Text[:Cut], Text[Cut:]
+
+        # Convert all the lines of the block at once if all of them have
+        # the OBS columns, otherwise line by line
+        Fields = splitLine(Text)
+        if len(Fields) == NCols * Text.count("\n"):
+            Consts = Fields[ConstCol::NCols]
+            Fields[ConstCol::NCols] = ["0"] * len(Consts)
+        else:
+            Rows = [LineSplit[:NCols] for LineSplit in map(splitLine, Text.split("\n")) \
+                if LineSplit]
+            Consts = [LineSplit[ConstCol] for LineSplit in Rows]
+            Fields = [Field for LineSplit in Rows for Field in \
+                LineSplit[:ConstCol] + ["0"] + LineSplit[ConstCol+1:]]
+        Data = np.array(Fields, dtype=np.float64).reshape(-1, NCols)
+        Data[:, ConstCol] = [ord(Const) for Const in Consts]
+        Data = np.concatenate((Pending, Data))
+
+        # Get the epochs of the block; the last one may go on in the
+        # next block
+        if len(Data) > 0:
+            Sods = Data[:, SodCol]
+            Starts = np.flatnonzero(np.r_[True, Sods[1:] != Sods[:-1]])
+            Ends = np.r_[Starts[1:], len(Data)]
+            if Block:
+                Starts, Ends = Starts[:-1], Ends[:-1]
+            for Start, End in zip(Starts, Ends):
+                yield Data[Start:End]
+            Pending = Data[Ends[-1]:] if len(Ends) > 0 else Data
+
+        # If file ended
+        if not Block:
+            break
+
+# End of readObsEpochsArray()
+
+
+# Size of the write buffer of output files (bytes)
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Compressed files: leading bytes and opening function of each format,
+# by file extension
+COMPRESSION_FORMATS = OrderedDict({})
+COMPRESSION_FORMATS[".gz"] = (b"\x1f\x8b", gzip.open)
+COMPRESSION_FORMATS[".bz2"] = (b"BZh", bz2.open)
+COMPRESSION_FORMATS[".xz"] = (b"\xfd7zXZ\x00", lzma.open)
+
+# Extension of the output files for each OUTPUT_COMPRESSION value
+OUTPUT_COMPRESSION_EXT = ["", ".gz", ".bz2", ".xz"]
+
+def findInputFile(Path):
+
+    # Purpose: get the path to an input file, which may be stored
+    #          compressed with the extension of its format (.gz, .bz2
+    #          or .xz) appended
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to the uncompressed file
+
+    # Returns
+    # =======
+    # Path: str
+    #         Path to the existing file (the given one if none exists)
+
+    if not os.path.isfile(Path):
+        for Ext in COMPRESSION_FORMATS.keys():
+            if os.path.isfile(Path + Ext):
+                return Path + Ext
+
+    return Path
+
+# End of findInputFile()
+
+
+def openDataFile(Path, Mode='r', Level=Const.COMPRESSION_LEVEL):
+
+    # Purpose: open a plain or compressed (gzip, bzip2 or xz) data file.
+    #          For reading, the format is detected from the first bytes
+    #          of the file; for writing, from the extension of its name
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to file
+    # Mode: str
+    #         'r', 'rb', 'w' or 'a' (compressed files are appended a
+    #         new stream)
+    # Level: int
+    #         Compression level of written files (1 to 9)
+
+    # Returns
+    # =======
+    # f: File descriptor
+    #         Descriptor of the file, giving uncompressed contents
+
+    # Get the format
+    Format = None
+    if Mode.startswith('r'):
+        with open(Path, 'rb') as f:
+            Magic = f.read(6)
+        for Ext, (FormatMagic, OpenFunc) in COMPRESSION_FORMATS.items():
+            if Magic.startswith(FormatMagic):
+                Format = Ext
+    elif os.path.splitext(Path)[1] in COMPRESSION_FORMATS:
+        Format = os.path.splitext(Path)[1]
+
+    # Plain file
+    if Format is None:
+        if Mode in ['w', 'a']:
+            return open(Path, Mode, buffering=OUTPUT_BUFFER_SIZE)
+        return open(Path, Mode)
+
+    # Compressed file, streamed in text mode unless bytes are requested
+    OpenFunc = COMPRESSION_FORMATS[Format][1]
+    StreamMode = Mode if 'b' in Mode else Mode + 't'
+    if Mode.startswith('r'):
+        return OpenFunc(Path, StreamMode)
+    if Format == ".xz":
+        return OpenFunc(Path, StreamMode, preset=Level)
+    return OpenFunc(Path, StreamMode, compresslevel=Level)
+
+# End of openDataFile()
+
+def createOutputFile(Path, Hdr, Level=Const.COMPRESSION_LEVEL):
     
     # Purpose: open output file and write its header
        
     # Parameters
     # ==========
     # Path: str
-    #         Path to file
+    #         Path to file (compressed if it ends in .gz, .bz2 or .xz)
     # Hdr: str
     #         File header
+    # Level: int
+    #         Compression level (1 to 9), if compressed
 
     # Returns
     # =======
@@ -1204,8 +1763,8 @@ def createOutputFile(Path, Hdr):
     if not os.path.exists(os.path.dirname(Path)):
         os.makedirs(os.path.dirname(Path))
 
-    # Open PREPRO OBS file
-    f = open(Path, 'w')
+    # Open PREPRO OBS file with a large write buffer
+    f = openDataFile(Path, 'w', Level)
 
     # Write header
     f.write(Hdr)
@@ -1215,6 +1774,78 @@ def createOutputFile(Path, Hdr):
 # End of createOutputFile()
 
 
+def resumeOutputFile(Path, Size, Level=Const.COMPRESSION_LEVEL):
+
+    # Purpose: reopen an output file to go on writing it from a
+    #          checkpoint, discarding what was written afterwards
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to file (compressed if it ends in .gz, .bz2 or .xz)
+    # Size: int
+    #         Size of the file at the checkpoint [B]
+    # Level: int
+    #         Compression level (1 to 9), if compressed
+
+    # Returns
+    # =======
+    # f: File descriptor
+    #         Descriptor of output file, positioned at its end
+
+    # Display Message
+    print("INFO: Resuming file: %s..." % Path)
+
+    # Check the file was not shortened since the checkpoint
+    if not os.path.isfile(Path) or os.path.getsize(Path) < Size:
+        sys.stderr.write("ERROR: Output file %s shorter than at the checkpoint\n" % Path)
+        sys.exit(1)
+
+    # Remove the lines written after the checkpoint
+    os.truncate(Path, Size)
+
+    return openDataFile(Path, 'a', Level)
+
+# End of resumeOutputFile()
+
+
+def syncOutputFile(f, Path, Level=Const.COMPRESSION_LEVEL):
+
+    # Purpose: write to disk all the contents of an output file, so that
+    #          it can be resumed from its current size
+
+    # Parameters
+    # ==========
+    # f: File descriptor
+    #         Descriptor of output file
+    # Path: str
+    #         Path to file
+    # Level: int
+    #         Compression level (1 to 9), if compressed
+
+    # Returns
+    # =======
+    # f: File descriptor
+    #         Descriptor of output file (a new one for compressed files)
+    # Size: int
+    #         Size of the file on disk [B]
+
+    # Compressed streams can only be resumed from their end: close the
+    # stream and go on writing a new one
+    if os.path.splitext(Path)[1] in COMPRESSION_FORMATS:
+        f.close()
+        Size = os.path.getsize(Path)
+        f = openDataFile(Path, 'a', Level)
+
+    else:
+        f.flush()
+        Size = os.path.getsize(Path)
+
+    return f, Size
+
+# End of syncOutputFile()
+
+
 def generatePreproFile(fpreprobs, PreproObsInfo):
 
     # Purpose: generate output file with Preprocessing results
@@ -1231,36 +1862,33 @@ def generatePreproFile(fpreprobs, PreproObsInfo):
     # =======
     # Nothing
 
-    # Loop over satellites
+    # Format all the satellites of the epoch
+    Lines = []
     for SatLabel, SatPreproObs in PreproObsInfo.items():
-        # Prepare outputs
-        Outputs = OrderedDict({})
-        Outputs["SOD"] = SatPreproObs["Sod"]
-        Outputs["DOY"] = SatPreproObs["Doy"]
-        Outputs["CONST"] = SatLabel[0]
-        Outputs["PRN"] = int(SatLabel[1:])
-        Outputs["ELEV"] = SatPreproObs["Elevation"]
-        Outputs["AZIM"] = SatPreproObs["Azimuth"]
-        Outputs["VALID"] = SatPreproObs["ValidL1"]
-        Outputs["REJECT"] = SatPreproObs["RejectionCause"]
-        Outputs["STATUS"] = SatPreproObs["Status"]
-        Outputs["C1"] = SatPreproObs["C1"]
-        Outputs["C1SMOOTHED"] = SatPreproObs["SmoothC1"]
-        Outputs["L1"] = SatPreproObs["L1Meters"]
-        Outputs["S1"] = SatPreproObs["S1"]
-        Outputs["CODE RATE"] = SatPreproObs["RangeRateL1"]
-        Outputs["CODE ACC"] = SatPreproObs["RangeRateStepL1"]
-        Outputs["PHASE RATE"] = SatPreproObs["PhaseRateL1"]
-        Outputs["PHASE ACC"] = SatPreproObs["PhaseRateStepL1"]
-        Outputs["GEOM FREE"] = SatPreproObs["GeomFree"]
-        Outputs["VTEC RATE"] = SatPreproObs["VtecRate"]
-        Outputs["iAATR"] = SatPreproObs["iAATR"]
-
-        # Write line
-        for i, result in enumerate(Outputs):
-            fpreprobs.write(((PreproFmt[i] + " ") % Outputs[result]))
-
-        fpreprobs.write("\n")
+        Lines.append(PreproLineFmt % (
+            SatPreproObs["Sod"],
+            SatPreproObs["Doy"],
+            SatLabel[0],
+            int(SatLabel[1:]),
+            SatPreproObs["Elevation"],
+            SatPreproObs["Azimuth"],
+            SatPreproObs["ValidL1"],
+            SatPreproObs["RejectionCause"],
+            SatPreproObs["Status"],
+            SatPreproObs["C1"],
+            SatPreproObs["SmoothC1"],
+            SatPreproObs["L1Meters"],
+            SatPreproObs["S1"],
+            SatPreproObs["RangeRateL1"],
+            SatPreproObs["RangeRateStepL1"],
+            SatPreproObs["PhaseRateL1"],
+            SatPreproObs["PhaseRateStepL1"],
+            SatPreproObs["GeomFree"],
+            SatPreproObs["VtecRate"],
+            SatPreproObs["iAATR"]))
+
+    # Write lines
+    fpreprobs.write("".join(Lines))
 
 # End of generatePreproFile
 
@@ -1281,43 +1909,40 @@ def generateCorrFile(fcorr, CorrInfo):
     # =======
     # Nothing
 
-    # Loop over satellites
+    # Format all the satellites of the epoch
+    Lines = []
     for SatLabel, SatCorrInfo in CorrInfo.items():
-        # Prepare outputs
-        Outputs = OrderedDict({})
-        Outputs["SOD"] = SatCorrInfo["Sod"]
-        Outputs["DOY"] = SatCorrInfo["Doy"]
-        Outputs["CONST"] = SatLabel[0]
-        Outputs["PRN"] = int(SatLabel[1:])
-        Outputs["ELEV"] = SatCorrInfo["Elevation"]
-        Outputs["AZIM"] = SatCorrInfo["Azimuth"]
-        Outputs["IPPLON"] = SatCorrInfo["IppLon"]
-        Outputs["IPPLAT"] = SatCorrInfo["IppLat"]
-        Outputs["FLAG"] = SatCorrInfo["Flag"]
-        Outputs["SAT-X"] = SatCorrInfo["SatX"]
-        Outputs["SAT-Y"] = SatCorrInfo["SatY"]
-        Outputs["SAT-Z"] = SatCorrInfo["SatZ"]
-        Outputs["SAT-CLK"] = SatCorrInfo["SatClk"]
-        Outputs["UISD"] = SatCorrInfo["Uisd"]
-        Outputs["STD"] = SatCorrInfo["Std"]
-        Outputs["CORR-PSR"] = SatCorrInfo["CorrPsr"]
-        Outputs["GEOM-RNGE"] = SatCorrInfo["GeomRange"]
-        Outputs["PSR-RES"] = SatCorrInfo["PsrResidual"]
-        Outputs["RCVR-CLK"] = SatCorrInfo["RcvrClk"]
-        Outputs["SFLT"] = SatCorrInfo["SigmaFlt"]
-        Outputs["SUIRE"] = SatCorrInfo["SigmaUire"]
-        Outputs["STROPO"] = SatCorrInfo["SigmaTropo"]
-        Outputs["SAIR"] = SatCorrInfo["SigmaAirborne"]
-        Outputs["SNOISEDIV"] = SatCorrInfo["SigmaNoiseDiv"]
-        Outputs["SMP"] = SatCorrInfo["SigmaMultipath"]
-        Outputs["SUERE"] = SatCorrInfo["SigmaUere"]
-        Outputs["ENTtoGPS"] = SatCorrInfo["EntGps"]
-
-        # Write line
-        for i, result in enumerate(Outputs):
-            fcorr.write(((CorrFmt[i] + " ") % Outputs[result]))
-
-        fcorr.write("\n")
+        Lines.append(CorrLineFmt % (
+            SatCorrInfo["Sod"],
+            SatCorrInfo["Doy"],
+            SatLabel[0],
+            int(SatLabel[1:]),
+            SatCorrInfo["Elevation"],
+            SatCorrInfo["Azimuth"],
+            SatCorrInfo["IppLon"],
+            SatCorrInfo["IppLat"],
+            SatCorrInfo["Flag"],
+            SatCorrInfo["SatX"],
+            SatCorrInfo["SatY"],
+            SatCorrInfo["SatZ"],
+            SatCorrInfo["SatClk"],
+            SatCorrInfo["Uisd"],
+            SatCorrInfo["Std"],
+            SatCorrInfo["CorrPsr"],
+            SatCorrInfo["GeomRange"],
+            SatCorrInfo["PsrResidual"],
+            SatCorrInfo["RcvrClk"],
+            SatCorrInfo["SigmaFlt"],
+            SatCorrInfo["SigmaUire"],
+            SatCorrInfo["SigmaTropo"],
+            SatCorrInfo["SigmaAirborne"],
+            SatCorrInfo["SigmaNoiseDiv"],
+            SatCorrInfo["SigmaMultipath"],
+            SatCorrInfo["SigmaUere"],
+            SatCorrInfo["EntGps"]))
+
+    # Write lines
+    fcorr.write("".join(Lines))
 
 # End of generateCorrFile
 
@@ -1339,36 +1964,30 @@ def generatePosFile(fpos, PosInfo, Rcvr):
     # =======
     # Nothing
 
-    # Prepare outputs
-    Outputs = OrderedDict({})
-    Outputs["SOD"] = PosInfo["Sod"]
-    Outputs["DOY"] = PosInfo["Doy"]
-    Outputs["RCVR"] = Rcvr
-    Outputs["LON"] = PosInfo["Lon"]
-    Outputs["LAT"] = PosInfo["Lat"]
-    Outputs["ALT"] = PosInfo["Alt"]
-    Outputs["CLK"] = PosInfo["Clk"]
-    Outputs["SOL"] = PosInfo["Sol"]
-    Outputs["NSV"] = PosInfo["NumSatVis"]
-    Outputs["NSV-SOL"] = PosInfo["NumSatSol"]
-    Outputs["HPE"] = PosInfo["Hpe"]
-    Outputs["VPE"] = PosInfo["Vpe"]
-    Outputs["EPE"] = PosInfo["Epe"]
-    Outputs["NPE"] = PosInfo["Npe"]
-    Outputs["HPL"] = PosInfo["Hpl"]
-    Outputs["VPL"] = PosInfo["Vpl"]
-    Outputs["HSI"] = PosInfo["Hsi"]
-    Outputs["VSI"] = PosInfo["Vsi"]
-    Outputs["HDOP"] = PosInfo["Hdop"]
-    Outputs["VDOP"] = PosInfo["Vdop"]
-    Outputs["PDOP"] = PosInfo["Pdop"]
-    Outputs["TDOP"] = PosInfo["Tdop"]
-
     # Write line
-    for i, result in enumerate(Outputs):
-        fpos.write(((PosFmt[i] + " ") % Outputs[result]))
-
-    fpos.write("\n")
+    fpos.write(PosLineFmt % (
+        PosInfo["Sod"],
+        PosInfo["Doy"],
+        Rcvr,
+        PosInfo["Lon"],
+        PosInfo["Lat"],
+        PosInfo["Alt"],
+        PosInfo["Clk"],
+        PosInfo["Sol"],
+        PosInfo["NumSatVis"],
+        PosInfo["NumSatSol"],
+        PosInfo["Hpe"],
+        PosInfo["Vpe"],
+        PosInfo["Epe"],
+        PosInfo["Npe"],
+        PosInfo["Hpl"],
+        PosInfo["Vpl"],
+        PosInfo["Hsi"],
+        PosInfo["Vsi"],
+        PosInfo["Hdop"],
+        PosInfo["Vdop"],
+        PosInfo["Pdop"],
+        PosInfo["Tdop"]))
 
 # End of generatePosFile
 
@@ -1389,146 +2008,564 @@ def generatePerfFile(fperf, PerfInfoSer):
     # =======
     # Nothing
 
-    # Prepare outputs
-    Outputs = OrderedDict({})
-    Outputs["RCVR"] = PerfInfoSer["Rcvr"]
-    Outputs["LON"] = PerfInfoSer["Lon"]
-    Outputs["LAT"] = PerfInfoSer["Lat"]
-    Outputs["DOY"] = PerfInfoSer["Doy"]
-    Outputs["SERVICE"] = PerfInfoSer["Service"]
-    Outputs["SAMSOL"] = PerfInfoSer["SamSol"]
-    Outputs["SAMNOSOL"] = PerfInfoSer["SamNoSol"]
-    Outputs["AVAIL"] = PerfInfoSer["Avail"]
-    Outputs["CONTRISK"] = PerfInfoSer["ContRisk"]
-    Outputs["NOTAVAIL"] = PerfInfoSer["NotAvail"]
-    Outputs["NSVMIN"] = PerfInfoSer["NsvMin"]
-    Outputs["NSVMAX"] = PerfInfoSer["NsvMax"]
-    Outputs["HPERMS"] = PerfInfoSer["HpeRms"]
-    Outputs["VPERMS"] = PerfInfoSer["VpeRms"]
-    Outputs["HPE95"] = PerfInfoSer["Hpe95"]
-    Outputs["VPE95"] = PerfInfoSer["Vpe95"]
-    Outputs["HPEMAX"] = PerfInfoSer["HpeMax"]
-    Outputs["VPEMAX"] = PerfInfoSer["VpeMax"]
-    Outputs["EXTVPE"] = PerfInfoSer["ExtVpe"]
-    Outputs["HPLMIN"] = PerfInfoSer["HplMin"]
-    Outputs["VPLMIN"] = PerfInfoSer["VplMin"]
-    Outputs["HPLMAX"] = PerfInfoSer["HplMax"]
-    Outputs["VPLMAX"] = PerfInfoSer["VplMax"]
-    Outputs["HSIMAX"] = PerfInfoSer["HsiMax"]
-    Outputs["VSIMAX"] = PerfInfoSer["VsiMax"]
-    Outputs["NMI"] = PerfInfoSer["Nmi"]
-    Outputs["NHMI"] = PerfInfoSer["Nhmi"]
-    Outputs["PDOPMAX"] = PerfInfoSer["PdopMax"]
-    Outputs["HDOPMAX"] = PerfInfoSer["HdopMax"]
-    Outputs["VDOPMAX"] = PerfInfoSer["VdopMax"]
-
     # Write line
-    for i, result in enumerate(Outputs):
-        fperf.write(((PerfFmt[i] + " ") % Outputs[result]))
-
-    fperf.write("\n")
+    fperf.write(PerfLineFmt % (
+        PerfInfoSer["Rcvr"],
+        PerfInfoSer["Lon"],
+        PerfInfoSer["Lat"],
+        PerfInfoSer["Doy"],
+        PerfInfoSer["Service"],
+        PerfInfoSer["SamSol"],
+        PerfInfoSer["SamNoSol"],
+        PerfInfoSer["Avail"],
+        PerfInfoSer["ContRisk"],
+        PerfInfoSer["NotAvail"],
+        PerfInfoSer["NsvMin"],
+        PerfInfoSer["NsvMax"],
+        PerfInfoSer["HpeRms"],
+        PerfInfoSer["VpeRms"],
+        PerfInfoSer["Hpe95"],
+        PerfInfoSer["Vpe95"],
+        PerfInfoSer["HpeMax"],
+        PerfInfoSer["VpeMax"],
+        PerfInfoSer["ExtVpe"],
+        PerfInfoSer["HplMin"],
+        PerfInfoSer["VplMin"],
+        PerfInfoSer["HplMax"],
+        PerfInfoSer["VplMax"],
+        PerfInfoSer["HsiMax"],
+        PerfInfoSer["VsiMax"],
+        PerfInfoSer["Nmi"],
+        PerfInfoSer["Nhmi"],
+        PerfInfoSer["PdopMax"],
+        PerfInfoSer["HdopMax"],
+        PerfInfoSer["VdopMax"]))
 
 # End of generatePerfFile
 
 
-def generateHistFile(fhist, VpeHistInfo):
+def generatePerfStateFile(StateFile, PerfInfo):
 
-    # Purpose: generate output file with LPV200 VPE Histogram results
+    # Purpose: save the performances information accumulated for all
+    #          the service levels, before computing the final
+    #          performances, so that it can be merged later with other
+    #          receiver-days (see mergePerfInfo)
 
     # Parameters
     # ==========
-    # fhist: file descriptor
-    #        Descriptor for VPE Histogram output file
-    # VpeHistInfoSer: dict
-    #                 Dictionary containing VPE Histogram info for LPV200 service level
+    # StateFile: str
+    #            Path to Performances state output file (JSON)
+    # PerfInfo: dict
+    #           Dictionary containing performances information for all
+    #           service levels
 
     # Returns
     # =======
     # Nothing
 
-    # Prepare outputs
-    Outputs = OrderedDict({})
-    Outputs["RCVR"] = VpeHistInfo["Rcvr"]
-    Outputs["SERVICE"] = VpeHistInfo["Service"]
-    Outputs["BINID"] = VpeHistInfo["BinId"]
-    Outputs["BINMIN"] = VpeHistInfo["BinMin"]
-    Outputs["BINMAX"] = VpeHistInfo["BinMax"]
-    Outputs["NUMSAM"] = VpeHistInfo["BinNumSam"]
-    Outputs["BINFREQ"] = VpeHistInfo["BinFreq"]
+    # Display Message
+    print("INFO: Creating file: %s..." % StateFile)
 
-    # Write line
-    for i, result in enumerate(Outputs):
-        fhist.write(((HistFmt[i] + " ") % Outputs[result]))
+    # Create output directory, if needed
+    if not os.path.exists(os.path.dirname(StateFile)):
+        os.makedirs(os.path.dirname(StateFile))
 
-    fhist.write("\n")
+    # Pack the histograms of each service level
+    State = OrderedDict({})
+    for Service, PerfInfoSer in PerfInfo.items():
+        State[Service] = dict(PerfInfoSer)
+        State[Service]["HpeHist"] = Stats.packHist(PerfInfoSer["HpeHist"])
+        State[Service]["VpeHist"] = Stats.packHist(PerfInfoSer["VpeHist"])
 
-# End of generateHistFile
+    # Write file, NumPy scalars are written as Python numbers
+    with open(StateFile, 'w') as f:
+        json.dump(State, f, default=lambda Value: Value.item())
 
+# End of generatePerfStateFile
+
+
+def generateTimingFile(TimingFile, Report):
+
+    # Purpose: save a stage timing report (see computeTiming)
 
-def openInputFile(Path):
-    
-    # Purpose: check existence and open input file
-       
     # Parameters
     # ==========
-    # Path: str
-    #         Path to file
+    # TimingFile: str
+    #             Path to Timing output file (JSON)
+    # Report: dict
+    #         Stage timing report
 
     # Returns
     # =======
-    # f: File descriptor
-    #         Descriptor of the input file
+    # Nothing
 
     # Display Message
-    print("INFO: Reading file: %s..." %
-    Path)
+    print("INFO: Creating file: %s..." % TimingFile)
 
-    # Try to open the file
-    try:
-        # Open PREPRO OBS file
-        f = open(Path, 'r')
+    # Create output directory, if needed
+    if not os.path.exists(os.path.dirname(TimingFile)):
+        os.makedirs(os.path.dirname(TimingFile))
 
-        # Read header line
-        f.readline()
+    # Write file
+    with open(TimingFile, 'w') as f:
+        json.dump(Report, f, indent=2)
 
-    # If file could not be opened
-    except:
-        # Display error
-        sys.stderr.write("ERROR: In input file: %s...\n" %
-        Path)
+# End of generateTimingFile
 
-    return f
 
-# End of openInputFile()
+# Version of the checkpoint layout: increase it whenever the layout
+# changes so that existing checkpoints are not resumed
+CHECKPOINT_VERSION = 2
 
+# Configuration parameters not affecting the outputs, which may change
+# between the run writing a checkpoint and the run resuming it
+CHECKPOINT_FREE_PARAMS = ["CHECKPOINT_RATE", "NJOBS", "PLOT_JOBS", \
+    "OUTPUT_WRITER", "STAGE_TIMING", "INPUT_CACHE"]
+
+def generateCheckpointFile(CheckpointFile, Checkpoint):
+
+    # Purpose: save the checkpoint of a receiver-day, replacing the
+    #          previous one only once it is completely written
 
-def readInputEpoch(f, ColIdx):
-    
-    # Purpose: read one epoch of inputs files (SAT and LOS)
-       
     # Parameters
     # ==========
-    # f: file descriptor
-    #         input file
-    # ColIdx: dict
-    #         Dictionary containing the column index for each parameter
+    # CheckpointFile: str
+    #         Path to Checkpoint output file
+    # Checkpoint: dict
+    #         Processing state of the receiver-day
 
     # Returns
     # =======
-    # EpochInfo: dict
-    #         dictionary containing the split lines of the file
-    #         EpochInfo["G01"][1] is the second field of the 
-    #         line containing G01 info
+    # Nothing
 
-    EpochInfo = {}
-    
-    # Read one line
-    Line = f.readline()
-    if(not Line):
-        return {}, -1
-    LineSplit = splitLine(Line)
-    Sod = LineSplit[ColIdx["SOD"]]
-    SodNext = Sod
+    # Create output directory, if needed
+    if not os.path.exists(os.path.dirname(CheckpointFile)):
+        os.makedirs(os.path.dirname(CheckpointFile))
+
+    Checkpoint = dict(Checkpoint)
+    Checkpoint["Version"] = CHECKPOINT_VERSION
+
+    # Pack the histograms of each service level
+    if "PerfInfo" in Checkpoint:
+        PerfInfo = OrderedDict({})
+        for Service, PerfInfoSer in Checkpoint["PerfInfo"].items():
+            PerfInfo[Service] = dict(PerfInfoSer)
+            PerfInfo[Service]["HpeHist"] = Stats.packHist(PerfInfoSer["HpeHist"])
+            PerfInfo[Service]["VpeHist"] = Stats.packHist(PerfInfoSer["VpeHist"])
+        Checkpoint["PerfInfo"] = PerfInfo
+
+    # Write a temporary file and replace the previous checkpoint
+    with open(CheckpointFile + ".tmp", 'wb') as f:
+        pickle.dump(Checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(CheckpointFile + ".tmp", CheckpointFile)
+
+# End of generateCheckpointFile
+
+
+def readCheckpointFile(CheckpointFile, Conf):
+
+    # Purpose: read the checkpoint of a receiver-day, if any
+
+    # Parameters
+    # ==========
+    # CheckpointFile: str
+    #         Path to Checkpoint file
+    # Conf: dict
+    #         Configuration dictionary, which must be the one of the
+    #         checkpoint
+
+    # Returns
+    # =======
+    # Checkpoint: dict
+    #         Processing state of the receiver-day (None if there is
+    #         no checkpoint)
+
+    if not os.path.isfile(CheckpointFile):
+        return None
+
+    # Display Message
+    print("INFO: Reading file: %s..." % CheckpointFile)
+
+    with open(CheckpointFile, 'rb') as f:
+        Checkpoint = pickle.load(f)
+
+    if Checkpoint.get("Version") != CHECKPOINT_VERSION:
+        sys.stderr.write("ERROR: Checkpoint %s written by another version\n" % \
+            CheckpointFile)
+        sys.exit(1)
+
+    # Check the outputs are produced with the same configuration
+    if getCheckpointConf(Checkpoint["Conf"]) != getCheckpointConf(Conf):
+        sys.stderr.write("ERROR: Checkpoint %s written with another configuration\n" % \
+            CheckpointFile)
+        sys.exit(1)
+
+    # Unpack the histograms of each service level
+    if "PerfInfo" in Checkpoint:
+        for PerfInfoSer in Checkpoint["PerfInfo"].values():
+            PerfInfoSer["HpeHist"] = Stats.unpackHist(PerfInfoSer["HpeHist"])
+            PerfInfoSer["VpeHist"] = Stats.unpackHist(PerfInfoSer["VpeHist"])
+
+    return Checkpoint
+
+# End of readCheckpointFile
+
+
+def getCheckpointConf(Conf):
+
+    # Purpose: get the configuration parameters which must not change
+    #          between the run writing a checkpoint and the run
+    #          resuming it
+
+    # Parameters
+    # ==========
+    # Conf: dict
+    #         Configuration dictionary
+
+    # Returns
+    # =======
+    # CheckpointConf: dict
+    #         Configuration without the CHECKPOINT_FREE_PARAMS
+
+    return OrderedDict([(Key, Value) for Key, Value in Conf.items() \
+        if Key not in CHECKPOINT_FREE_PARAMS])
+
+# End of getCheckpointConf
+
+
+def readPerfStateFile(StateFile):
+
+    # Purpose: read the performances information saved by
+    #          generatePerfStateFile
+
+    # Parameters
+    # ==========
+    # StateFile: str
+    #            Path to Performances state file (JSON)
+
+    # Returns
+    # =======
+    # PerfInfo: dict
+    #           Dictionary containing performances information for all
+    #           service levels
+
+    # Check if file exists
+    if not os.path.isfile(StateFile):
+        sys.stderr.write("ERROR: File %s does not exist\n" % StateFile)
+        sys.exit(1)
+
+    # Read file
+    with open(StateFile, 'r') as f:
+        State = json.load(f, object_pairs_hook=OrderedDict)
+
+    # Unpack the histograms of each service level
+    PerfInfo = OrderedDict({})
+    for Service, PerfInfoSer in State.items():
+        PerfInfoSer["HpeHist"] = Stats.unpackHist(PerfInfoSer["HpeHist"])
+        PerfInfoSer["VpeHist"] = Stats.unpackHist(PerfInfoSer["VpeHist"])
+        PerfInfo[Service] = PerfInfoSer
+
+    return PerfInfo
+
+# End of readPerfStateFile
+
+
+def generateHistFile(fhist, VpeHistInfo):
+
+    # Purpose: generate output file with LPV200 VPE Histogram results
+
+    # Parameters
+    # ==========
+    # fhist: file descriptor
+    #        Descriptor for VPE Histogram output file
+    # VpeHistInfoSer: dict
+    #                 Dictionary containing VPE Histogram info for LPV200 service level
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Write line
+    fhist.write(HistLineFmt % (
+        VpeHistInfo["Rcvr"],
+        VpeHistInfo["Service"],
+        VpeHistInfo["BinId"],
+        VpeHistInfo["BinMin"],
+        VpeHistInfo["BinMax"],
+        VpeHistInfo["BinNumSam"],
+        VpeHistInfo["BinFreq"]))
+
+# End of generateHistFile
+
+
+# Maximum number of records waiting in the queue of the output writer
+OUTPUT_QUEUE_SIZE = 1024
+
+def openOutputWriter():
+
+    # Purpose: start a background thread that formats and writes the
+    #          output records, so that processing goes on while the disk
+    #          is busy
+
+    # Parameters
+    # ==========
+    # None
+
+    # Returns
+    # =======
+    # Writer: dict
+    #         Output writer, to be given to writeOutput and
+    #         closeOutputWriter
+
+    Writer = OrderedDict({})
+    Writer["Queue"] = queue.Queue(maxsize=OUTPUT_QUEUE_SIZE)
+    Writer["Error"] = None
+    Writer["Thread"] = threading.Thread(target=runOutputWriter, args=(Writer,), \
+        daemon=True)
+    Writer["Thread"].start()
+
+    return Writer
+
+# End of openOutputWriter()
+
+
+def runOutputWriter(Writer):
+
+    # Purpose: body of the output writer thread: call the queued writing
+    #          functions until the end mark (None) is received
+
+    # Parameters
+    # ==========
+    # Writer: dict
+    #         Output writer opened with openOutputWriter
+
+    # Returns
+    # =======
+    # Nothing
+
+    while True:
+        Record = Writer["Queue"].get()
+        if Record is None:
+            break
+
+        # After an error, keep draining the queue so that the processing
+        # loop is never blocked, until it gets the error
+        if Writer["Error"] is None:
+            WriteFunc, WriteArgs = Record
+            try:
+                WriteFunc(*WriteArgs)
+            except Exception as Error:
+                Writer["Error"] = Error
+
+# End of runOutputWriter()
+
+
+def checkOutputWriter(Writer):
+
+    # Purpose: stop the run if the output writer failed
+
+    # Parameters
+    # ==========
+    # Writer: dict
+    #         Output writer opened with openOutputWriter
+
+    # Returns
+    # =======
+    # Nothing
+
+    if Writer["Error"] is not None:
+        sys.stderr.write("ERROR: Writing output files: %s\n" % Writer["Error"])
+        sys.exit(1)
+
+# End of checkOutputWriter()
+
+
+def writeOutput(Writer, WriteFunc, *WriteArgs):
+
+    # Purpose: write an output record (e.g. one epoch of PREPRO, CORR or
+    #          POS) directly or through the output writer thread. If the
+    #          queue of the writer is full, wait for it (backpressure)
+
+    # Parameters
+    # ==========
+    # Writer: dict
+    #         Output writer opened with openOutputWriter (None to write
+    #         directly)
+    # WriteFunc: function
+    #         Writing function (e.g. generateCorrFile)
+    # WriteArgs: tuple
+    #         Arguments of the writing function
+
+    # Returns
+    # =======
+    # Nothing
+
+    if Writer is None:
+        WriteFunc(*WriteArgs)
+    else:
+        checkOutputWriter(Writer)
+        Writer["Queue"].put((WriteFunc, WriteArgs))
+
+# End of writeOutput()
+
+
+def closeOutputWriter(Writer):
+
+    # Purpose: wait until all the queued records are written and stop
+    #          the output writer thread
+
+    # Parameters
+    # ==========
+    # Writer: dict
+    #         Output writer opened with openOutputWriter (None if
+    #         outputs are written directly)
+
+    # Returns
+    # =======
+    # Nothing
+
+    if Writer is not None:
+        Writer["Queue"].put(None)
+        Writer["Thread"].join()
+        checkOutputWriter(Writer)
+
+# End of closeOutputWriter()
+
+
+def generateColumnsFile(f, LineFmt, Columns):
+
+    # Purpose: write many lines of an output file at once, from arrays
+    #          (or lists) holding one column each, e.g. a whole day of
+    #          results
+
+    # Parameters
+    # ==========
+    # f: file descriptor
+    #         Descriptor for the output file
+    # LineFmt: str
+    #         Line template of the file (e.g. PosLineFmt)
+    # Columns: list
+    #         Arrays or lists with the values of each column, in the
+    #         order of the file columns
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Get the rows as python values, so that they are formatted as the
+    # per-epoch writers do
+    Rows = zip(*[Column.tolist() if isinstance(Column, np.ndarray) else Column \
+        for Column in Columns])
+
+    # Write lines
+    f.write("".join([LineFmt % Row for Row in Rows]))
+
+# End of generateColumnsFile()
+
+
+def openInputFile(Path, ColIdx=None, UseCache=0):
+    
+    # Purpose: check existence and open input file
+       
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to file
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+    #         (if given, the epochs of the file are indexed)
+    # UseCache: int
+    #         1: open the file through its binary cache
+
+    # Returns
+    # =======
+    # f: File descriptor or dict
+    #         Descriptor of the input file, epoch index or binary cache
+
+    # Get the path to the file, which may be compressed
+    Path = findInputFile(Path)
+
+    # Display Message
+    print("INFO: Reading file: %s..." %
+    Path)
+
+    # If binary cache is activated
+    if UseCache == 1:
+        return openInputCache(Path, ColIdx)
+
+    # If columns are known, index the epochs of the file
+    if ColIdx is not None:
+        return openInputIndex(Path, ColIdx)
+
+    # Try to open the file
+    try:
+        # Open PREPRO OBS file
+        f = openDataFile(Path)
+
+        # Read header line
+        f.readline()
+
+    # If file could not be opened
+    except:
+        # Display error
+        sys.stderr.write("ERROR: In input file: %s...\n" %
+        Path)
+
+    return f
+
+# End of openInputFile()
+
+
+def readInputEpoch(f, ColIdx):
+    
+    # Purpose: read one epoch of inputs files (SAT and LOS)
+       
+    # Parameters
+    # ==========
+    # f: file descriptor
+    #         input file
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+
+    # Returns
+    # =======
+    # EpochInfo: dict
+    #         dictionary containing the split lines of the file
+    #         EpochInfo["G01"][1] is the second field of the 
+    #         line containing G01 info
+
+    # If the input file is read through its epoch index or binary cache
+    if isinstance(f, dict):
+        # Read the rows of the next epoch
+        if "Data" in f:
+            EpochRows = readCachedEpoch(f)
+        else:
+            EpochRows = readIndexedEpoch(f)
+        if(EpochRows == []):
+            return {}, -1
+
+        EpochInfo = {}
+        for LineSplit in EpochRows:
+            Label = LineSplit[ColIdx["CONST"]] + "%02d" % int(LineSplit[ColIdx["PRN"]])
+            EpochInfo[Label]=LineSplit
+
+        # As for the text file, the SoD of the last epoch is not reported
+        if(f["EpochPtr"] >= len(f["Sods"])):
+            return EpochInfo, -1
+
+        return EpochInfo, int(EpochRows[0][ColIdx["SOD"]])
+
+    EpochInfo = {}
+    
+    # Read one line
+    Line = f.readline()
+    if(not Line):
+        return {}, -1
+    LineSplit = splitLine(Line)
+    Sod = LineSplit[ColIdx["SOD"]]
+    SodNext = Sod
 
     while SodNext == Sod:
         Label = LineSplit[ColIdx["CONST"]] + "%02d" % int(LineSplit[ColIdx["PRN"]])
@@ -1577,6 +2614,9 @@ def readCorrectInputs(fsat, flos, CurrentSod):
     SatInfo = {}
     LosInfo = {}
 
+    # Skip the SAT epochs before current SoD, if the file is indexed
+    seekInputEpoch(fsat, CurrentSod)
+
     # Read one epoch of SAT file
     SatInfo, SodInputs = readInputEpoch(fsat, SatIdx)
 
@@ -1607,11 +2647,14 @@ def readCorrectInputs(fsat, flos, CurrentSod):
             sys.stderr.write("WARNING: Data gap at SoD %d in SAT file\n" % CurrentSod)
             return SatInfo, LosInfo, SodInputs
 
+    # Skip the LOS epochs before current SoD, if the file is indexed
+    seekInputEpoch(flos, CurrentSod)
+
     # Read one epoch of LOS file
     LosInfo, SodInputs = readInputEpoch(flos, LosIdx)
 
     # If LOS file ended, raise error
-    if(LosInfo == []):
+    if(LosInfo == {}):
         sys.stderr.write("ERROR: LOS file ended before SoD %s\n" % CurrentSod)
         sys.exit(-1)
 
@@ -1641,3 +2684,464 @@ def readCorrectInputs(fsat, flos, CurrentSod):
 
 # End of readCorrectInputs()
 
+
+# Epoch index of input files
+#----------------------------------------------------------------------
+def openInputIndex(Path, ColIdx):
+
+    # Purpose: open an input file (SAT or LOS) and index the byte offset
+    #          of each epoch in a single scan, so that epochs can be
+    #          reached with one seek and only the needed ones are split
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to the input text file
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+
+    # Returns
+    # =======
+    # Index: dict
+    #         Epoch index, to be used in place of a file descriptor by
+    #         readInputEpoch and seekInputEpoch
+
+    # Check existence of the input file
+    if not os.path.isfile(Path):
+        sys.stderr.write("ERROR: In input file: %s...\n" % Path)
+        sys.exit(-1)
+
+    f = openDataFile(Path, 'rb')
+
+    # Skip header line
+    f.readline()
+
+    # Get the first byte and SoD of each epoch
+    SodCol = ColIdx["SOD"]
+    Offsets = []
+    Sods = []
+    Offset = f.tell()
+    PrevSod = None
+    for Line in f:
+        LineSplit = Line.split(None, SodCol + 1)
+
+        # Stop at the first empty line, as the epoch readers do
+        if len(LineSplit) <= SodCol:
+            break
+
+        if LineSplit[SodCol] != PrevSod:
+            PrevSod = LineSplit[SodCol]
+            Offsets.append(Offset)
+            Sods.append(float(PrevSod))
+
+        Offset += len(Line)
+
+    # Add the end of the last epoch
+    Offsets.append(Offset)
+
+    Index = OrderedDict({})
+    Index["File"] = f
+    Index["Offsets"] = np.array(Offsets, dtype=np.int64)
+    Index["Sods"] = np.array(Sods, dtype=np.float64)
+    Index["EpochPtr"] = 0
+
+    return Index
+
+# End of openInputIndex()
+
+
+def readIndexedEpoch(Index):
+
+    # Purpose: read one epoch from an indexed input file
+
+    # Parameters
+    # ==========
+    # Index: dict
+    #         Epoch index opened with openInputIndex
+
+    # Returns
+    # =======
+    # EpochInfo: list
+    #         list of the split lines of the epoch
+
+    # If file ended
+    if Index["EpochPtr"] >= len(Index["Sods"]):
+        return []
+
+    Start, End = Index["Offsets"][Index["EpochPtr"]:Index["EpochPtr"]+2]
+    Index["EpochPtr"] += 1
+
+    # Read the whole epoch at once
+    Index["File"].seek(Start)
+    Lines = Index["File"].read(End - Start).decode().splitlines()
+
+    return [splitLine(Line) for Line in Lines]
+
+# End of readIndexedEpoch()
+
+
+def seekInputEpoch(f, Sod):
+
+    # Purpose: move an indexed input file or binary cache forward to the
+    #          first epoch whose SoD is not earlier than the given one,
+    #          without reading the skipped epochs
+
+    # Parameters
+    # ==========
+    # f: File descriptor or dict
+    #         Descriptor of the input file, epoch index or cache
+    # Sod: int
+    #         Second of Day to be reached
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Plain text files are read forward epoch by epoch
+    if not isinstance(f, dict):
+        return
+
+    f["EpochPtr"] += int(np.searchsorted(f["Sods"][f["EpochPtr"]:], Sod, side='left'))
+
+# End of seekInputEpoch()
+
+
+# Binary cache of input files
+#----------------------------------------------------------------------
+# Version of the cache layout: increase it whenever the layout changes
+# so that existing caches are rebuilt
+CACHE_VERSION = 1
+
+# Name of the cache directory created next to each input file
+CACHE_DIR = "CACHE"
+
+def getInputCachePaths(Path):
+
+    # Purpose: build the paths to the binary cache files of an input file
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to the input text file
+
+    # Returns
+    # =======
+    # CachePaths: dict
+    #         Paths to the data, epoch index and stamp files
+
+    CacheDir = os.path.join(os.path.dirname(Path), CACHE_DIR)
+    Base = os.path.join(CacheDir, os.path.basename(Path))
+
+    CachePaths = OrderedDict({})
+    CachePaths["Data"] = Base + ".data.npy"
+    CachePaths["Epochs"] = Base + ".epochs.npy"
+    CachePaths["Stamp"] = Base + ".stamp"
+
+    return CachePaths
+
+# End of getInputCachePaths()
+
+
+def computeFileHash(Path):
+
+    # Purpose: compute the SHA-1 digest of a file
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to file
+
+    # Returns
+    # =======
+    # Hash: str
+    #         Hexadecimal SHA-1 digest of the file contents
+
+    Sha = hashlib.sha1()
+    with open(Path, 'rb') as f:
+        for Chunk in iter(lambda: f.read(1 << 20), b''):
+            Sha.update(Chunk)
+
+    return Sha.hexdigest()
+
+# End of computeFileHash()
+
+
+def writeInputCacheStamp(StampPath, Path, NCols, Hash):
+
+    # Purpose: write the stamp identifying the source of a cache
+
+    # Parameters
+    # ==========
+    # StampPath: str
+    #         Path to the stamp file
+    # Path: str
+    #         Path to the input text file
+    # NCols: int
+    #         Number of columns of the input file
+    # Hash: str
+    #         SHA-1 digest of the input file
+
+    # Returns
+    # =======
+    # Nothing
+
+    Stat = os.stat(Path)
+    TmpPath = StampPath + ".%d.tmp" % os.getpid()
+    with open(TmpPath, 'w') as f:
+        f.write("%d %d %d %d %s\n" %
+        (CACHE_VERSION, NCols, Stat.st_size, Stat.st_mtime_ns, Hash))
+    os.replace(TmpPath, StampPath)
+
+# End of writeInputCacheStamp()
+
+
+def checkInputCache(Path, ColIdx, CachePaths):
+
+    # Purpose: check whether the binary cache of an input file is
+    #          up to date with respect to its source
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to the input text file
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+    # CachePaths: dict
+    #         Paths to the cache files
+
+    # Returns
+    # =======
+    # Valid: bool
+    #         True if the cache can be used
+
+    # Check that all cache files exist
+    for CachePath in CachePaths.values():
+        if not os.path.isfile(CachePath):
+            return False
+
+    # Read the stamp
+    try:
+        with open(CachePaths["Stamp"], 'r') as f:
+            StampSplit = splitLine(f.readline())
+        Version, NCols, Size, Mtime = [int(Field) for Field in StampSplit[:4]]
+        Hash = StampSplit[4]
+    except (ValueError, IndexError):
+        return False
+
+    # Check the cache layout and source size
+    Stat = os.stat(Path)
+    if Version != CACHE_VERSION or NCols != len(ColIdx) or \
+        Size != Stat.st_size:
+        return False
+
+    # If the modification time changed, check the contents
+    if Mtime != Stat.st_mtime_ns:
+        if computeFileHash(Path) != Hash:
+            return False
+
+        # Same contents: refresh the stamp to skip hashing next time
+        writeInputCacheStamp(CachePaths["Stamp"], Path, NCols, Hash)
+
+    return True
+
+# End of checkInputCache()
+
+
+def buildInputCache(Path, ColIdx, CachePaths):
+
+    # Purpose: parse an input text file (OBS, SAT or LOS) once and store
+    #          it as a columnar binary cache:
+    #          - Data: float64 array with one column per ColIdx entry,
+    #            stored column-major. The CONST column holds the
+    #            character code of the constellation letter
+    #          - Epochs: int64 array with the first and last+1 rows of
+    #            each epoch
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to the input text file
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+    # CachePaths: dict
+    #         Paths to the cache files
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Display Message
+    print("INFO: Building binary cache of file: %s..." % Path)
+
+    NCols = len(ColIdx)
+    ConstCol = ColIdx["CONST"]
+
+    # Parse the text file
+    Rows = []
+    with openDataFile(Path) as f:
+        # Skip header line
+        f.readline()
+        for Line in f:
+            LineSplit = splitLine(Line)
+
+            # Stop at the first empty line, as the epoch readers do
+            if not LineSplit:
+                break
+
+            LineSplit[ConstCol] = ord(LineSplit[ConstCol])
+            Rows.append([float(Field) for Field in LineSplit[:NCols]])
+
+    Data = np.asfortranarray(np.array(Rows, dtype=np.float64).reshape(-1, NCols))
+
+    # Build the epoch index
+    Sods = Data[:, ColIdx["SOD"]]
+    Starts = np.flatnonzero(np.r_[True, Sods[1:] != Sods[:-1]]) if len(Sods) > 0 \
+        else np.zeros(0, dtype=np.int64)
+    Ends = np.r_[Starts[1:], len(Sods)]
+    Epochs = np.column_stack((Starts, Ends)).astype(np.int64)
+
+    # Create cache directory, if needed
+    CacheDir = os.path.dirname(CachePaths["Data"])
+    if not os.path.exists(CacheDir):
+        os.makedirs(CacheDir, exist_ok=True)
+
+    # Write the arrays through temporary files, so that concurrent
+    # readers never see partial caches
+    for Key, Array in (("Data", Data), ("Epochs", Epochs)):
+        TmpPath = CachePaths[Key] + ".%d.tmp" % os.getpid()
+        with open(TmpPath, 'wb') as f:
+            np.save(f, Array)
+        os.replace(TmpPath, CachePaths[Key])
+
+    # Write the stamp last, as it validates the cache
+    writeInputCacheStamp(CachePaths["Stamp"], Path, NCols, computeFileHash(Path))
+
+# End of buildInputCache()
+
+
+def openInputCache(Path, ColIdx):
+
+    # Purpose: open an input file (OBS, SAT or LOS) through its columnar
+    #          binary cache, building the cache if it is missing or out
+    #          of date
+
+    # Parameters
+    # ==========
+    # Path: str
+    #         Path to the input text file
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+
+    # Returns
+    # =======
+    # Cache: dict
+    #         Memory-mapped cache, to be used in place of a file
+    #         descriptor by readObsEpoch and readInputEpoch
+
+    # Check existence of the input file, which may be compressed
+    Path = findInputFile(Path)
+    if not os.path.isfile(Path):
+        sys.stderr.write("ERROR: In input file: %s...\n" % Path)
+        sys.exit(-1)
+
+    # Build the cache if needed
+    CachePaths = getInputCachePaths(Path)
+    if not checkInputCache(Path, ColIdx, CachePaths):
+        buildInputCache(Path, ColIdx, CachePaths)
+
+    Cache = OrderedDict({})
+    Cache["Data"] = np.load(CachePaths["Data"], mmap_mode='r')
+    Cache["Epochs"] = np.load(CachePaths["Epochs"])
+    Cache["Sods"] = np.array(Cache["Data"][Cache["Epochs"][:, 0], ColIdx["SOD"]])
+    Cache["ConstCol"] = ColIdx["CONST"]
+    Cache["EpochPtr"] = 0
+
+    return Cache
+
+# End of openInputCache()
+
+
+def readCachedEpoch(Cache):
+
+    # Purpose: read one epoch from a binary cache
+
+    # Parameters
+    # ==========
+    # Cache: dict
+    #         Cache opened with openInputCache
+
+    # Returns
+    # =======
+    # EpochInfo: list
+    #         list of the lines of the epoch, with the same layout as
+    #         the split text lines but holding numbers instead of strings
+    #         (except the CONST column)
+
+    # If cache ended
+    if Cache["EpochPtr"] >= len(Cache["Epochs"]):
+        return []
+
+    Start, End = Cache["Epochs"][Cache["EpochPtr"]]
+    Cache["EpochPtr"] += 1
+
+    EpochInfo = Cache["Data"][Start:End].tolist()
+    ConstCol = Cache["ConstCol"]
+    for LineSplit in EpochInfo:
+        LineSplit[ConstCol] = chr(int(LineSplit[ConstCol]))
+
+    return EpochInfo
+
+# End of readCachedEpoch()
+
+
+def convertEpochRows(EpochRows, ColIdx):
+
+    # Purpose: convert the lines of one epoch of an input file (split
+    #          text fields or binary cache rows) into a float array
+
+    # Parameters
+    # ==========
+    # EpochRows: list
+    #         list of the lines, as given by readObsEpoch or as the
+    #         values of readInputEpoch outputs
+    # ColIdx: dict
+    #         Dictionary containing the column index for each parameter
+
+    # Returns
+    # =======
+    # EpochArray: numpy array
+    #         float64 array with one row per line and one column per
+    #         ColIdx entry. The CONST column is set to 0
+
+    NCols = len(ColIdx)
+    ConstCol = ColIdx["CONST"]
+
+    EpochArray = np.array([LineSplit[:ConstCol] + [0] + LineSplit[ConstCol+1:NCols] \
+        for LineSplit in EpochRows], dtype=np.float64).reshape(-1, NCols)
+
+    return EpochArray
+
+# End of convertEpochRows()
+
+
+def closeInputFile(f):
+
+    # Purpose: close an input file, epoch index or binary cache
+
+    # Parameters
+    # ==========
+    # f: File descriptor or dict
+    #         Descriptor of the input file, epoch index or cache
+
+    # Returns
+    # =======
+    # Nothing
+
+    if isinstance(f, dict):
+        if "File" in f:
+            f["File"].close()
+        f.clear()
+    else:
+        f.close()
+
+# End of closeInputFile()
@@ -0,0 +1,611 @@
+#!/usr/bin/env python
+
+########################################################################
+# OutDiff.py:
+# This is the Outputs Comparison Module of PETRUS tool
+#
+#  Project:        PETRUS
+#  File:           OutDiff.py
+#  Date(YY/MM/DD): 01/02/21
+#
+#   Author: GNSS Academy
+#   Copyright 2021 GNSS Academy
+#
+# -----------------------------------------------------------------
+# Date       | Author             | Action
+# -----------------------------------------------------------------
+#
+# Usage:
+#   OutDiff.py $REF_OUT_DIR $TEST_OUT_DIR [$COLUMN=$ABS_TOL[,$REL_TOL] ...]
+#
+# Compares the PREPRO, CORR, POS, PERF and VPE_HIST files of two
+# output trees (OUT directories of two scenarios, e.g. a reference
+# run and a run of an optimized engine), plain or compressed, column
+# by column. Numerical values are equal if |TEST-REF| <= ABS_TOL +
+# REL_TOL*|REF| (exact comparison by default), where the tolerances
+# may be given for all the columns (COLUMN: *), all the columns of a
+# type of file (e.g. POS.*), a column of every file (e.g. HPE) or a
+# column of a type of file (e.g. POS.HPE). The rows of both files are
+# matched on their key columns (epoch, satellite, receiver, service or
+# histogram bin), so that a missing or an extra row does not shift the
+# rest of the file. For each differing file, the first differing row,
+# the first rows only in one of the files and the statistics of the
+# differences of each column are reported. The exit status is 1 if
+# any file differs or is missing in one tree
+########################################################################
+
+
+# Import External and Internal functions and Libraries
+#----------------------------------------------------------------------
+import sys, os
+import numpy as np
+from io import BytesIO
+from itertools import islice, compress, count
+from operator import ne
+from pandas import read_csv
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from InputOutput import openDataFile, COMPRESSION_FORMATS
+from InputOutput import PreproIdx, CorrIdx, PosIdx, PerfIdx, HistIdx
+from InputOutput import PreproFmt, CorrFmt, PosFmt, PerfFmt, HistFmt
+
+# Comparison parameters
+#----------------------------------------------------------------------
+DIFF_ABS_TOL = 0.0                      # Default absolute tolerance
+DIFF_REL_TOL = 0.0                      # Default relative tolerance
+DIFF_CHUNK_ROWS = 1000000               # Rows compared together
+DIFF_BLOCK_SIZE = 1 << 22               # Bytes compared together [B]
+DIFF_NJOBS = 0                          # Processes (0: as many as available CPUs)
+
+# Output files to be compared: directory, file name prefix, columns,
+# formats and key columns identifying the rows of each type of file.
+# Files whose first key column is numerical are sorted by it and are
+# aligned by chunks; the rest (a row per receiver and service or per
+# histogram bin) are aligned at once
+DiffFiles = OrderedDict({})
+DiffFiles["PREPRO"] = ("PPVE", "PREPRO_OBS_", PreproIdx, PreproFmt, ["SOD", "CONST", "PRN"])
+DiffFiles["CORR"] = ("CORR", "CORR_", CorrIdx, CorrFmt, ["SOD", "CONST", "PRN"])
+DiffFiles["POS"] = ("SPVT", "POS_", PosIdx, PosFmt, ["SOD"])
+DiffFiles["PERF"] = ("PERF", "PERF_", PerfIdx, PerfFmt, ["RCVR", "SERVICE"])
+DiffFiles["HIST"] = ("PERF", "VPE_HIST_", HistIdx, HistFmt, ["RCVR", "SERVICE", "BINID"])
+
+#----------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+#----------------------------------------------------------------------
+
+def displayUsage():
+    sys.stderr.write("ERROR: Please provide paths to the reference and test "\
+        "OUT directories as arguments, optionally followed by tolerances "\
+        "as COLUMN=ABS_TOL[,REL_TOL]\n")
+
+def readTolerances(Args):
+
+    # Purpose: read the tolerances given as arguments
+
+    # Parameters
+    # ==========
+    # Args: list
+    #         Tolerances as COLUMN=ABS_TOL[,REL_TOL]
+
+    # Returns
+    # =======
+    # Tols: dict
+    #         Absolute and relative tolerances per column (*, COLUMN
+    #         or TYPE.COLUMN)
+
+    Tols = OrderedDict({})
+    for Arg in Args:
+        Column, Sep, Values = Arg.rpartition('=')
+        try:
+            Values = [float(Value) for Value in Values.split(',')]
+        except ValueError:
+            Values = []
+
+        if Column == "" or not 1 <= len(Values) <= 2 or min(Values) < 0:
+            sys.stderr.write("ERROR: Wrong tolerance %s: COLUMN=ABS_TOL[,REL_TOL] "\
+                "expected\n" % Arg)
+            sys.exit(1)
+
+        Tols[Column] = (Values[0], Values[1] if len(Values) > 1 else DIFF_REL_TOL)
+
+    return Tols
+
+# End of readTolerances()
+
+def getTolerance(Tols, Type, Column):
+    # The most specific tolerance prevails: column in this type of file,
+    # column in any file, any column in this type of file, any column
+    for Key in [Type + '.' + Column, Column, Type + '.*', '*']:
+        if Key in Tols:
+            return Tols[Key]
+
+    return (DIFF_ABS_TOL, DIFF_REL_TOL)
+
+def stripCompressionExt(Name):
+    for Ext in COMPRESSION_FORMATS.keys():
+        if Name.endswith(Ext):
+            return Name[:-len(Ext)]
+
+    return Name
+
+def findOutputFiles(OutDir):
+
+    # Purpose: find the output files to be compared in an OUT directory
+
+    # Parameters
+    # ==========
+    # OutDir: str
+    #         Path to the OUT directory
+
+    # Returns
+    # =======
+    # Files: dict
+    #         Path to each output file and its type, keyed by its path
+    #         relative to OutDir without compression extension
+
+    Files = OrderedDict({})
+    for Type, (Dir, Prefix, ColIdx, ColFmt, Keys) in DiffFiles.items():
+        if not os.path.isdir(OutDir + '/' + Dir):
+            continue
+
+        for Name in sorted(os.listdir(OutDir + '/' + Dir)):
+            BaseName = stripCompressionExt(Name)
+            if BaseName.startswith(Prefix) and BaseName.endswith(".dat"):
+                Files[Dir + '/' + BaseName] = (OutDir + '/' + Dir + '/' + Name, Type)
+
+    return Files
+
+# End of findOutputFiles()
+
+def compareBytes(RefFile, TestFile):
+    # Check if both files have the same contents, reading them by blocks
+    if os.path.getsize(RefFile) != os.path.getsize(TestFile):
+        return False
+
+    with open(RefFile, 'rb') as fref, open(TestFile, 'rb') as ftest:
+        while True:
+            RefBlock = fref.read(DIFF_BLOCK_SIZE)
+            if RefBlock != ftest.read(DIFF_BLOCK_SIZE):
+                return False
+            if not RefBlock:
+                return True
+
+def readOutputRows(Lines, ColIdx, ColFmt):
+    # Parse lines of an output file, the text columns (%s formats) as
+    # strings and the rest as floats
+    Names = list(ColIdx.keys())
+    Types = OrderedDict([(Name, str if ColFmt[Col].endswith('s') else np.float64) \
+        for Name, Col in ColIdx.items()])
+
+    return read_csv(BytesIO(b"".join(Lines)), sep=r'\s+', header=None,
+        names=Names, dtype=Types)
+
+def compareValues(Ref, Test, AbsTol, RelTol):
+    # Get the flags of the equal values, with a margin of some units in
+    # the last place for the rounding of the parsed decimal values
+    if Ref.dtype == object:
+        return Ref == Test
+
+    Tol = AbsTol + RelTol * np.abs(Ref) + 4 * np.spacing(np.abs(Ref))
+
+    return (np.abs(Test - Ref) <= Tol) | (np.isnan(Ref) & np.isnan(Test))
+
+def formatValue(Value):
+    # Numerical values (parsed or not) are displayed as integers if so
+    try:
+        Number = float(Value)
+    except ValueError:
+        return str(Value)
+
+    return "%d" % Number if Number.is_integer() else str(Number)
+
+def initColumnStats(ColIdx):
+    return OrderedDict([(Name, {
+        "NDiff": 0,                             # Number of differing rows
+        "MaxAbs": 0.0,                          # Maximum absolute difference
+        "MaxRel": 0.0,                          # Maximum relative difference
+        "SumSq": 0.0,                           # Sum of squared differences
+        "NVal": 0,                              # Number of compared values
+    }) for Name in ColIdx.keys()])
+
+def compareRows(Type, RefRows, TestRows, Tols, Stats):
+
+    # Purpose: compare the common rows of two output files
+
+    # Parameters
+    # ==========
+    # Type: str
+    #         Type of the output files
+    # RefRows: DataFrame
+    #         Rows of the reference file
+    # TestRows: DataFrame
+    #         Rows of the test file
+    # Tols: dict
+    #         Tolerances per column
+    # Stats: dict
+    #         Statistics of the differences per column, updated
+
+    # Returns
+    # =======
+    # RowDiff: ndarray
+    #         Flags of the differing rows
+
+    NRows = min(len(RefRows), len(TestRows))
+    RowDiff = np.zeros(NRows, dtype=bool)
+
+    for Name, ColStats in Stats.items():
+        Ref = RefRows[Name].to_numpy()[:NRows]
+        Test = TestRows[Name].to_numpy()[:NRows]
+
+        Diff = ~compareValues(Ref, Test, *getTolerance(Tols, Type, Name))
+
+        # Statistics of the finite differences of numerical columns
+        if Ref.dtype != object:
+            AbsDiff = np.abs(Test - Ref)
+            Finite = np.isfinite(AbsDiff)
+            if Finite.any():
+                AbsDiff = AbsDiff[Finite]
+                RefAbs = np.abs(Ref[Finite])
+                ColStats["MaxAbs"] = max(ColStats["MaxAbs"], float(AbsDiff.max()))
+                ColStats["SumSq"] += float(np.dot(AbsDiff, AbsDiff))
+                ColStats["NVal"] += len(AbsDiff)
+                NonZero = RefAbs > 0
+                if NonZero.any():
+                    ColStats["MaxRel"] = max(ColStats["MaxRel"],
+                        float((AbsDiff[NonZero] / RefAbs[NonZero]).max()))
+
+        ColStats["NDiff"] += int(Diff.sum())
+        RowDiff |= Diff
+
+    return RowDiff
+
+# End of compareRows()
+
+def describeRow(RefRows, TestRows, Row, Tols, Type):
+    # Get the keys of a differing row and the differing values
+    Keys = ["%s=%s" % (Name, formatValue(RefRows[Name].iloc[Row])) \
+        for Name in DiffFiles[Type][4]]
+    Values = []
+    for Name in RefRows.columns:
+        Ref = RefRows[Name].to_numpy()[Row:Row + 1]
+        Test = TestRows[Name].to_numpy()[Row:Row + 1]
+        if not compareValues(Ref, Test, *getTolerance(Tols, Type, Name))[0]:
+            Values.append("%s: %s != %s" % (Name, formatValue(Ref[0]), formatValue(Test[0])))
+
+    return " ".join(Keys), Values
+
+def describeLine(Line, ColIdx, Keys):
+    # Get the keys of a row from its text
+    Fields = Line.decode().split()
+    return " ".join(["%s=%s" % (Name, formatValue(Fields[ColIdx[Name]])) for Name in Keys \
+        if ColIdx[Name] < len(Fields)])
+
+def getRowKey(Line, KeyCols):
+    # Get the key of a row from its text, the key columns missing in
+    # a wrong row being empty
+    Fields = Line.split()
+    return tuple(Fields[Col] if Col < len(Fields) else b"" for Col in KeyCols)
+
+def getRowOrder(Line, OrderCol):
+    # Get the value of the column sorting the rows, wrong rows first
+    Fields = Line.split()
+    try:
+        return float(Fields[OrderCol])
+    except (IndexError, ValueError):
+        return -np.inf
+
+def splitLines(Lines, OrderCol, Boundary):
+    # Split sorted lines into the ones before the boundary value of the
+    # sorting column and the ones from it on, scanning from the end
+    Split = len(Lines)
+    while Split > 0 and getRowOrder(Lines[Split - 1], OrderCol) >= Boundary:
+        Split -= 1
+
+    return Lines[:Split], Lines[Split:]
+
+def numberKeys(Keys):
+    # Number the repeated keys of a list of rows, so that repeated rows
+    # are matched in order of appearance
+    Seen = {}
+    Numbered = []
+    for Key in Keys:
+        Seen[Key] = Seen.get(Key, 0) + 1
+        Numbered.append((Key, Seen[Key]))
+
+    return Numbered
+
+def alignLines(RefLines, TestLines, KeyCols):
+
+    # Purpose: match the rows of two chunks of output files on their
+    #          key columns
+
+    # Parameters
+    # ==========
+    # RefLines: list
+    #         Lines of the reference file
+    # TestLines: list
+    #         Lines of the test file
+    # KeyCols: list
+    #         Key columns identifying the rows
+
+    # Returns
+    # =======
+    # Pairs: list
+    #         Indexes of the matched rows in both files, as (Ref, Test)
+    # OnlyRef: list
+    #         Indexes of the rows only in the reference file
+    # OnlyTest: list
+    #         Indexes of the rows only in the test file
+
+    # Chunks with the same rows are matched by index, which is the
+    # case if all the rows with different text have the same keys
+    if len(RefLines) == len(TestLines) and \
+        all(getRowKey(RefLines[i], KeyCols) == getRowKey(TestLines[i], KeyCols) \
+            for i in compress(count(), map(ne, RefLines, TestLines))):
+        return list(zip(range(len(RefLines)), range(len(TestLines)))), [], []
+
+    # Otherwise merge both chunks on the keys, except their leading and
+    # trailing identical lines
+    NLines = min(len(RefLines), len(TestLines))
+    Start = next(compress(count(), map(ne, RefLines, TestLines)), NLines)
+    End = next(compress(count(), map(ne, reversed(RefLines[Start:]), reversed(TestLines[Start:]))),
+        NLines - Start)
+    RefEnd = len(RefLines) - End
+    TestEnd = len(TestLines) - End
+
+    RefKeys = numberKeys([getRowKey(Line, KeyCols) for Line in RefLines[Start:RefEnd]])
+    TestKeys = numberKeys([getRowKey(Line, KeyCols) for Line in TestLines[Start:TestEnd]])
+    TestPos = dict(zip(TestKeys, count(Start)))
+
+    Pairs = [(i, TestPos[Key]) for i, Key in enumerate(RefKeys, Start) if Key in TestPos]
+    OnlyRef = [i for i, Key in enumerate(RefKeys, Start) if Key not in TestPos]
+    Matched = set(j for i, j in Pairs)
+    OnlyTest = [j for j in range(Start, TestEnd) if j not in Matched]
+
+    Pairs = list(zip(range(Start), range(Start))) + Pairs + \
+        list(zip(range(RefEnd, len(RefLines)), range(TestEnd, len(TestLines))))
+
+    return Pairs, OnlyRef, OnlyTest
+
+# End of alignLines()
+
+def compareOutputFiles(RefFile, TestFile, Type, Tols):
+
+    # Purpose: compare two output files of the same type
+
+    # Parameters
+    # ==========
+    # RefFile: str
+    #         Path to the reference file
+    # TestFile: str
+    #         Path to the test file
+    # Type: str
+    #         Type of the output files (see DiffFiles)
+    # Tols: dict
+    #         Tolerances per column
+
+    # Returns
+    # =======
+    # Report: dict
+    #         Comparison of the files: status (SAME, EQUAL within the
+    #         tolerances or DIFF), number of rows, of differing rows and
+    #         of rows only in one of the files, first row of each kind
+    #         and statistics of the differences per column
+
+    Report = OrderedDict({})
+    Report["Status"] = "SAME"
+    Report["RefRows"] = 0
+    Report["TestRows"] = 0
+    Report["DiffRows"] = 0
+    Report["MissingRows"] = 0
+    Report["AddedRows"] = 0
+    Report["FirstDiff"] = None
+    Report["FirstMissing"] = None
+    Report["FirstAdded"] = None
+    Report["Stats"] = OrderedDict({})
+
+    # Identical files (same compression and contents) are not parsed
+    if os.path.splitext(RefFile)[1] == os.path.splitext(TestFile)[1] and \
+        compareBytes(RefFile, TestFile):
+        return Report
+
+    Dir, Prefix, ColIdx, ColFmt, Keys = DiffFiles[Type]
+    Stats = initColumnStats(ColIdx)
+    KeyCols = [ColIdx[Name] for Name in Keys]
+    NCols = len(ColIdx)
+
+    # Files sorted by a numerical column are read by chunks
+    OrderCol = KeyCols[0]
+    ChunkRows = None if ColFmt[OrderCol].endswith('s') else DIFF_CHUNK_ROWS
+
+    fref = openDataFile(RefFile, 'rb')
+    ftest = openDataFile(TestFile, 'rb')
+
+    # Skip header lines
+    fref.readline()
+    ftest.readline()
+
+    # Compare both files by chunks of lines, matching their rows on the
+    # keys. The rows from the last value of the sorting column read in
+    # any of the files on are kept for the next chunk, so that the rows
+    # of an epoch are always matched together. Only the matched lines
+    # with different text are parsed and compared column by column
+    RefLines = []
+    TestLines = []
+    RefEnd = TestEnd = False
+    while not (RefEnd and TestEnd):
+        if not RefEnd:
+            Lines = list(islice(fref, ChunkRows))
+            RefEnd = ChunkRows is None or len(Lines) < ChunkRows
+            RefLines += Lines
+        if not TestEnd:
+            Lines = list(islice(ftest, ChunkRows))
+            TestEnd = ChunkRows is None or len(Lines) < ChunkRows
+            TestLines += Lines
+
+        Boundary = min(np.inf if RefEnd else getRowOrder(RefLines[-1], OrderCol),
+            np.inf if TestEnd else getRowOrder(TestLines[-1], OrderCol))
+        RefLines, RefNext = splitLines(RefLines, OrderCol, Boundary)
+        TestLines, TestNext = splitLines(TestLines, OrderCol, Boundary)
+
+        Pairs, OnlyRef, OnlyTest = alignLines(RefLines, TestLines, KeyCols)
+
+        # Rows only in one of the files
+        Report["MissingRows"] += len(OnlyRef)
+        Report["AddedRows"] += len(OnlyTest)
+        if Report["FirstMissing"] is None and len(OnlyRef) > 0:
+            Report["FirstMissing"] = (Report["RefRows"] + OnlyRef[0] + 1,
+                describeLine(RefLines[OnlyRef[0]], ColIdx, Keys))
+        if Report["FirstAdded"] is None and len(OnlyTest) > 0:
+            Report["FirstAdded"] = (Report["TestRows"] + OnlyTest[0] + 1,
+                describeLine(TestLines[OnlyTest[0]], ColIdx, Keys))
+
+        # Matched rows with different text
+        DiffPairs = [(i, j) for i, j in Pairs if RefLines[i] != TestLines[j]]
+
+        # Identical rows have no differences
+        for ColStats in Stats.values():
+            ColStats["NVal"] += len(Pairs) - len(DiffPairs)
+
+        # Rows without the columns of the file cannot be parsed
+        BadPairs = [(i, j) for i, j in DiffPairs \
+            if len(RefLines[i].split()) != NCols or len(TestLines[j].split()) != NCols]
+        Report["DiffRows"] += len(BadPairs)
+        if len(BadPairs) > 0:
+            BadSet = set(BadPairs)
+            DiffPairs = [Pair for Pair in DiffPairs if Pair not in BadSet]
+
+        # First differing row of the chunk, as (Row, Keys, Values)
+        FirstDiff = None
+        if len(BadPairs) > 0:
+            FirstDiff = (BadPairs[0][0], describeLine(RefLines[BadPairs[0][0]], ColIdx, Keys),
+                ["wrong number of columns"])
+
+        if len(DiffPairs) > 0:
+            RefRows = readOutputRows([RefLines[i] for i, j in DiffPairs], ColIdx, ColFmt)
+            TestRows = readOutputRows([TestLines[j] for i, j in DiffPairs], ColIdx, ColFmt)
+            RowDiff = compareRows(Type, RefRows, TestRows, Tols, Stats)
+            Report["DiffRows"] += int(RowDiff.sum())
+
+            DiffRow = int(np.argmax(RowDiff))
+            if RowDiff.any() and (FirstDiff is None or DiffPairs[DiffRow][0] < FirstDiff[0]):
+                RowKeys, Values = describeRow(RefRows, TestRows, DiffRow, Tols, Type)
+                FirstDiff = (DiffPairs[DiffRow][0], RowKeys, Values)
+
+        # Keep the first differing row of the files
+        if Report["FirstDiff"] is None and FirstDiff is not None:
+            Report["FirstDiff"] = (Report["RefRows"] + FirstDiff[0] + 1,) + FirstDiff[1:]
+
+        Report["RefRows"] += len(RefLines)
+        Report["TestRows"] += len(TestLines)
+        RefLines = RefNext
+        TestLines = TestNext
+
+    # End of while not (RefEnd and TestEnd):
+
+    fref.close()
+    ftest.close()
+
+    if Report["DiffRows"] + Report["MissingRows"] + Report["AddedRows"] > 0:
+        Report["Status"] = "DIFF"
+    else:
+        Report["Status"] = "EQUAL"
+
+    # Statistics of the columns with differences
+    for Name, ColStats in Stats.items():
+        if ColStats["NDiff"] > 0 or ColStats["MaxAbs"] > 0:
+            Report["Stats"][Name] = OrderedDict({
+                "NDiff": ColStats["NDiff"],
+                "MaxAbs": ColStats["MaxAbs"],
+                "MaxRel": ColStats["MaxRel"],
+                "Rms": np.sqrt(ColStats["SumSq"] / ColStats["NVal"]) \
+                    if ColStats["NVal"] > 0 else 0.0,
+            })
+
+    return Report
+
+# End of compareOutputFiles()
+
+def printReport(Name, Report):
+    if Report["Status"] == "SAME":
+        print("SAME  %s" % Name)
+        return
+
+    print("%-5s %s: %d/%d rows, %d differing, %d missing and %d added rows" % \
+        (Report["Status"], Name, Report["RefRows"], Report["TestRows"],
+        Report["DiffRows"], Report["MissingRows"], Report["AddedRows"]))
+
+    if Report["FirstDiff"] is not None:
+        Row, Keys, Values = Report["FirstDiff"]
+        print("      First difference at row %d (%s): %s" % \
+            (Row, Keys, ", ".join(Values)))
+
+    if Report["FirstMissing"] is not None:
+        print("      First missing row at row %d of REF file (%s)" % Report["FirstMissing"])
+
+    if Report["FirstAdded"] is not None:
+        print("      First added row at row %d of TEST file (%s)" % Report["FirstAdded"])
+
+    if len(Report["Stats"]) > 0:
+        print("      %-12s %10s %12s %12s %12s" % \
+            ("COLUMN", "NDIFF", "MAXABS", "MAXREL", "RMS"))
+        for Column, ColStats in Report["Stats"].items():
+            print("      %-12s %10d %12.6g %12.6g %12.6g" % \
+                (Column, ColStats["NDiff"], ColStats["MaxAbs"],
+                ColStats["MaxRel"], ColStats["Rms"]))
+
+#######################################################
+# MAIN BODY
+#######################################################
+
+if __name__ == "__main__":
+    # Check InputOutput Arguments
+    if len(sys.argv) < 3:
+        displayUsage()
+        sys.exit()
+
+    # Extract the arguments
+    RefDir = sys.argv[1]
+    TestDir = sys.argv[2]
+    Tols = readTolerances(sys.argv[3:])
+
+    for Dir in [RefDir, TestDir]:
+        if not os.path.isdir(Dir):
+            sys.stderr.write("ERROR: Directory %s does not exist\n" % Dir)
+            sys.exit(1)
+
+    # Find the output files of both trees
+    RefFiles = findOutputFiles(RefDir)
+    TestFiles = findOutputFiles(TestDir)
+
+    # Compare the files in both trees, each pair in a process
+    NDiff = 0
+    with ProcessPoolExecutor(max_workers = DIFF_NJOBS if DIFF_NJOBS > 0 else os.cpu_count()) as Pool:
+        Jobs = OrderedDict({})
+        for Name, (RefFile, Type) in RefFiles.items():
+            if Name in TestFiles:
+                Jobs[Name] = Pool.submit(compareOutputFiles, \
+                    RefFile, TestFiles[Name][0], Type, Tols)
+
+        for Name in sorted(set(RefFiles) | set(TestFiles)):
+            if Name not in Jobs:
+                print("MISS  %s: only in %s" % \
+                    (Name, RefDir if Name in RefFiles else TestDir))
+                NDiff += 1
+                continue
+
+            Report = Jobs[Name].result()
+            printReport(Name, Report)
+            if Report["Status"] == "DIFF":
+                NDiff += 1
+
+    # Summary
+    print("\nINFO: %d files compared, %d differing or missing" % \
+        (len(set(RefFiles) | set(TestFiles)), NDiff))
+
+    if NDiff > 0:
+        sys.exit(1)
+
+#######################################################
+# End of OutDiff.py
+#######################################################
@@ -21,7 +21,6 @@
 #----------------------------------------------------------------------
 import sys, os
 
-from scipy import stats
 # Add path to find all modules
 Common = os.path.dirname(os.path.dirname(
     os.path.abspath(sys.argv[0]))) + '/COMMON'
@@ -29,19 +28,60 @@ sys.path.insert(0, Common)
 from InputOutput import RcvrIdx
 from COMMON import Stats, GnssConstants
 from math import sqrt
-from collections import OrderedDict
 from InputOutput import generateHistFile
 
 # Performances internal functions
 #-----------------------------------------------------------------------
 
-def updateBuff(ContBuff, Status, Epochs):
+def initBuff(Size):
+
+    # Function initializing the continuity buffer: a circular buffer
+    # of Size epochs with the running sum of its elements
+
+    return {
+        "Buff": [0] * Size,     # Availability status of the last epochs
+        "Idx": 0,               # Position of the oldest epoch
+        "Sum": 0,               # Sum of the buffer
+    }
 
-    # Function updating the continuity buffer per epoch
+# End of initBuff
+
+def updateBuff(ContBuff, Status, Epochs):
 
-    for Epoch in range(int(Epochs)):
-        ContBuff.pop(0)
-        ContBuff.append(Status)
+    # Function updating the continuity buffer with the same status
+    # during a number of epochs, in constant time per call
+
+    Buff = ContBuff["Buff"]
+    Size = len(Buff)
+    Epochs = int(Epochs)
+
+    # If the whole buffer is overwritten
+    if Epochs >= Size:
+        ContBuff["Buff"] = [Status] * Size
+        ContBuff["Idx"] = 0
+        ContBuff["Sum"] = Status * Size
+
+    # If only one epoch is added
+    elif Epochs == 1:
+        Idx = ContBuff["Idx"]
+        ContBuff["Sum"] = ContBuff["Sum"] - Buff[Idx] + Status
+        Buff[Idx] = Status
+        ContBuff["Idx"] = (Idx + 1) % Size
+
+    # Otherwise, overwrite the oldest epochs
+    else:
+        Idx = ContBuff["Idx"]
+        End = Idx + Epochs
+        if End <= Size:
+            ContBuff["Sum"] = ContBuff["Sum"] - sum(Buff[Idx:End]) + Status * Epochs
+            Buff[Idx:End] = [Status] * Epochs
+        else:
+            End = End - Size
+            ContBuff["Sum"] = ContBuff["Sum"] - sum(Buff[Idx:]) - sum(Buff[:End]) + \
+                Status * Epochs
+            Buff[Idx:] = [Status] * (Size - Idx)
+            Buff[:End] = [Status] * End
+        ContBuff["Idx"] = End % Size
 
 # End of updateBuff
 
@@ -76,13 +116,13 @@ def initPerfInfo(Conf, Services, Rcvr, RcvrInfo, Doy, PerfInfo, VpeHistInfo):
     # =======
     # Nothing
 
-    # Initialize internal variables
-    Idx = {"FLAG": 0, "HAL": 1, "VAL": 2, "HPE95": 3, "VPE95": 4, "VPE1E7": 5, "AVAI": 6, "CONT": 7, "CINT": 8}
+    # Get the converted configuration parameters
+    Params = Conf["PARAMS"]
 
     # Loop over all the activated service levels
     for Service in Services:
         # If service activated
-        if int(Conf[Service][Idx["FLAG"]]) == 1:
+        if Params.Services[Service].Active:
             # Initialize PerInfo dictionary
             PerfInfo[Service] = {
                 "Rcvr": Rcvr,                                       # Receiver acronym
@@ -90,11 +130,11 @@ def initPerfInfo(Conf, Services, Rcvr, RcvrInfo, Doy, PerfInfo, VpeHistInfo):
                 "Lat": float(RcvrInfo[RcvrIdx["LAT"]]),             # Receiver reference latitude
                 "Doy": Doy,                                         # Day of year
                 "Service": Service,                                 # Service level
-                "SamSol": 86400 // int(Conf["SAMPLING_RATE"]),      # Number of total samples processed
-                "SamNoSol": 86400 // int(Conf["SAMPLING_RATE"]),    # Number of samples with no SBAS solution
+                "SamSol": Params.SamplesPerDay,                     # Number of total samples processed
+                "SamNoSol": Params.SamplesPerDay,                   # Number of samples with no SBAS solution
                 "Avail": 0,                                         # Availability percentage
                 "ContRisk": 0.0,                                    # Continuity risk
-                "ContBuff": [0] * int(Conf[Service][Idx["CINT"]]),  # Continuity risk buffer
+                "ContBuff": initBuff(Params.Services[Service].Cint), # Continuity risk buffer
                 "PrevStatus": 0,                                    # Previous availability status
                 "PrevSod": 0.0,                                     # Previous computed epoch
                 "ContEvent": 0,                                     # Number of discontinuity events                                 
@@ -104,9 +144,11 @@ def initPerfInfo(Conf, Services, Rcvr, RcvrInfo, Doy, PerfInfo, VpeHistInfo):
                 "HpeRms": 0.0,                                      # HPE RMS
                 "VpeRms": 0.0,                                      # VPE RMS
                 "Hpe95": 0.0,                                       # HPE 95% percentile
-                "HpeHist": {},                                      # HPE Histogram
+                "HpeHist": Stats.initHist(GnssConstants.PERF_HIST_RES,
+                    GnssConstants.PERF_HIST_RANGE),                 # HPE Histogram
                 "Vpe95": 0.0,                                       # VPE 95% percentile
-                "VpeHist": {},                                      # VPE Histogram                       
+                "VpeHist": Stats.initHist(GnssConstants.PERF_HIST_RES,
+                    GnssConstants.PERF_HIST_RANGE),                 # VPE Histogram
                 "HpeMax": 0.0,                                      # Maximum HPE
                 "VpeMax": 0.0,                                      # Maximum VPE
                 "ExtVpe": 0.0,                                      # Extrapolated VPE
@@ -169,9 +211,9 @@ def updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer):
     # Nothing
 
     # Initialize internal variables
-    HistRes = 0.001
     AvailStatus = 0
-    Idx = {"FLAG": 0, "HAL": 1, "VAL": 2, "HPE95": 3, "VPE95": 4, "VPE1E7": 5, "AVAI": 6, "CONT": 7, "CINT": 8}
+    Params = Conf["PARAMS"]
+    ParamsSer = Params.Services[Service]
     
     # If SBAS solution has been achieved
     if PosInfo["Sol"] != 0:
@@ -216,11 +258,11 @@ def updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer):
 
         # Update availability
         # ----------------------------------------------------------------------
-        if (PosInfo["Hpl"]/Conf[Service][Idx["HAL"]]) > 1 or (PosInfo["Vpl"]/Conf[Service][Idx["VAL"]]) > 1:
+        if (PosInfo["Hpl"]/ParamsSer.Hal) > 1 or (PosInfo["Vpl"]/ParamsSer.Val) > 1:
             # Tag sample as non-available for selected service level
             PerfInfoSer["NotAvail"] = PerfInfoSer["NotAvail"] + 1
 
-        elif (PosInfo["Hpl"]/Conf[Service][Idx["HAL"]]) < 1 and (PosInfo["Vpl"]/Conf[Service][Idx["VAL"]]) < 1:
+        elif (PosInfo["Hpl"]/ParamsSer.Hal) < 1 and (PosInfo["Vpl"]/ParamsSer.Val) < 1:
             # Tag sample as available for selected service level
             AvailStatus = 1
             PerfInfoSer["Avail"] = PerfInfoSer["Avail"] + 1
@@ -235,9 +277,9 @@ def updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer):
             # Update HPE and VPE histograms 
             # ---------------------------------------------------------------------- 
             # Update HPE95 histogram
-            Stats.updateHist(PerfInfoSer["HpeHist"], abs(PosInfo["Hpe"]), HistRes)
+            Stats.updateHist(PerfInfoSer["HpeHist"], abs(PosInfo["Hpe"]))
             # Update VPE95 histogram
-            Stats.updateHist(PerfInfoSer["VpeHist"], abs(PosInfo["Vpe"]), HistRes)
+            Stats.updateHist(PerfInfoSer["VpeHist"], abs(PosInfo["Vpe"]))
 
             # Update maximum HPE and VPE values
             # ----------------------------------------------------------------------
@@ -249,10 +291,10 @@ def updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer):
             # Update misleading information events
             # ----------------------------------------------------------------------
             if PosInfo["Hsi"] >= 1 or abs(PosInfo["Vsi"]) >= 1:
-                if PosInfo["Hpe"] < Conf[Service][Idx["HAL"]] and abs(PosInfo["Vpe"]) < Conf[Service][Idx["VAL"]]:
+                if PosInfo["Hpe"] < ParamsSer.Hal and abs(PosInfo["Vpe"]) < ParamsSer.Val:
                     # Tag sample as misleading information (MI)
                     PerfInfoSer["Nmi"] = PerfInfoSer["Nmi"] + 1
-                elif PosInfo["Hpe"] >= Conf[Service][Idx["HAL"]] or abs(PosInfo["Vpe"]) >= Conf[Service][Idx["VAL"]]:
+                elif PosInfo["Hpe"] >= ParamsSer.Hal or abs(PosInfo["Vpe"]) >= ParamsSer.Val:
                     # Tag sample as hazardous misleading information (HMI)
                     PerfInfoSer["Nhmi"] = PerfInfoSer["Nhmi"] + 1
 
@@ -268,17 +310,17 @@ def updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer):
     # ---------------------------------------------------------------------- 
     # Update number of discontinuity events if jump from available to non-available status detected
     if AvailStatus == 0 and PerfInfoSer["PrevStatus"] == 1:
-        PerfInfoSer["ContEvent"] = PerfInfoSer["ContEvent"] + sum(PerfInfoSer["ContBuff"])
+        PerfInfoSer["ContEvent"] = PerfInfoSer["ContEvent"] + PerfInfoSer["ContBuff"]["Sum"]
     # Update number of discontinuity events if data gap in performances information detected
     gap = PosInfo["Sod"] - PerfInfoSer["PrevSod"]
-    if PerfInfoSer["PrevSod"] != 0.0 and gap > int(Conf["SAMPLING_RATE"]):
-        PerfInfoSer["ContEvent"] = PerfInfoSer["ContEvent"] + sum(PerfInfoSer["ContBuff"])
+    if PerfInfoSer["PrevSod"] != 0.0 and gap > Params.SamplingRateInt:
+        PerfInfoSer["ContEvent"] = PerfInfoSer["ContEvent"] + PerfInfoSer["ContBuff"]["Sum"]
         # Include gap in the continuity buffer if the Hatch Filter has not been reset
-        if gap < int(Conf["HATCH_GAP_TH"]):
+        if gap < Params.HatchGapThInt:
             updateBuff(PerfInfoSer["ContBuff"], 0, gap)
         # Reset the continuity buffer if the Hatch Filter has been reset
-        elif gap >= int(Conf["HATCH_GAP_TH"]):
-            PerfInfoSer["ContBuff"] = [0] * int(Conf[Service][Idx["CINT"]])
+        elif gap >= Params.HatchGapThInt:
+            PerfInfoSer["ContBuff"] = initBuff(ParamsSer.Cint)
     
     # Update continuity buffer with current availability status
     updateBuff(PerfInfoSer["ContBuff"], AvailStatus, 1)
@@ -318,16 +360,16 @@ def computePerf(PerfInfoSer):
         # Compute final HPE95 and VPE95 values
         # ----------------------------------------------------------------------
         # Compute final HPE95
-        Cdf, Sigmas = Stats.computeCdfFromHistogram(PerfInfoSer["HpeHist"], PerfInfoSer["Avail"])
-        PerfInfoSer["Hpe95"] = Stats.computePercentile(Cdf, 95)
+        Bins, Cdf, Sigmas = Stats.computeCdfFromHistogram(PerfInfoSer["HpeHist"], PerfInfoSer["Avail"])
+        PerfInfoSer["Hpe95"] = Stats.computePercentile(Bins, Cdf, 95)
         # Compute final VPE95
-        Cdf, Sigmas = Stats.computeCdfFromHistogram(PerfInfoSer["VpeHist"], PerfInfoSer["Avail"])
-        PerfInfoSer["Vpe95"] = Stats.computePercentile(Cdf, 95)
+        Bins, Cdf, Sigmas = Stats.computeCdfFromHistogram(PerfInfoSer["VpeHist"], PerfInfoSer["Avail"])
+        PerfInfoSer["Vpe95"] = Stats.computePercentile(Bins, Cdf, 95)
     
         # Compute final extrapolated VPE value
         # ----------------------------------------------------------------------
-        ThresholdBin = Stats.computePercentile(Cdf, 60)
-        PerfInfoSer["ExtVpe"] = 5.33 * Stats.computeOverbound(Sigmas, ThresholdBin)
+        ThresholdBin = Stats.computePercentile(Bins, Cdf, 60)
+        PerfInfoSer["ExtVpe"] = 5.33 * Stats.computeOverbound(Bins, Sigmas, ThresholdBin)
     
         # Compute continuity risk
         # ----------------------------------------------------------------------
@@ -372,15 +414,13 @@ def computeVpeHist(fhist, PerfLPV200, VpeHistInfo):
 
     # Initialize internal variables
     BinId = 0
-    HistRes = 0.001
+    HistRes = PerfLPV200["VpeHist"]["Res"]
 
-    # Sort LPV200 VPE histogram
-    SortedHist = OrderedDict({})
-    for key in sorted(PerfLPV200["VpeHist"].keys()):
-        SortedHist[key] = PerfLPV200["VpeHist"][key]
+    # Get sorted LPV200 VPE histogram
+    Bins, BinsSamples = Stats.getHistBins(PerfLPV200["VpeHist"])
 
     # Loop over the bins in VpeHist
-    for Bin, Samples in SortedHist.items():
+    for Bin, Samples in zip(Bins.tolist(), BinsSamples.tolist()):
         # Compute VPE histogram statistics
         VpeHistInfo["BinId"] = BinId
         VpeHistInfo["BinNumSam"] = Samples
@@ -390,4 +430,75 @@ def computeVpeHist(fhist, PerfLPV200, VpeHistInfo):
         # Update Bin ID
         BinId = BinId + 1
         # Generate output file
-        generateHistFile(fhist, VpeHistInfo)
\ No newline at end of file
+        generateHistFile(fhist, VpeHistInfo)
+
+def mergePerfInfo(PerfInfoA, PerfInfoB):
+
+    # Purpose: Merge the performances information accumulated for a
+    #          service level over two sets of epochs (e.g. two days or
+    #          two receivers), before computePerf is called.
+    #          The merge is associative, so any number of receiver-days
+    #          can be combined in any grouping
+
+    # Parameters
+    # ==========
+    # PerfInfoA: dict
+    #            Dictionary containing performances information per service level
+    # PerfInfoB: dict
+    #            Dictionary containing performances information for the same
+    #            service level
+
+    # Returns
+    # =======
+    # PerfInfoSer: dict
+    #              Dictionary containing the merged performances information
+
+    # Check that the performances information can be merged
+    if PerfInfoA["Service"] != PerfInfoB["Service"]:
+        sys.stderr.write("ERROR: Cannot merge performances of %s and %s service levels\n" %
+            (PerfInfoA["Service"], PerfInfoB["Service"]))
+        sys.exit(1)
+
+    for Hist in ["HpeHist", "VpeHist"]:
+        if PerfInfoA[Hist]["Res"] != PerfInfoB[Hist]["Res"] or \
+            len(PerfInfoA[Hist]["Counts"]) != len(PerfInfoB[Hist]["Counts"]):
+            sys.stderr.write("ERROR: Cannot merge %s histograms with different bins\n" % Hist)
+            sys.exit(1)
+
+    # Start from a copy of the first one
+    PerfInfoSer = dict(PerfInfoA)
+
+    # Keep receiver and day only if they are common
+    if PerfInfoA["Rcvr"] != PerfInfoB["Rcvr"]:
+        PerfInfoSer["Rcvr"] = "ALL"
+        PerfInfoSer["Lon"] = 0.0
+        PerfInfoSer["Lat"] = 0.0
+    if PerfInfoA["Doy"] != PerfInfoB["Doy"]:
+        PerfInfoSer["Doy"] = 0
+
+    # Add the number of samples and the sums
+    for Field in ["SamSol", "SamNoSol", "Avail", "NotAvail", "ContEvent",
+    "Nmi", "Nhmi", "HpeRms", "VpeRms"]:
+        PerfInfoSer[Field] = PerfInfoA[Field] + PerfInfoB[Field]
+
+    # Get the minimum values
+    for Field in ["NsvMin", "HplMin", "VplMin"]:
+        PerfInfoSer[Field] = Stats.updateMin(PerfInfoA[Field], PerfInfoB[Field])
+
+    # Get the maximum values
+    for Field in ["NsvMax", "HpeMax", "VpeMax", "HplMax", "VplMax", "HsiMax",
+    "VsiMax", "PdopMax", "HdopMax", "VdopMax"]:
+        PerfInfoSer[Field] = Stats.updateMax(PerfInfoA[Field], PerfInfoB[Field])
+
+    # Add the histograms
+    PerfInfoSer["HpeHist"] = Stats.mergeHist(PerfInfoA["HpeHist"], PerfInfoB["HpeHist"])
+    PerfInfoSer["VpeHist"] = Stats.mergeHist(PerfInfoA["VpeHist"], PerfInfoB["VpeHist"])
+
+    # Keep the continuity state of the last one
+    PerfInfoSer["ContBuff"] = PerfInfoB["ContBuff"]
+    PerfInfoSer["PrevStatus"] = PerfInfoB["PrevStatus"]
+    PerfInfoSer["PrevSod"] = PerfInfoB["PrevSod"]
+
+    return PerfInfoSer
+
+# End of mergePerfInfo:
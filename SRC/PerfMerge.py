@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+########################################################################
+# PerfMerge.py:
+# This is the Performances Merging Module of PETRUS tool
+#
+#  Project:        PETRUS
+#  File:           PerfMerge.py
+#  Date(YY/MM/DD): 01/02/21
+#
+#   Author: GNSS Academy
+#   Copyright 2021 GNSS Academy
+#
+# -----------------------------------------------------------------
+# Date       | Author             | Action
+# -----------------------------------------------------------------
+#
+# Usage:
+#   PerfMerge.py $PERF_FILE $PERF_STATE_FILE [$PERF_STATE_FILE ...]
+#
+# Merges the Performances state files written by Petrus.py with
+# PERF_STATE_OUT activated (one per receiver-day) and writes the
+# Performances of the whole set (e.g. several days and/or receivers)
+# in the PERF file format
+########################################################################
+
+
+# Import External and Internal functions and Libraries
+#----------------------------------------------------------------------
+import sys
+from collections import OrderedDict
+from InputOutput import createOutputFile
+from InputOutput import readPerfStateFile
+from InputOutput import generatePerfFile
+from InputOutput import PerfHdr
+from Perf import mergePerfInfo, computePerf
+
+#----------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+#----------------------------------------------------------------------
+
+def displayUsage():
+    sys.stderr.write("ERROR: Please provide path to output PERF file and "\
+        "paths to PERF STATE files as arguments\n")
+
+#######################################################
+# MAIN BODY
+#######################################################
+
+if __name__ == "__main__":
+    # Check InputOutput Arguments
+    if len(sys.argv) < 3:
+        displayUsage()
+        sys.exit()
+
+    # Extract the arguments
+    PerfFile = sys.argv[1]
+    StateFiles = sys.argv[2:]
+
+    # Initialize Variables
+    PerfInfo = OrderedDict({})
+
+    # Loop over the Performances state files
+    for StateFile in StateFiles:
+        # Display Message
+        print("INFO: Reading file: %s..." % StateFile)
+
+        # Merge the Performances information of each service level
+        for Service, PerfInfoSer in readPerfStateFile(StateFile).items():
+            if Service in PerfInfo:
+                PerfInfo[Service] = mergePerfInfo(PerfInfo[Service], PerfInfoSer)
+            else:
+                PerfInfo[Service] = PerfInfoSer
+
+    # Create output file
+    fperf = createOutputFile(PerfFile, PerfHdr)
+
+    # Compute and write the merged performances
+    for Service, PerfInfoSer in PerfInfo.items():
+        computePerf(PerfInfoSer)
+        generatePerfFile(fperf, PerfInfoSer)
+
+    # Close PERF output file
+    fperf.close()
@@ -19,7 +19,7 @@
 
 import sys, os
 from pandas import read_csv
-from pandas import DataFrame
+from pandas import concat
 sys.path.append(os.getcwd() + '/' + \
     os.path.dirname(sys.argv[0]) + '/' + 'COMMON')
 from COMMON import GnssConstants
@@ -805,30 +805,53 @@ def generateHistPlot(LPV200ExtVpe, HistFile):
 
 # End of generateHistPlot:
 
-def generatePerfPlots(Service, PerfFilesList):
+def readPerfFiles(PerfFilesList):
+
+    # Purpose: read all the receivers performances files at once
+
+    # Parameters
+    # ==========
+    # PerfFilesList: list
+    #                List containing the paths to all receivers performances files
+
+    # Returns
+    # =======
+    # PerfData: DataFrame
+    #           All columns and service levels of all the files, the
+    #           columns being labelled as in PerfIdx
+
+    # Read the files and concatenate them in a single step
+    PerfData = concat([read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None) \
+        for PerfFile in PerfFilesList], ignore_index = True)
+
+    return PerfData
+
+# End of readPerfFiles:
+
+def generatePerfPlots(Service, PerfFilesList, PerfData = None):
     
     # Purpose: generate plots regarding performances results
 
     # Parameters
     # ==========
+    # Service: str
+    #          Service level to be plotted
     # PerfFilesList: list
     #                List containing the paths to all receivers performances files
+    # PerfData: DataFrame
+    #           All receivers performances, as given by readPerfFiles
+    #           (read from PerfFilesList if not provided)
 
     # Returns
     # =======
     # Nothing
 
+    # Read all receivers performances, if needed
+    if PerfData is None:
+        PerfData = readPerfFiles(PerfFilesList)
+
     # AVAILABILITY MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["AVAIL"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["AVAIL"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Availability Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -836,15 +859,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # CONTINUITY RISK MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["CONTRISK"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["CONTRISK"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Continuity Risk Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -852,15 +866,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # HPE 95% MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HPE95"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HPE95"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot HPE 95% Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -868,15 +873,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # VPE 95% MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VPE95"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VPE95"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot VPE 95% Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -884,15 +880,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # EXTRAPOLATED VPE MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["EXTVPE"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["EXTVPE"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Extrapolated VPE Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -900,15 +887,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM HSI MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HSIMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HSIMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum HSI Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -916,15 +894,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM VSI MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VSIMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VSIMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum VSI Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -932,15 +901,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MINIMUM HPL MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HPLMIN"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HPLMIN"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Minimum HPL Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -948,15 +908,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MINIMUM VPL MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VPLMIN"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VPLMIN"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Minimum VPL Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -964,15 +915,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM HPL MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HPLMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HPLMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum HPL Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -980,15 +922,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM VPL MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VPLMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VPLMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum VPL Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -996,15 +929,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MINIMUM NUMBER OF SATELLITES
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["NSVMIN"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["NSVMIN"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Minimum Number of Satellites Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -1012,15 +936,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM NUMBER OF SATELLITES
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["NSVMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["NSVMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum Number of Satellites Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -1028,15 +943,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM HDOP MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HDOPMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["HDOPMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum HDOP Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
@@ -1044,15 +950,6 @@ def generatePerfPlots(Service, PerfFilesList):
 
     # MAXIMUM VDOP MAP
     # ----------------------------------------------------------
-    # Initialize PerfData Dataframe
-    PerfData = DataFrame(columns = [PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VDOPMAX"]])
-    # Read the cols we need from all PerfFile files
-    for PerfFile in PerfFilesList:
-        NewData = read_csv(PerfFile, delim_whitespace=True, skiprows=1, header=None,\
-        usecols=[PerfIdx["RCVR"],PerfIdx["LON"],PerfIdx["LAT"],PerfIdx["SERVICE"],PerfIdx["VDOPMAX"]])
-        # Append information to PerfData
-        PerfData = PerfData.append(NewData, ignore_index = True)
-
     print( 'Plot Maximum VDOP Map in ' + Service + '...')
     
     # Configure plot and call plot generation function
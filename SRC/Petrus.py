@@ -16,372 +16,832 @@
 # -----------------------------------------------------------------
 #
 # Usage:
-#   Petrus.py $SCEN_PATH
+#   Petrus.py $SCEN_PATH [--resume]
+#
+# With --resume, the receiver-days completed by a previous run with
+# CHECKPOINT_RATE activated are skipped and the interrupted ones are
+# continued from their last checkpoint
 ########################################################################
 
 
 # Import External and Internal functions and Libraries
 #----------------------------------------------------------------------
 import sys, os
+from io import StringIO
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor
 from collections import OrderedDict
-from yaml import dump
 from COMMON import GnssConstants as Const
 from InputOutput import readConf
 from InputOutput import processConf
 from InputOutput import readRcvr
 from InputOutput import createOutputFile
-from InputOutput import openInputFile
-from InputOutput import readObsEpoch
+from InputOutput import findInputFile, openDataFile, OUTPUT_COMPRESSION_EXT
+from InputOutput import openInputFile, openInputCache, closeInputFile
+from InputOutput import readObsEpochs
 from InputOutput import readCorrectInputs
 from InputOutput import generatePreproFile
 from InputOutput import generateCorrFile
 from InputOutput import generatePosFile
-from InputOutput import generatePerfFile
+from InputOutput import openOutputWriter, writeOutput, closeOutputWriter
+from InputOutput import generatePerfFile, generatePerfStateFile
+from InputOutput import generateTimingFile
+from InputOutput import resumeOutputFile, syncOutputFile
+from InputOutput import generateCheckpointFile, readCheckpointFile
 from InputOutput import PreproHdr, CorrHdr, PosHdr, PerfHdr, HistHdr
-from InputOutput import CSNEPOCHS
-from InputOutput import ObsIdx
-from Preprocessing import runPreProcMeas
-from Corrections import runCorrectMeas
+from InputOutput import ObsIdx, SatIdx, LosIdx, ServiceLevels
+from Preprocessing import initPrevPreproObsInfo, runPreProcMeas
+from Corrections import runCorrectMeas, runCorrectMeasBlock
 from Perf import initPerfInfo, updatePerfEpoch, computePerf, computeVpeHist
-from Spvt import computeSpvtSolution
-from PosPlots import generatePosPlots
-from PerfPlots import generatePerfPlots, generateHistPlot
+from Spvt import computeSpvtSolution, computeSpvtSolutionBlock
 from COMMON.Dates import convertJulianDay2YearMonthDay
 from COMMON.Dates import convertYearMonthDay2Doy
+from COMMON.Timing import initTiming, timeStage, timeEpochs
+from COMMON.Timing import computeTiming, printTiming
+# NOTE: plotting modules (matplotlib, basemap, pandas, scipy) are only
+# imported where figures or statistics requiring them are produced (here,
+# in the plots modules and in COMMON), to keep processing-only runs fast
 
 #----------------------------------------------------------------------
 # INTERNAL FUNCTIONS
 #----------------------------------------------------------------------
 
 def displayUsage():
-    sys.stderr.write("ERROR: Please provide path to SCENARIO as a unique argument\n")
+    sys.stderr.write("ERROR: Please provide path to SCENARIO as argument, "\
+        "optionally followed by --resume\n")
+
+def processRcvrDay(Scen, Conf, Rcvr, RcvrInfo, Jd, Resume=0):
+
+    # Purpose: run the whole PETRUS chain (Preprocessing, Corrections,
+    #          SPVT and Performances) for one receiver and one day
+
+    # Parameters
+    # ==========
+    # Scen: str
+    #       Path to the scenario
+    # Conf: dict
+    #       Configuration dictionary
+    # Rcvr: str
+    #       Receiver acronym
+    # RcvrInfo: list
+    #           Receiver information: position, masking angle...
+    # Jd: int
+    #     Julian Day to be processed
+    # Resume: int
+    #         1: resume the receiver-day from its checkpoint, if any
+
+    # Returns
+    # =======
+    # PerfFile: str
+    #           Path to the PERF output file (None if PERF outputs are
+    #           not activated)
+    # PosFile: str
+    #          Path to the POS output file (None if SPVT outputs are
+    #          not activated)
+    # Services: list
+    #           List of the activated service levels
+    # PlotJobs: list
+    #           Figures to be rendered by the plot workers, as
+    #           (Function, Arguments) tuples (empty if PLOT_JOBS is 0)
+
+    # Initialize outputs
+    PerfFile = None
+    PosFile = None
+    PlotJobs = []
+
+    # Start the stage timing, if activated
+    Timing = initTiming() if Conf["STAGE_TIMING"] == 1 else None
+
+    # Compute Year, Month and Day in order to build input file name
+    Year, Month, Day = convertJulianDay2YearMonthDay(Jd)
+    
+    # Compute the Day of Year (DoY)
+    Doy = convertYearMonthDay2Doy(Year, Month, Day)
 
-#######################################################
-# MAIN BODY
-#######################################################
+    # Display Message
+    print( '\n*** Processing Day of Year: ' + str(Doy) + ' ... ***')
 
-# Check InputOutput Arguments
-if len(sys.argv) != 2:
-    displayUsage()
-    sys.exit()
+    # Define the full path and name to the CHECKPOINT file
+    CheckpointFile = Scen + '/OUT/CHECKPOINT/' + "CHECKPOINT_%s_Y%02dD%03d.pkl" % \
+        (Rcvr, Year % 100, Doy)
+    CheckpointRate = int(Conf["CHECKPOINT_RATE"])
 
-# Extract the arguments
-Scen = sys.argv[1]
+    # If resuming, read the checkpoint of the receiver-day
+    Checkpoint = None
+    if Resume == 1:
+        Checkpoint = readCheckpointFile(CheckpointFile, Conf)
 
-# Select the Configuratiun file name
-CfgFile = Scen + '/CFG/petrus.cfg'
+    # Otherwise, remove the checkpoint of a previous run
+    elif os.path.isfile(CheckpointFile):
+        os.remove(CheckpointFile)
 
-# Read conf file
-Conf = readConf(CfgFile)
-# print(dump(Conf))
+    # If the receiver-day was completed, skip it
+    if Checkpoint is not None and Checkpoint["Done"]:
+        print("INFO: Receiver-day completed by a previous run, skipped")
 
-# Process Configuration Parameters
-Conf = processConf(Conf)
+        if Conf["PERF_OUT"] == 1:
+            PerfFile = Scen + '/OUT/PERF/' + "PERF_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
 
-# Select the RCVR Positions file name
-RcvrFile = Scen + '/INP/RCVR/' + Conf["RCVR_FILE"]
+        if Conf["SPVT_OUT"] == 1:
+            PosFile = Scen + '/OUT/SPVT/' + "POS_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy) + \
+                OUTPUT_COMPRESSION_EXT[int(Conf["OUTPUT_COMPRESSION"])]
 
-# Read RCVR Positions file
-RcvrInfo = readRcvr(RcvrFile)
+        return PerfFile, PosFile, Checkpoint["Services"], PlotJobs
 
-# Print header
-print( '------------------------------------')
-print( '--> RUNNING PETRUS:')
-print( '------------------------------------')
+    # Define the full path and name to the OBS INFO file to read
+    ObsFile = Scen + \
+        '/INP/OBS/' + "OBS_%s_Y%02dD%03d.dat" % \
+            (Rcvr, Year % 100, Doy)
 
-# Initialize Variables
-PerfFilesList = []
+    # Get the path to the OBS file, which may be compressed
+    ObsFile = findInputFile(ObsFile)
 
-# Loop over RCVRs
-#-----------------------------------------------------------------------
-for Rcvr in RcvrInfo.keys():
     # Display Message
-    print( '\n***-----------------------------***')
-    print( '*** Processing receiver: ' + Rcvr + '   ***')
-    print( '***-----------------------------***')
-
-    # Loop over Julian Days in simulation
-    #-----------------------------------------------------------------------
-    for Jd in range(Conf["INI_DATE_JD"], Conf["END_DATE_JD"] + 1):
-        # Compute Year, Month and Day in order to build input file name
-        Year, Month, Day = convertJulianDay2YearMonthDay(Jd)
-        
-        # Compute the Day of Year (DoY)
-        Doy = convertYearMonthDay2Doy(Year, Month, Day)
+    print("INFO: Reading file: %s..." %
+    ObsFile)
+
+    # Extension and compression level of the PREPRO, CORR and POS outputs
+    OutExt = OUTPUT_COMPRESSION_EXT[int(Conf["OUTPUT_COMPRESSION"])]
+    OutLevel = int(Conf["OUTPUT_COMPRESSION_LEVEL"])
+
+    # If Preprocessing outputs are activated
+    if Conf["PREPRO_OUT"] == 1:
+        # Define the full path and name to the output PREPRO OBS file
+        PreproObsFile = Scen + \
+            '/OUT/PPVE/' + "PREPRO_OBS_%s_Y%02dD%03d.dat" % \
+                (Rcvr, Year % 100, Doy) + OutExt
+
+        # Create output file, or go on writing it from the checkpoint
+        if Checkpoint is None:
+            fpreprobs = createOutputFile(PreproObsFile, PreproHdr, OutLevel)
+        else:
+            fpreprobs = resumeOutputFile(PreproObsFile, Checkpoint["Outputs"]["PREPRO"], OutLevel)
+
+    # If Corrected outputs are activated
+    if Conf["CORR_OUT"] == 1:
+        # Define the full path and name to the output CORR file
+        CorrFile = Scen + \
+            '/OUT/CORR/' + "CORR_%s_Y%02dD%03d.dat" % \
+                (Rcvr, Year % 100, Doy) + OutExt
+
+        # Create output file, or go on writing it from the checkpoint
+        if Checkpoint is None:
+            fcorr = createOutputFile(CorrFile, CorrHdr, OutLevel)
+        else:
+            fcorr = resumeOutputFile(CorrFile, Checkpoint["Outputs"]["CORR"], OutLevel)
+
+    # If Position outputs are activated
+    if Conf["SPVT_OUT"] == 1:
+        # Define the full path and name to the output POS file
+        PosFile = Scen + '/OUT/SPVT/' + "POS_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy) + OutExt
+
+        # Create output file, or go on writing it from the checkpoint
+        if Checkpoint is None:
+            fpos = createOutputFile(PosFile, PosHdr, OutLevel)
+        else:
+            fpos = resumeOutputFile(PosFile, Checkpoint["Outputs"]["POS"], OutLevel)
+
+    # If Performances outputs are activated
+    if Conf["PERF_OUT"] == 1:
+        # Define the full path and name to the output PERF file
+        PerfFile = Scen + '/OUT/PERF/' + "PERF_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
+
+        # Create output file
+        fperf = createOutputFile(PerfFile, PerfHdr)
+
+    # If LPV200 VPE Histogram outputs are activated
+    if Conf["VPEHIST_OUT"] == 1:
+        # Define the full path and name to the output HIST file
+        HistFile = Scen + '/OUT/PERF/' + "VPE_HIST_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
+
+        # Create output file
+        fhist = createOutputFile(HistFile, HistHdr)
+
+    # Define the full path and name to the SAT file to read and open the file
+    SatFile = Scen + \
+        '/OUT/SAT/' + "SAT_%s_Y%02dD%03d.dat" % \
+            (Rcvr, Year % 100, Doy)
+    fsat = openInputFile(SatFile, SatIdx, Conf["INPUT_CACHE"])
+
+    # Define the full path and name to the LOS file to read
+    LosFile = Scen + \
+        '/OUT/LOS/' + "LOS_%s_Y%02dD%03d.dat" % \
+            (Rcvr, Year % 100, Doy)
+    flos = openInputFile(LosFile, LosIdx, Conf["INPUT_CACHE"])
+
+    # Initialize Variables
+    PrevPreproObsInfo = initPrevPreproObsInfo(Conf)
+    Services = list(ServiceLevels)
+    PerfInfo = OrderedDict({})
+    VpeHistInfo = OrderedDict({})
+    initPerfInfo(Conf, Services, Rcvr, RcvrInfo, Doy, PerfInfo, VpeHistInfo)
+    SatInfo = {}
+    LosInfo = {}
+    SodInputs = -1
+    ResumeSod = -1
+    NextCheckpointSod = CheckpointRate
+
+    # If resuming, restore the processing state of the checkpoint
+    if Checkpoint is not None:
+        PrevPreproObsInfo = Checkpoint["PrevPreproObsInfo"]
+        PerfInfo = Checkpoint["PerfInfo"]
+        VpeHistInfo = Checkpoint["VpeHistInfo"]
+        SatInfo = Checkpoint["SatInfo"]
+        LosInfo = Checkpoint["LosInfo"]
+        SodInputs = Checkpoint["SodInputs"]
+        fsat["EpochPtr"] = Checkpoint["SatPtr"]
+        flos["EpochPtr"] = Checkpoint["LosPtr"]
+        ResumeSod = Checkpoint["Sod"]
+        if CheckpointRate > 0:
+            NextCheckpointSod = (ResumeSod // CheckpointRate + 1) * CheckpointRate
 
         # Display Message
-        print( '\n*** Processing Day of Year: ' + str(Doy) + ' ... ***')
+        print("INFO: Resuming from SoD %d" % ResumeSod)
+
+    # Open OBS file, through its binary cache if activated
+    if Conf["INPUT_CACHE"] == 1:
+        fobs = openInputCache(ObsFile, ObsIdx)
+    else:
+        fobs = openDataFile(ObsFile)
+
+        # Read header line of OBS file
+        fobs.readline()
+
+    # Get the processing stages, recording their timing if activated
+    ObsEpochs = timeEpochs(Timing, readObsEpochs(fobs), "readObsEpochs")
+    runPrepro = timeStage(Timing, runPreProcMeas)
+    readInputs = timeStage(Timing, readCorrectInputs)
+    runCorrect = timeStage(Timing, runCorrectMeas)
+    runCorrectBlock = timeStage(Timing, runCorrectMeasBlock)
+    computeSpvt = timeStage(Timing, computeSpvtSolution)
+    computeSpvtBlock = timeStage(Timing, computeSpvtSolutionBlock)
+    updatePerf = timeStage(Timing, updatePerfEpoch)
+    writePrepro = timeStage(Timing, generatePreproFile)
+    writeCorr = timeStage(Timing, generateCorrFile)
+    writePos = timeStage(Timing, generatePosFile)
+    plotPos = timeStage(Timing, runPlot, "generatePosPlots")
+    plotHist = timeStage(Timing, runPlot, "generateHistPlot")
+
+    # Function to correct a block of epochs, compute their spvt
+    # solutions and update the intermediate performances
+    def processCorrBlock(EpochsInfo):
+        # Correct measurements and estimate the variances with SBAS information
+        # ----------------------------------------------------------
+        if Conf["CORR_ENGINE"] == 1:
+            CorrInfoList = runCorrectBlock(Conf, RcvrInfo, EpochsInfo)
+        else:
+            CorrInfoList = [runCorrect(Conf, RcvrInfo, PreproObsInfo, SatInfo, LosInfo) \
+                for PreproObsInfo, SatInfo, LosInfo in EpochsInfo]
 
-        # Define the full path and name to the OBS INFO file to read
-        ObsFile = Scen + \
-            '/INP/OBS/' + "OBS_%s_Y%02dD%03d.dat" % \
-                (Rcvr, Year % 100, Doy)
+        # If CORR outputs are requested
+        if Conf["CORR_OUT"] == 1:
+            # Generate output file
+            for CorrInfo in CorrInfoList:
+                writeOutput(Writer, writeCorr, fcorr, CorrInfo)
 
-        # Display Message
-        print("INFO: Reading file: %s..." %
-        ObsFile)
+        # Compute spvt solution
+        # ----------------------------------------------------------
+        # If only PA mode activated
+        if Conf["SPVT_ENGINE"] == 1:
+            PosInfoList = computeSpvtBlock(Conf, RcvrInfo, CorrInfoList)
+        else:
+            PosInfoList = [computeSpvt(Conf, RcvrInfo, CorrInfo) \
+                for CorrInfo in CorrInfoList]
+
+        # Loop over solved epochs
+        for PosInfo in PosInfoList:
+            # Compute intermediate performances
+            # ----------------------------------------------------------
+            # If Position information available
+            if len(PosInfo) > 0:
+                # Compute intermediate performances for PA services
+                for Service, PerfInfoSer in PerfInfo.items():
+                    if Service != "NPA":
+                        updatePerf(Conf, Service, PosInfo, PerfInfoSer)
+
+                # If SPVT outputs are requested
+                if Conf["SPVT_OUT"] == 1:
+                    # Generate output file
+                    writeOutput(Writer, writePos, fpos, PosInfo, Rcvr)
+
+    # End of processCorrBlock()
+
+    # Start the output writer thread, if activated
+    Writer = openOutputWriter() if Conf["OUTPUT_WRITER"] == 1 else None
+
+    # Epochs are corrected and solved one by one, or by blocks with the
+    # whole-epoch Corrections engine or the block SPVT engine
+    CorrEpochsInfo = []
+    CorrBlockSize = Const.CORR_BLOCK_EPOCHS \
+        if Conf["CORR_ENGINE"] == 1 or Conf["SPVT_ENGINE"] == 1 else 1
+
+    # LOOP over all Epochs of OBS file
+    # ----------------------------------------------------------
+    for ObsInfo in ObsEpochs:
+
+        # Get SoD
+        Sod = int(float(ObsInfo[0][ObsIdx["SOD"]]))
+
+        # If resuming, skip the epochs processed before the checkpoint
+        if Sod < ResumeSod:
+            continue
+
+        # If checkpoints are activated, save the state of the receiver-day
+        # before processing the epoch, every CHECKPOINT_RATE seconds
+        if CheckpointRate > 0 and Sod >= NextCheckpointSod:
+            # Process the pending epochs and wait until all the outputs
+            # are written
+            processCorrBlock(CorrEpochsInfo)
+            CorrEpochsInfo = []
+            closeOutputWriter(Writer)
+
+            # Write the outputs to disk, getting their sizes
+            OutSizes = OrderedDict({})
+            if Conf["PREPRO_OUT"] == 1:
+                fpreprobs, OutSizes["PREPRO"] = syncOutputFile(fpreprobs, PreproObsFile, OutLevel)
+            if Conf["CORR_OUT"] == 1:
+                fcorr, OutSizes["CORR"] = syncOutputFile(fcorr, CorrFile, OutLevel)
+            if Conf["SPVT_OUT"] == 1:
+                fpos, OutSizes["POS"] = syncOutputFile(fpos, PosFile, OutLevel)
+
+            generateCheckpointFile(CheckpointFile, {
+                "Conf": Conf,                               # Configuration
+                "Done": False,                              # Receiver-day completed
+                "Sod": Sod,                                 # First epoch to be processed
+                "PrevPreproObsInfo": PrevPreproObsInfo,     # Preprocessing state
+                "PerfInfo": PerfInfo,                       # Performances state
+                "VpeHistInfo": VpeHistInfo,                 # VPE histogram state
+                "SatInfo": SatInfo,                         # Last SAT epoch read
+                "LosInfo": LosInfo,                         # Last LOS epoch read
+                "SodInputs": SodInputs,                     # SoD of the last SAT/LOS epoch read
+                "SatPtr": fsat["EpochPtr"],                 # Next SAT epoch
+                "LosPtr": flos["EpochPtr"],                 # Next LOS epoch
+                "Outputs": OutSizes,                        # Size of the output files
+            })
+            NextCheckpointSod = (Sod // CheckpointRate + 1) * CheckpointRate
+
+            # Restart the output writer thread, if activated
+            Writer = openOutputWriter() if Conf["OUTPUT_WRITER"] == 1 else None
+
+        # Preprocess OBS measurements
+        # ----------------------------------------------------------
+        PreproObsInfo = runPrepro(Conf, RcvrInfo, ObsInfo, PrevPreproObsInfo)
 
-        # If Preprocessing outputs are activated
+        # If PREPRO outputs are requested
         if Conf["PREPRO_OUT"] == 1:
-            # Define the full path and name to the output PREPRO OBS file
-            PreproObsFile = Scen + \
-                '/OUT/PPVE/' + "PREPRO_OBS_%s_Y%02dD%03d.dat" % \
-                    (Rcvr, Year % 100, Doy)
+            # Generate output file
+            writeOutput(Writer, writePrepro, fpreprobs, PreproObsInfo)
 
-            # Create output file
-            fpreprobs = createOutputFile(PreproObsFile, PreproHdr)
+        # The rest of te analyses are executed every configured sampling rate
+        if(Sod % Conf["SAMPLING_RATE"] == 0):
+            # Check if SoD have not already been read
+            if(SodInputs < Sod):
+                # Read SAT and LOS info
+                SatInfo, LosInfo, SodInputs = readInputs(fsat, flos, Sod)
 
-        # If Corrected outputs are activated
-        if Conf["CORR_OUT"] == 1:
-            # Define the full path and name to the output CORR file
-            CorrFile = Scen + \
-                '/OUT/CORR/' + "CORR_%s_Y%02dD%03d.dat" % \
-                    (Rcvr, Year % 100, Doy)
+            # If data is not available, continue to next epoch
+            if(SatInfo == [] or LosInfo == []):
+                continue
 
-            # Create output file
-            fcorr = createOutputFile(CorrFile, CorrHdr)
+            # Add the epoch to the block of epochs to be corrected
+            CorrEpochsInfo.append((PreproObsInfo, SatInfo, LosInfo))
 
-        # If Position outputs are activated
-        if Conf["SPVT_OUT"] == 1:
-            # Define the full path and name to the output POS file
-            PosFile = Scen + '/OUT/SPVT/' + "POS_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
+            # If the block is complete, process it
+            if len(CorrEpochsInfo) >= CorrBlockSize:
+                processCorrBlock(CorrEpochsInfo)
+                CorrEpochsInfo = []
+
+    # End of for ObsInfo in ObsEpochs:
 
-            # Create output file
-            fpos = createOutputFile(PosFile, PosHdr)
+    # Process the remaining epochs
+    processCorrBlock(CorrEpochsInfo)
 
-        # If Performances outputs are activated
+    # Wait until all the epoch outputs are written
+    closeOutputWriter(Writer)
+
+    # Close OBS file
+    closeInputFile(fobs)
+
+    # If Performances state outputs are activated
+    if Conf["PERF_STATE_OUT"] == 1:
+        # Save the accumulated performances information to be merged
+        # with other receiver-days
+        PerfStateFile = Scen + '/OUT/PERF/' + "PERF_STATE_%s_Y%02dD%03d.json" % (Rcvr, Year % 100, Doy)
+        generatePerfStateFile(PerfStateFile, PerfInfo)
+
+    # Compute performances
+    # ----------------------------------------------------------
+    for Service, PerfInfoSer in PerfInfo.items():
+        computePerf(PerfInfoSer)
+
+        # If PERF outputs are requested
         if Conf["PERF_OUT"] == 1:
-            # Define the full path and name to the output PERF file
-            PerfFile = Scen + '/OUT/PERF/' + "PERF_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
+            # Generate output file
+            generatePerfFile(fperf, PerfInfoSer)
 
-            # Create output file
-            fperf = createOutputFile(PerfFile, PerfHdr)
-
-        # If LPV200 VPE Histogram outputs are activated
-        if Conf["VPEHIST_OUT"] == 1:
-            # Define the full path and name to the output HIST file
-            HistFile = Scen + '/OUT/PERF/' + "VPE_HIST_%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
-
-            # Create output file
-            fhist = createOutputFile(HistFile, HistHdr)
-
-        # Define the full path and name to the SAT file to read and open the file
-        SatFile = Scen + \
-            '/OUT/SAT/' + "SAT_%s_Y%02dD%03d.dat" % \
-                (Rcvr, Year % 100, Doy)
-        fsat = openInputFile(SatFile)
-
-        # Define the full path and name to the LOS file to read
-        LosFile = Scen + \
-            '/OUT/LOS/' + "LOS_%s_Y%02dD%03d.dat" % \
-                (Rcvr, Year % 100, Doy)
-        flos = openInputFile(LosFile)
-
-        # Initialize Variables
-        EndOfFile = False
-        ObsInfo = [None]
-        PrevPreproObsInfo = {}
-        for prn in range(1, Const.MAX_NUM_SATS_CONSTEL + 1):
-            PrevPreproObsInfo["G%02d" % prn] = {
-            "L1_n_1": 0.0,           # t-1 Carrier Phase in L1
-            "L1_n_2": 0.0,           # t-2 Carrier Phase in L1
-            "L1_n_3": 0.0,           # t-3 Carrier Phase in L1
-            "t_n_1": 0.0,            # t-1 epoch
-            "t_n_2": 0.0,            # t-2 epoch
-            "t_n_3": 0.0,            # t-3 epoch
-            "CsBuff": [0] * \
-int(Conf["MIN_NCS_TH"][CSNEPOCHS]),  # Number of consecutive epochs for CS
-            "CsIdx": 0,              # Index of CS detector buffer
-            "ResetHatchFilter": 1,   # Flag to reset Hatch filter
-            "Ksmooth": 0,            # Hatch filter K
-            "PrevEpoch": 86400,      # Previous SoD
-            "PrevL1": 0.0,           # Previous L1
-            "PrevSmoothC1": 0.0,     # Previous Smoothed C1
-            "PrevRangeRateL1": 0.0,  # Previous Code Rate
-            "PrevPhaseRateL1": 0.0,  # Previous Phase Rate
-            "PrevGeomFree": 0.0,     # Previous Geometry-Free Observable
-            "PrevGeomFreeEpoch": 0.0,# Previous Geometry-Free Observable
-            "PrevRej": 0,            # Previous Rejection flag
-                                     # ...
-        } # End of SatPreproObsInfo
-        Services = ["OS", "APVI", "LPV200", "CATI", "NPA", "MARITIME", "CUSTOM"]
-        PerfInfo = OrderedDict({})
-        VpeHistInfo = OrderedDict({})
-        initPerfInfo(Conf, Services, Rcvr, RcvrInfo[Rcvr], Doy, PerfInfo, VpeHistInfo)
-        SodInputs = -1
-
-        # Open OBS file
-        with open(ObsFile, 'r') as fobs:
-            # Read header line of OBS file
-            fobs.readline()
-
-            # LOOP over all Epochs of OBS file
-            # ----------------------------------------------------------
-            while not EndOfFile:
-
-                # If ObsInfo is not empty
-                if ObsInfo != []:
-
-                    # Read Only One Epoch
-                    ObsInfo = readObsEpoch(fobs)
-
-                    # If ObsInfo is empty, exit loop
-                    if ObsInfo == []:
-                        break
-
-                    # Preprocess OBS measurements
-                    # ----------------------------------------------------------
-                    PreproObsInfo = runPreProcMeas(Conf, RcvrInfo[Rcvr], ObsInfo, PrevPreproObsInfo)
-
-                    # If PREPRO outputs are requested
-                    if Conf["PREPRO_OUT"] == 1:
-                        # Generate output file
-                        generatePreproFile(fpreprobs, PreproObsInfo)
-
-                    # Get SoD
-                    Sod = int(float(ObsInfo[0][ObsIdx["SOD"]]))
-
-                    # The rest of te analyses are executed every configured sampling rate
-                    if(Sod % Conf["SAMPLING_RATE"] == 0):
-                        # Check if SoD have not already been read
-                        if(SodInputs < Sod):
-                            # Read SAT and LOS info
-                            SatInfo, LosInfo, SodInputs = readCorrectInputs(fsat, flos, Sod)
-
-                        # If data is not available, continue to next epoch
-                        if(SatInfo == [] or LosInfo == []):
-                            continue
-
-                        # Correct measurements and estimate the variances with SBAS information
-                        # ----------------------------------------------------------
-                        CorrInfo = runCorrectMeas(Conf, RcvrInfo[Rcvr], PreproObsInfo, SatInfo, LosInfo)
-
-                        # If CORR outputs are requested
-                        if Conf["CORR_OUT"] == 1:
-                            # Generate output file
-                            generateCorrFile(fcorr, CorrInfo)
-
-                        # Compute spvt solution and intermediate performances
-                        # ----------------------------------------------------------
-                        # If only PA mode activated
-                        PosInfo = computeSpvtSolution(Conf, RcvrInfo[Rcvr], CorrInfo)
-
-                        # If Position information available
-                        if len(PosInfo) > 0:
-                            # Compute intermediate performances for PA services
-                            for Service, PerfInfoSer in PerfInfo.items():
-                                if Service != "NPA":
-                                    updatePerfEpoch(Conf, Service, PosInfo, PerfInfoSer)
-
-                            # If SPVT outputs are requested
-                            if Conf["SPVT_OUT"] == 1:
-                                # Generate output file
-                                generatePosFile(fpos, PosInfo, Rcvr)
-
-                # End if ObsInfo != []:
-                else:
-                    EndOfFile = True
-
-                # End of if ObsInfo != []:
-                
-            # End of while not EndOfFile:
+    # If PREPRO outputs are requested
+    if Conf["PREPRO_OUT"] == 1:
+        # Close PREPRO output file
+        fpreprobs.close()
+
+        # # Display Message
+        # print("INFO: Reading file: %s and generating PREPRO figures..." %
+        # PreproObsFile)
+
+        # # Generate Preprocessing plots
+        # generatePreproPlots(PreproObsFile)
+
+    # If CORR outputs are requested
+    if Conf["CORR_OUT"] == 1:
+        # Close CORR output file
+        fcorr.close()
+
+        # # Display Message
+        # print("INFO: Reading file: %s and generating CORR figures..." %
+        # CorrFile)
+
+        # Generate CORR plots
+        # generateCorrPlots(CorrFile, SatFile, RcvrInfo)
+
+    # If SPVT outputs are requested
+    if Conf["SPVT_OUT"] == 0:
+        # Close POS output file
+        fpos.close()
+
+        # Display Message
+        print("INFO: Reading file: %s and generating POS figures..." % PosFile)
+
+        # Generate POS plots
+        from PosPlots import generatePosPlots
+        plotPos(Conf, PlotJobs, generatePosPlots, Conf, PosFile)
+
+    # If PERF outputs are requested
+    if Conf["PERF_OUT"] == 1:
+    # Close PERF output file
+        fperf.close()
+
+        # Display Message
+        print("INFO: Reading file: %s and preparing PERF figures..." % PerfFile)
     
-        # End of with open(ObsFile, 'r') as f:
+    # If LPV200 VPE Histogram outputs are requested 
+    if Conf["VPEHIST_OUT"] == 0:
+        # Check if LPV200 service level is activated
+        if "LPV200" not in PerfInfo.keys():
+            sys.stderr.write("ERROR: Please activate LPV200 service level for LPV200 VPE histogram computation \n")
+            sys.exit(1)
+
+        # Compute VPE Histogram and generate output file for LPV200 service level
+        computeVpeHist(fhist, PerfInfo["LPV200"], VpeHistInfo)
+        
+        # Close PERF output file
+        fhist.close()
 
-        # Compute performances
-        # ----------------------------------------------------------
-        for Service, PerfInfoSer in PerfInfo.items():
-            computePerf(PerfInfoSer)
+        # Display Message
+        print("INFO: Reading file: %s and generating VPE Histogram..." % HistFile)
 
-            # If PERF outputs are requested
-            if Conf["PERF_OUT"] == 1:
-                # Generate output file
-                generatePerfFile(fperf, PerfInfoSer)
+        # Generate VPE Histogram plots
+        from PerfPlots import generateHistPlot
+        plotHist(Conf, PlotJobs, generateHistPlot, PerfInfo["LPV200"]["ExtVpe"], HistFile)
 
-        # If PREPRO outputs are requested
-        if Conf["PREPRO_OUT"] == 1:
-            # Close PREPRO output file
-            fpreprobs.close()
 
-            # # Display Message
-            # print("INFO: Reading file: %s and generating PREPRO figures..." %
-            # PreproObsFile)
+    # Close input files
+    closeInputFile(fsat)
+    closeInputFile(flos)
 
-            # # Generate Preprocessing plots
-            # generatePreproPlots(PreproObsFile)
+    # If stage timing is activated, display and save its report
+    if Timing is not None:
+        TimingReport = computeTiming(Timing, "%s_Y%02dD%03d" % (Rcvr, Year % 100, Doy))
+        printTiming(TimingReport)
+        TimingFile = Scen + '/OUT/TIMING/' + "TIMING_%s_Y%02dD%03d.json" % (Rcvr, Year % 100, Doy)
+        generateTimingFile(TimingFile, TimingReport)
 
-        # If CORR outputs are requested
-        if Conf["CORR_OUT"] == 1:
-            # Close CORR output file
-            fcorr.close()
+    # If checkpoints are activated, mark the receiver-day as completed
+    if CheckpointRate > 0:
+        generateCheckpointFile(CheckpointFile, {
+            "Conf": Conf,                                   # Configuration
+            "Done": True,                                   # Receiver-day completed
+            "Services": list(PerfInfo.keys()),              # Activated service levels
+        })
 
-            # # Display Message
-            # print("INFO: Reading file: %s and generating CORR figures..." %
-            # CorrFile)
+    return PerfFile, PosFile, list(PerfInfo.keys()), PlotJobs
 
-            # Generate CORR plots
-            # generateCorrPlots(CorrFile, SatFile, RcvrInfo[Rcvr])
+# End of processRcvrDay()
 
-        # If SPVT outputs are requested
-        if Conf["SPVT_OUT"] == 0:
-            # Close POS output file
-            fpos.close()
+def runPlot(Conf, PlotJobs, PlotFunc, *PlotArgs):
 
-            # Display Message
-            print("INFO: Reading file: %s and generating POS figures..." % PosFile)
+    # Purpose: render a figure in the current process or, if plot workers
+    #          are activated, queue it to be rendered by them
 
-            # Generate POS plots
-            generatePosPlots(Conf, PosFile)
+    # Parameters
+    # ==========
+    # Conf: dict
+    #       Configuration dictionary
+    # PlotJobs: list
+    #           List of queued plot jobs
+    # PlotFunc: function
+    #           Plot generation function
+    # PlotArgs: tuple
+    #           Arguments of the plot generation function
 
-        # If PERF outputs are requested
-        if Conf["PERF_OUT"] == 1:
-        # Close PERF output file
-            fperf.close()
+    # Returns
+    # =======
+    # Nothing
 
-            # Display Message
-            print("INFO: Reading file: %s and preparing PERF figures..." % PerfFile)
+    if Conf["PLOT_JOBS"] == 0:
+        PlotFunc(*PlotArgs)
+    else:
+        PlotJobs.append((PlotFunc, PlotArgs))
 
-            # Append file to PerFilesList
-            PerfFilesList.append(PerfFile)
-        
-        # If LPV200 VPE Histogram outputs are requested 
-        if Conf["VPEHIST_OUT"] == 0:
-            # Check if LPV200 service level is activated
-            if "LPV200" not in PerfInfo.keys():
-                sys.stderr.write("ERROR: Please activate LPV200 service level for LPV200 VPE histogram computation \n")
-                sys.exit(1)
-
-            # Compute VPE Histogram and generate output file for LPV200 service level
-            computeVpeHist(fhist, PerfInfo["LPV200"], VpeHistInfo)
-            
-            # Close PERF output file
-            fhist.close()
+# End of runPlot()
 
-            # Display Message
-            print("INFO: Reading file: %s and generating VPE Histogram..." % HistFile)
+def initPlotWorker():
+
+    # Purpose: select the non-interactive Agg backend in the plot workers
+
+    import matplotlib.pyplot as plt
+    plt.switch_backend("Agg")
+
+# End of initPlotWorker()
+
+def runPlotJob(PlotFunc, PlotArgs):
+
+    # Purpose: render a figure in a plot worker, keeping its messages in
+    #          memory so that they can be displayed by the main process
+
+    # Parameters
+    # ==========
+    # PlotFunc: function
+    #           Plot generation function
+    # PlotArgs: tuple
+    #           Arguments of the plot generation function
+
+    # Returns
+    # =======
+    # StdOut: str
+    #         Messages displayed by the job in the standard output
+    # StdErr: str
+    #         Messages displayed by the job in the standard error
 
-            # Generate VPE Histogram plots
-            generateHistPlot(PerfInfo["LPV200"]["ExtVpe"], HistFile)
+    StdOut = StringIO()
+    StdErr = StringIO()
 
+    with redirect_stdout(StdOut), redirect_stderr(StdErr):
+        PlotFunc(*PlotArgs)
 
-        # Close input files
-        fsat.close()
-        flos.close()
+    return StdOut.getvalue(), StdErr.getvalue()
 
-    # End of JD loop
+# End of runPlotJob()
 
-# End of RCVR loop
+def submitPlotJobs(PlotPool, PlotJobs, PlotFutures):
 
-print( '\n------------------------------------')
-print( '--> END OF PETRUS ANALYSIS')
-print( '------------------------------------')
+    # Purpose: send the queued plot jobs to the pool of plot workers
 
-if Conf["PERF_OUT"] == 1:
-    print("INFO: Generating PERF figures for all receivers...")
+    # Parameters
+    # ==========
+    # PlotPool: ProcessPoolExecutor
+    #           Pool of plot workers (None if PLOT_JOBS is 0)
+    # PlotJobs: list
+    #           List of queued plot jobs
+    # PlotFutures: list
+    #              List of submitted plot jobs, to be completed
+
+    # Returns
+    # =======
+    # Nothing
+
+    if PlotPool is not None:
+        for PlotFunc, PlotArgs in PlotJobs:
+            PlotFutures.append(PlotPool.submit(runPlotJob, PlotFunc, PlotArgs))
+
+# End of submitPlotJobs()
+
+def runRcvrDayJob(Scen, Conf, Rcvr, RcvrInfo, Jd, Resume):
+
+    # Purpose: run processRcvrDay in a worker process, keeping its
+    #          messages in memory so that they can be displayed as a
+    #          whole block by the main process
+
+    # Parameters
+    # ==========
+    # Same as processRcvrDay()
+
+    # Returns
+    # =======
+    # Result: tuple
+    #         Outputs of processRcvrDay() (None if the job exited)
+    # StdOut: str
+    #         Messages displayed by the job in the standard output
+    # StdErr: str
+    #         Messages displayed by the job in the standard error
+    # ExitCode: int
+    #           Exit code requested by the job (None if it ended normally)
+
+    # Initialize outputs
+    Result = None
+    ExitCode = None
+    StdOut = StringIO()
+    StdErr = StringIO()
+
+    with redirect_stdout(StdOut), redirect_stderr(StdErr):
+        # Display Message
+        print( '\n***-----------------------------***')
+        print( '*** Processing receiver: ' + Rcvr + '   ***')
+        print( '***-----------------------------***')
+
+        try:
+            Result = processRcvrDay(Scen, Conf, Rcvr, RcvrInfo, Jd, Resume)
+
+        # Keep the exit code to be applied by the main process
+        except SystemExit as Exit:
+            ExitCode = Exit.code
+
+    return Result, StdOut.getvalue(), StdErr.getvalue(), ExitCode
+
+# End of runRcvrDayJob()
+
+#######################################################
+# MAIN BODY
+#######################################################
+
+if __name__ == "__main__":
+    # Check InputOutput Arguments
+    if len(sys.argv) not in [2, 3] or (len(sys.argv) == 3 and sys.argv[2] != "--resume"):
+        displayUsage()
+        sys.exit()
+
+    # Extract the arguments
+    Scen = sys.argv[1]
+    Resume = 1 if len(sys.argv) == 3 else 0
+
+    # Select the Configuratiun file name
+    CfgFile = Scen + '/CFG/petrus.cfg'
+
+    # Read conf file
+    Conf = readConf(CfgFile)
+    # print(dump(Conf))
+
+    # Process Configuration Parameters
+    Conf = processConf(Conf)
+
+    # Select the RCVR Positions file name
+    RcvrFile = Scen + '/INP/RCVR/' + Conf["RCVR_FILE"]
+
+    # Read RCVR Positions file
+    RcvrInfo = readRcvr(RcvrFile)
+
+    # Print header
+    print( '------------------------------------')
+    print( '--> RUNNING PETRUS:')
+    print( '------------------------------------')
+
+    # Initialize Variables
+    PerfFilesList = []
+    PosFilesList = []
+    Services = []
+
+    # Start the stage timing of the whole run, if activated
+    RunTiming = initTiming() if Conf["STAGE_TIMING"] == 1 else None
+
+    # If plot workers are activated, start them so that figures are
+    # rendered while the next receiver-days are processed
+    PlotPool = None
+    PlotFutures = []
+    if Conf["PLOT_JOBS"] > 0:
+        PlotPool = ProcessPoolExecutor(max_workers = int(Conf["PLOT_JOBS"]), \
+            initializer = initPlotWorker)
+
+    # If receiver-day jobs shall be run sequentially
+    if Conf["NJOBS"] == 1:
+        # Loop over RCVRs
+        #-----------------------------------------------------------------------
+        for Rcvr in RcvrInfo.keys():
+            # Display Message
+            print( '\n***-----------------------------***')
+            print( '*** Processing receiver: ' + Rcvr + '   ***')
+            print( '***-----------------------------***')
+
+            # Loop over Julian Days in simulation
+            #-----------------------------------------------------------------------
+            for Jd in range(Conf["INI_DATE_JD"], Conf["END_DATE_JD"] + 1):
+                # Process receiver and day
+                PerfFile, PosFile, Services, PlotJobs = processRcvrDay(Scen, Conf, Rcvr, RcvrInfo[Rcvr], Jd, Resume)
 
-    # Generate PERF plots
-    for Service in PerfInfo.keys():
-        generatePerfPlots(Service, PerfFilesList)
+                # Send figures to the plot workers
+                submitPlotJobs(PlotPool, PlotJobs, PlotFutures)
+
+                # Append file to PerFilesList
+                if PerfFile is not None:
+                    PerfFilesList.append(PerfFile)
+
+                # Append file to PosFilesList
+                if PosFile is not None:
+                    PosFilesList.append(PosFile)
+
+            # End of JD loop
+
+        # End of RCVR loop
+
+    # Otherwise, send each receiver-day job to a pool of processes
+    else:
+        # Get number of processes (0: as many as available CPUs)
+        NJobs = int(Conf["NJOBS"]) if Conf["NJOBS"] > 0 else os.cpu_count()
+
+        with ProcessPoolExecutor(max_workers = NJobs) as Pool:
+            # Submit one job per receiver and day
+            Jobs = []
+            for Rcvr in RcvrInfo.keys():
+                for Jd in range(Conf["INI_DATE_JD"], Conf["END_DATE_JD"] + 1):
+                    Jobs.append(Pool.submit(runRcvrDayJob, \
+                        Scen, Conf, Rcvr, RcvrInfo[Rcvr], Jd, Resume))
+
+            # Collect the jobs keeping the submission order
+            for Job in Jobs:
+                Result, StdOut, StdErr, ExitCode = Job.result()
+
+                # Display job messages as a whole block
+                sys.stdout.write(StdOut)
+                sys.stdout.flush()
+                sys.stderr.write(StdErr)
+                sys.stderr.flush()
+
+                # If the job requested to exit, stop the remaining jobs
+                if ExitCode is not None:
+                    for PendingJob in Jobs:
+                        PendingJob.cancel()
+                    if PlotPool is not None:
+                        PlotPool.shutdown(cancel_futures = True)
+                    sys.exit(ExitCode)
+
+                # Append files to PerFilesList and PosFilesList
+                PerfFile, PosFile, Services, PlotJobs = Result
+
+                # Send figures to the plot workers
+                submitPlotJobs(PlotPool, PlotJobs, PlotFutures)
+                if PerfFile is not None:
+                    PerfFilesList.append(PerfFile)
+                if PosFile is not None:
+                    PosFilesList.append(PosFile)
+
+            # End of for Job in Jobs:
+
+        # End of with ProcessPoolExecutor(max_workers = NJobs) as Pool:
+
+    # End of if Conf["NJOBS"] == 1:
+
+    print( '\n------------------------------------')
+    print( '--> END OF PETRUS ANALYSIS')
+    print( '------------------------------------')
+
+    if Conf["PERF_OUT"] == 1:
+        print("INFO: Generating PERF figures for all receivers...")
+
+        from PerfPlots import readPerfFiles, generatePerfPlots
+
+        # Read all PERF files once
+        PerfData = timeStage(RunTiming, readPerfFiles)(PerfFilesList)
+
+        # Generate PERF plots
+        PlotJobs = []
+        plotPerf = timeStage(RunTiming, runPlot, "generatePerfPlots")
+        for Service in Services:
+            plotPerf(Conf, PlotJobs, generatePerfPlots, Service, PerfFilesList, PerfData)
+
+        # Send figures to the plot workers
+        submitPlotJobs(PlotPool, PlotJobs, PlotFutures)
+
+    # If POS outputs and binned Stanford diagrams are activated, generate
+    # the Stanford diagrams of all the receivers and days
+    if Conf["SPVT_OUT"] == 1 and Conf["STANFORD_DENSITY"] == 1 and len(PosFilesList) > 0:
+        print("INFO: Generating Stanford diagrams for all receivers...")
+
+        from PosPlots import generateStanfordPlots
+
+        # Generate Stanford plots
+        PlotJobs = []
+        plotStanford = timeStage(RunTiming, runPlot, "generateStanfordPlots")
+        plotStanford(Conf, PlotJobs, generateStanfordPlots, Conf, PosFilesList)
+
+        # Send figures to the plot workers
+        submitPlotJobs(PlotPool, PlotJobs, PlotFutures)
+
+    # If plot workers are activated, wait until all figures are rendered
+    if PlotPool is not None:
+        # Display plot job messages keeping the submission order
+        for PlotFuture in PlotFutures:
+            StdOut, StdErr = PlotFuture.result()
+            sys.stdout.write(StdOut)
+            sys.stdout.flush()
+            sys.stderr.write(StdErr)
+            sys.stderr.flush()
+
+        PlotPool.shutdown()
+
+    # If stage timing is activated, display and save the report of
+    # the whole run
+    if RunTiming is not None:
+        TimingReport = computeTiming(RunTiming, "ALL")
+        printTiming(TimingReport)
+        generateTimingFile(Scen + '/OUT/TIMING/TIMING_ALL.json', TimingReport)
 
 #######################################################
 # End of Petrus.py
@@ -18,6 +18,7 @@
 ########################################################################
 
 import sys, os
+from collections import OrderedDict
 from pandas import read_csv
 from InputOutput import PosIdx
 sys.path.append(os.getcwd() + '/' + \
@@ -25,7 +26,19 @@ sys.path.append(os.getcwd() + '/' + \
 from COMMON import GnssConstants
 from COMMON.Plots import generatePlot
 import numpy as np
-from scipy.stats import gaussian_kde
+
+# Axes limits of the Stanford diagrams in meters
+HOR_STANFORD_LIM = 50
+VER_STANFORD_LIM = 60
+
+# Pixel size of the Stanford diagrams in meters (binned density mode)
+STANFORD_PIXEL = 0.25
+
+# Columns of the POS file used by the plots and their types
+PosPlotsCols = OrderedDict([("SOD", int), ("SOL", int), ("NSV-SOL", int),\
+    ("HPE", float), ("VPE", float), ("EPE", float), ("NPE", float),\
+    ("HPL", float), ("VPL", float), ("HSI", float), ("VSI", float),\
+    ("HDOP", float), ("VDOP", float), ("PDOP", float), ("TDOP", float)])
 
 def initPlot(PosFile, PlotConf, Title, Label):
     
@@ -35,17 +48,81 @@ def initPlot(PosFile, PlotConf, Title, Label):
     Rcvr = PosFileNameSplit[1]
     DatepDat = PosFileNameSplit[2]
     Date = DatepDat.split('.')[0]
-    Year = Date[1:3]
-    Doy = Date[4:]
+    # Date may be a range of days (first-last)
+    Dates = Date.split('-')
+    Year = Dates[0][1:3]
+    Doy = Dates[0][4:]
 
     # Dump information into PlotConf
     PlotConf["xLabel"] = "Hour of Day %s" % Doy
 
     PlotConf["Title"] = "%s from %s on Year %s"\
         " DoY %s" % (Title, Rcvr, Year, Doy)
+    if len(Dates) > 1:
+        PlotConf["Title"] = "%s from %s from Year %s DoY %s to Year %s"\
+            " DoY %s" % (Title, Rcvr, Year, Doy, Dates[-1][1:3], Dates[-1][4:])
 
     PlotConf["Path"] = sys.argv[1] + '/OUT/SPVT/Figures/%s/' % Label + \
-        '%s_%s_Y%sD%s.png' % (Label, Rcvr, Year, Doy)
+        '%s_%s_%s.png' % (Label, Rcvr, Date)
+
+def initStanfordHist(Lim):
+
+    # Stanford diagram pixels histogram: number of samples per (PE, PL)
+    # pixel from 0 to Lim meters; samples beyond Lim are counted in the
+    # border pixels
+    NPixels = int(round(Lim / STANFORD_PIXEL))
+
+    return {"Lim": Lim, "Counts": np.zeros((NPixels, NPixels), dtype=np.int64)}
+
+def updateStanfordHist(StanfordHist, Pe, Pl):
+
+    # Add samples to the Stanford diagram pixels histogram, in linear time.
+    # Non-finite samples have no pixel and are dropped
+    Finite = np.isfinite(Pe) & np.isfinite(Pl)
+    Pe, Pl = Pe[Finite], Pl[Finite]
+    NPixels = len(StanfordHist["Counts"])
+    PeIdx = np.minimum((np.abs(Pe) / STANFORD_PIXEL).astype(int), NPixels - 1)
+    PlIdx = np.minimum((np.abs(Pl) / STANFORD_PIXEL).astype(int), NPixels - 1)
+    StanfordHist["Counts"] += np.bincount(PeIdx * NPixels + PlIdx, \
+        minlength = NPixels * NPixels).reshape(NPixels, NPixels)
+
+def getStanfordPixels(StanfordHist):
+
+    # Get the centers of the non-empty pixels and their number of samples,
+    # sorted by number of samples
+    PeIdx, PlIdx = np.nonzero(StanfordHist["Counts"])
+    Samples = StanfordHist["Counts"][PeIdx, PlIdx]
+    Order = Samples.argsort(kind = "stable")
+
+    return (PeIdx[Order] + 0.5) * STANFORD_PIXEL, (PlIdx[Order] + 0.5) * STANFORD_PIXEL, \
+        Samples[Order]
+
+def computeStanfordDensity(Conf, Pe, Pl, Lim, StanfordHist):
+
+    # Get the points of a Stanford diagram with their density, either from
+    # a gaussian KDE over the samples or from the pixels histogram (given,
+    # or built from the samples)
+    if Conf["STANFORD_DENSITY"] == 1 or StanfordHist is not None:
+        # Get samples per pixel
+        if StanfordHist is None:
+            StanfordHist = initStanfordHist(Lim)
+            updateStanfordHist(StanfordHist, Pe, Pl)
+        Pe, Pl, Samples = getStanfordPixels(StanfordHist)
+        ZData = np.log10(Samples)
+        Label = "Log10 of Samples per Pixel (Number of Samples : " + \
+            str(StanfordHist["Counts"].sum()) + ")"
+
+    else:
+        # Get point density data
+        from scipy.stats import gaussian_kde
+        Den = np.vstack([Pe,Pl])
+        ZData = gaussian_kde(Den)(Den)
+        # Sort data by point density values
+        idx = ZData.argsort()
+        Pe, Pl, ZData = Pe[idx], Pl[idx], ZData[idx]
+        Label = "Point Density (Number of Samples : " + str(len(Pe)) + ")"
+
+    return Pe, Pl, ZData, Label
 
 # Plot DOP
 def plotDop(PosFile, PosData):
@@ -276,7 +353,7 @@ def plotSI(PosFile, PosData):
     generatePlot(PlotConf)
 
 # Plot Horizontal Stanford Diagram
-def plotHStanford(Conf, PosFile, PosData):
+def plotHStanford(Conf, PosFile, PosData, StanfordHist = None):
 
     # Graph settings definition
     PlotConf = {}
@@ -288,11 +365,12 @@ def plotHStanford(Conf, PosFile, PosData):
     PlotConf["xLabel"] = "HPE [m]"
     PlotConf["yLabel"] = "HPL [m]"
 
-    PlotConf["xLim"] = [0,50]
-    PlotConf["yLim"] = [0,50]
-    PlotConf["HLine"] = [(Conf["LPV200"][1], 0, 50), (Conf["APVI"][1], 0, 50)]
-    PlotConf["VLine"] = [(Conf["LPV200"][1], 0, 50), (Conf["APVI"][1], 0, 50)]
-    PlotConf["SLine"] = [np.array([0,50]), np.array([0,50])]
+    Lim = HOR_STANFORD_LIM
+    PlotConf["xLim"] = [0,Lim]
+    PlotConf["yLim"] = [0,Lim]
+    PlotConf["HLine"] = [(Conf["LPV200"][1], 0, Lim), (Conf["APVI"][1], 0, Lim)]
+    PlotConf["VLine"] = [(Conf["LPV200"][1], 0, Lim), (Conf["APVI"][1], 0, Lim)]
+    PlotConf["SLine"] = [np.array([0,Lim]), np.array([0,Lim])]
 
     PlotConf["Grid"] = True
     
@@ -300,20 +378,19 @@ def plotHStanford(Conf, PosFile, PosData):
     PlotConf["LineWidth"] = 1.5
 
     # Processing data to be plotted
-    FilterCond = PosData[PosIdx["SOL"]] == 1
+    Hpe, Hpl = None, None
+    if StanfordHist is None:
+        FilterCond = PosData[PosIdx["SOL"]] == 1
+
+        Hpe = PosData[PosIdx["HPE"]][FilterCond].to_numpy()
+        Hpl = PosData[PosIdx["HPL"]][FilterCond].to_numpy()
 
-    Hpe = PosData[PosIdx["HPE"]][FilterCond].to_numpy()
-    Hpl = PosData[PosIdx["HPL"]][FilterCond].to_numpy()
     # Get point density data
-    Den = np.vstack([Hpe,Hpl])
-    ZData = gaussian_kde(Den)(Den)
-    # Sort data by point density values
-    idx = ZData.argsort()
-    Hpe, Hpl, ZData = Hpe[idx], Hpl[idx], ZData[idx]
+    Hpe, Hpl, ZData, DensityLabel = computeStanfordDensity(Conf, Hpe, Hpl, Lim, StanfordHist)
 
     # Colorbar definition
     PlotConf["ColorBar"] = "gnuplot"
-    PlotConf["ColorBarLabel"] = "Point Density (Number of Samples : " + str(len(Hpe)) + ")"
+    PlotConf["ColorBarLabel"] = DensityLabel
     PlotConf["ColorBarMin"] = min(ZData)
     PlotConf["ColorBarMax"] = max(ZData)
 
@@ -330,7 +407,7 @@ def plotHStanford(Conf, PosFile, PosData):
     generatePlot(PlotConf)
 
 # Plot Vertical Stanford Diagram
-def plotVStanford(Conf, PosFile, PosData):
+def plotVStanford(Conf, PosFile, PosData, StanfordHist = None):
 
     # Graph settings definition
     PlotConf = {}
@@ -342,11 +419,12 @@ def plotVStanford(Conf, PosFile, PosData):
     PlotConf["xLabel"] = "VPE [m]"
     PlotConf["yLabel"] = "VPL [m]"
 
-    PlotConf["xLim"] = [0,60]
-    PlotConf["yLim"] = [0,60]
-    PlotConf["HLine"] = [(Conf["LPV200"][2], 0, 60), (Conf["APVI"][2], 0, 60)]
-    PlotConf["VLine"] = [(Conf["LPV200"][2], 0, 60), (Conf["APVI"][2], 0, 60)]
-    PlotConf["SLine"] = [np.array([0,60]), np.array([0,60])]
+    Lim = VER_STANFORD_LIM
+    PlotConf["xLim"] = [0,Lim]
+    PlotConf["yLim"] = [0,Lim]
+    PlotConf["HLine"] = [(Conf["LPV200"][2], 0, Lim), (Conf["APVI"][2], 0, Lim)]
+    PlotConf["VLine"] = [(Conf["LPV200"][2], 0, Lim), (Conf["APVI"][2], 0, Lim)]
+    PlotConf["SLine"] = [np.array([0,Lim]), np.array([0,Lim])]
 
     PlotConf["Grid"] = True
     
@@ -354,20 +432,19 @@ def plotVStanford(Conf, PosFile, PosData):
     PlotConf["LineWidth"] = 1.5
 
     # Processing data to be plotted
-    FilterCond = PosData[PosIdx["SOL"]] == 1
+    Vpe, Vpl = None, None
+    if StanfordHist is None:
+        FilterCond = PosData[PosIdx["SOL"]] == 1
+
+        Vpe = PosData[PosIdx["VPE"]][FilterCond].to_numpy()
+        Vpl = PosData[PosIdx["VPL"]][FilterCond].to_numpy()
 
-    Vpe = PosData[PosIdx["VPE"]][FilterCond].to_numpy()
-    Vpl = PosData[PosIdx["VPL"]][FilterCond].to_numpy()
     # Get point density data
-    Den = np.vstack([Vpe,Vpl])
-    ZData = gaussian_kde(Den)(Den)
-    # Sort data by point density values
-    idx = ZData.argsort()
-    Vpe, Vpl, ZData = Vpe[idx], Vpl[idx], ZData[idx]
+    Vpe, Vpl, ZData, DensityLabel = computeStanfordDensity(Conf, Vpe, Vpl, Lim, StanfordHist)
 
     # Colorbar definition
     PlotConf["ColorBar"] = "gnuplot"
-    PlotConf["ColorBarLabel"] = "Point Density (Number of Samples : " + str(len(Vpe)) + ")"
+    PlotConf["ColorBarLabel"] = DensityLabel
     PlotConf["ColorBarMin"] = min(ZData)
     PlotConf["ColorBarMax"] = max(ZData)
 
@@ -402,12 +479,13 @@ def generatePosPlots(Conf, PosFile):
     # PLOTTING FUNCTIONS
     # ----------------------------------------------------------
 
-    # DOPS vs TIME
-    # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
+    # Read all the cols needed by the plots from PosFile file, only once
     PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["SOD"],PosIdx["NSV-SOL"],PosIdx["HDOP"],PosIdx["VDOP"],PosIdx["PDOP"],PosIdx["TDOP"],PosIdx["SOL"]])
+    usecols=[PosIdx[Col] for Col in PosPlotsCols],\
+    dtype={PosIdx[Col]: Type for Col, Type in PosPlotsCols.items()})
 
+    # DOPS vs TIME
+    # ----------------------------------------------------------
     print( 'Plot Dilution Of Precision vs Time...')
     
     # Configure plot and call plot generation function
@@ -415,10 +493,6 @@ def generatePosPlots(Conf, PosFile):
 
     # POSITION ERRORS VS POSITION LIMITS
     # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
-    PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["SOD"],PosIdx["HPE"],PosIdx["VPE"],PosIdx["HPL"],PosIdx["VPL"],PosIdx["SOL"]])
-
     print( 'Plot Position Errors vs Position Limits vs Time...')
     
     # Configure plot and call plot generation function
@@ -426,10 +500,6 @@ def generatePosPlots(Conf, PosFile):
 
     # POSITION ERRORS vs TIME
     # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
-    PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["SOD"],PosIdx["HPE"],PosIdx["VPE"],PosIdx["SOL"]])
-
     print( 'Plot Position Errors vs Time...')
     
     # Configure plot and call plot generation function
@@ -437,10 +507,6 @@ def generatePosPlots(Conf, PosFile):
 
     # HORIZONTAL POSITION ERROR vs HDOP
     # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
-    PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["EPE"],PosIdx["NPE"],PosIdx["HDOP"],PosIdx["SOL"]])
-
     print( 'Plot Horizontal Position Error vs Horizontal Dilution Of Precision...')
     
     # Configure plot and call plot generation function
@@ -448,10 +514,6 @@ def generatePosPlots(Conf, PosFile):
 
     # SAFETY INDEX vs TIME
     # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
-    PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["SOD"],PosIdx["HSI"],PosIdx["VSI"],PosIdx["SOL"]])
-
     print( 'Plot Safety Index vs Time...')
     
     # Configure plot and call plot generation function
@@ -459,10 +521,6 @@ def generatePosPlots(Conf, PosFile):
 
     # HORIZONTAL STANFORD DIAGRAM
     # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
-    PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["HPE"],PosIdx["HPL"],PosIdx["SOL"]])
-
     print( 'Plot Horizontal Stanford Diagram...')
     
     # Configure plot and call plot generation function
@@ -470,11 +528,75 @@ def generatePosPlots(Conf, PosFile):
 
     # VERTICAL STANFORD DIAGRAM
     # ----------------------------------------------------------
-    # Read the cols we need from PosFile file
-    PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
-    usecols=[PosIdx["VPE"],PosIdx["VPL"],PosIdx["SOL"]])
-
     print( 'Plot Vertical Stanford Diagram...')
     
     # Configure plot and call plot generation function
-    plotVStanford(Conf, PosFile, PosData)
\ No newline at end of file
+    plotVStanford(Conf, PosFile, PosData)
+
+def generateStanfordPlots(Conf, PosFilesList):
+
+    # Purpose: generate the Stanford diagrams of a set of POS files
+    #          (e.g. all the receivers of the network), accumulating the
+    #          pixels histograms file by file
+
+    # Parameters
+    # ==========
+    # Conf: dict
+    #       Configuration dictionary
+    # PosFilesList: list
+    #               List containing the paths to the POS files
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Nothing to plot without POS files
+    if len(PosFilesList) == 0:
+        return
+
+    # Initialize pixels histograms
+    HorStanfordHist = initStanfordHist(HOR_STANFORD_LIM)
+    VerStanfordHist = initStanfordHist(VER_STANFORD_LIM)
+
+    # Loop over POS files
+    for PosFile in PosFilesList:
+        # Read the cols we need from PosFile file
+        PosData = read_csv(PosFile, delim_whitespace=True, skiprows=1, header=None,\
+        usecols=[PosIdx["HPE"],PosIdx["VPE"],PosIdx["HPL"],PosIdx["VPL"],PosIdx["SOL"]])
+
+        FilterCond = PosData[PosIdx["SOL"]] == 1
+
+        # Accumulate samples
+        updateStanfordHist(HorStanfordHist, PosData[PosIdx["HPE"]][FilterCond].to_numpy(),
+            PosData[PosIdx["HPL"]][FilterCond].to_numpy())
+        updateStanfordHist(VerStanfordHist, PosData[PosIdx["VPE"]][FilterCond].to_numpy(),
+            PosData[PosIdx["VPL"]][FilterCond].to_numpy())
+
+    # Name the figures after the receiver (ALL if several) and the
+    # range of days of the files
+    Rcvrs = sorted(set(os.path.basename(PosFile).split('_')[1] for PosFile in PosFilesList))
+    Dates = sorted(set(os.path.basename(PosFile).split('_')[2].split('.')[0] \
+        for PosFile in PosFilesList))
+    Rcvr = Rcvrs[0] if len(Rcvrs) == 1 else "ALL"
+    Date = Dates[0] if len(Dates) == 1 else Dates[0] + '-' + Dates[-1]
+    PosFile = os.path.join(os.path.dirname(PosFilesList[0]), \
+        "POS_%s_%s.dat" % (Rcvr, Date))
+
+    # Diagrams without samples (no PA solution in any file) are skipped
+    if HorStanfordHist["Counts"].sum() == 0:
+        sys.stderr.write("WARNING: No PA solution samples in the POS files, "\
+            "Horizontal Stanford Diagram skipped\n")
+    else:
+        print( 'Plot Horizontal Stanford Diagram of all the POS files...')
+
+        # Configure plot and call plot generation function
+        plotHStanford(Conf, PosFile, None, HorStanfordHist)
+
+    if VerStanfordHist["Counts"].sum() == 0:
+        sys.stderr.write("WARNING: No PA solution samples in the POS files, "\
+            "Vertical Stanford Diagram skipped\n")
+    else:
+        print( 'Plot Vertical Stanford Diagram of all the POS files...')
+
+        # Configure plot and call plot generation function
+        plotVStanford(Conf, PosFile, None, VerStanfordHist)
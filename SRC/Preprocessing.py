@@ -28,14 +28,77 @@ sys.path.insert(0, Common)
 from collections import OrderedDict
 from COMMON import GnssConstants as Const
 from InputOutput import RcvrIdx, ObsIdx, REJECTION_CAUSE
-from InputOutput import FLAG, VALUE, TH, CSNEPOCHS
 import numpy as np
 from COMMON.Iono import computeIonoMappingFunction
 
+# Columns of the satellite state table of the Preprocessing
+# (one row per satellite slot, see initPrevPreproObsInfo)
+#-----------------------------------------------------------------------
+L1_N_1 = 0                  # t-1 Carrier Phase in L1
+L1_N_2 = 1                  # t-2 Carrier Phase in L1
+L1_N_3 = 2                  # t-3 Carrier Phase in L1
+T_N_1 = 3                   # t-1 epoch
+T_N_2 = 4                   # t-2 epoch
+T_N_3 = 5                   # t-3 epoch
+CS_IDX = 6                  # Index of CS detector buffer
+RESET_HATCH = 7             # Flag to reset Hatch filter
+KSMOOTH = 8                 # Hatch filter K
+PREV_EPOCH = 9              # Previous SoD
+PREV_L1 = 10                # Previous L1
+PREV_SMOOTH_C1 = 11         # Previous Smoothed C1
+PREV_RANGE_RATE_L1 = 12     # Previous Code Rate
+PREV_PHASE_RATE_L1 = 13     # Previous Phase Rate
+PREV_GEOM_FREE = 14         # Previous Geometry-Free Observable
+PREV_GEOM_FREE_EPOCH = 15   # Previous Geometry-Free Observable epoch
+PREV_REJ = 16               # Previous Rejection flag
+GAP_COUNTER = 17            # Data gap counter
+CS_BUFF = 18                # First column of CS detector buffer
+
+# Number of satellite slots per constellation
+PreproConstels = OrderedDict({"G": Const.MAX_NUM_SATS_CONSTEL})
+
 # Preprocessing internal functions
 #-----------------------------------------------------------------------
 
 
+def initPrevPreproObsInfo(Conf):
+
+    # Purpose: initialize the satellite state table used by the
+    #          Preprocessing between consecutive epochs
+
+    # Parameters
+    # ==========
+    # Conf: dict
+    #         Configuration dictionary
+
+    # Returns
+    # =======
+    # PrevPreproObsInfo: dict
+    #         Satellite state table per constellation: a float array
+    #         with one row per satellite slot (PRN - 1) and one column
+    #         per state field (L1_N_1...GAP_COUNTER), followed by the
+    #         CS detector buffer
+    #         PrevPreproObsInfo["G"][0, KSMOOTH]
+
+    # Initialize output
+    PrevPreproObsInfo = OrderedDict({})
+
+    # Get number of columns of the table
+    NCols = CS_BUFF + Conf["PARAMS"].MinNcsEpochs
+
+    # Loop over constellations
+    for Constel, NSats in PreproConstels.items():
+        # All fields start at zero except the reset flag and the previous SoD
+        SatsPrev = np.zeros((NSats, NCols))
+        SatsPrev[:, RESET_HATCH] = 1
+        SatsPrev[:, PREV_EPOCH] = 86400
+
+        PrevPreproObsInfo[Constel] = SatsPrev
+
+    return PrevPreproObsInfo
+
+# End of initPrevPreproObsInfo()
+
 def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
     
     # Purpose: preprocess GNSS raw measurements from OBS file
@@ -70,8 +133,8 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
     #         ObsInfo[1][1] is the second field of the 
     #         second satellite
     # PrevPreproObsInfo: dict
-    #         Preprocessed observations for previous epoch per sat
-    #         PrevPreproObsInfo["G01"]["C1"]
+    #         Satellite state table per constellation, updated in place
+    #         PrevPreproObsInfo["G"][0, KSMOOTH]
 
     # Returns
     # =======
@@ -83,6 +146,9 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
     # Initialize output
     PreproObsInfo = OrderedDict({})
 
+    # Get the converted configuration parameters
+    Params = Conf["PARAMS"]
+
     # Loop over satellites
     for SatObs in ObsInfo:
         # Initialize output info
@@ -147,7 +213,7 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
     ChannelsElevation = 0.0
 
     # Get difference between number of satellites and number of channels
-    NChannelsRejections = len(PreproObsInfo) - int(Conf["NCHANNELS_GPS"])
+    NChannelsRejections = len(PreproObsInfo) - Params.NChannelsGps
 
     # If some satellites shall be rejected
     if NChannelsRejections > 0:
@@ -164,8 +230,15 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
         # Get Elevation cut
         ChannelsElevation = ElevationList[NChannelsRejections]
 
+    # Initialize satellite state rows of the current epoch
+    SatsPrev = OrderedDict({})
+
     # Loop over satellites
     for SatLabel, PreproObs in PreproObsInfo.items():
+        # Load satellite state row from the table as plain floats
+        SatPrev = PrevPreproObsInfo[SatLabel[0]][int(SatLabel[1:]) - 1].tolist()
+        SatsPrev[SatLabel] = SatPrev
+
         # If satellite shall be rejected due to number of channels limitation
         # --------------------------------------------------------------------------------------------------------------------
         if PreproObs["Elevation"] < ChannelsElevation:
@@ -183,25 +256,25 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
             PreproObs["RejectionCause"] = REJECTION_CAUSE["MASKANGLE"]
 
             # Store previous Rejection flag
-            PrevPreproObsInfo[SatLabel]["PrevRej"] = REJECTION_CAUSE["MASKANGLE"]
+            SatPrev[PREV_REJ] = REJECTION_CAUSE["MASKANGLE"]
 
             continue
 
         # If satellite shall be rejected due to C/N0 (only if activated in conf)
         # --------------------------------------------------------------------------------------------------------------------
-        if (Conf["MIN_CNR"][FLAG] == 1) and (PreproObs["S1"] < float(Conf["MIN_CNR"][VALUE])):
+        if Params.MinCnrOn and (PreproObs["S1"] < Params.MinCnr):
             # Lower status and indicate the rejection cause
             PreproObs["ValidL1"] = 0
             PreproObs["RejectionCause"] = REJECTION_CAUSE["MIN_CNR"]
 
             # Store previous Rejection flag
-            PrevPreproObsInfo[SatLabel]["PrevRej"] = REJECTION_CAUSE["MIN_CNR"]
+            SatPrev[PREV_REJ] = REJECTION_CAUSE["MIN_CNR"]
 
             continue
 
         # If satellite shall be rejected due to Pseudorange Out-of-range (only if activated in conf)
         # --------------------------------------------------------------------------------------------------------------------
-        if (Conf["MAX_PSR_OUTRNG"][FLAG] == 1) and (PreproObs["C1"] > float(Conf["MAX_PSR_OUTRNG"][VALUE])):
+        if Params.MaxPsrOutRngOn and (PreproObs["C1"] > Params.MaxPsrOutRng):
             # Lower status and indicate the rejection cause
             PreproObs["ValidL1"] = 0
             PreproObs["RejectionCause"] = REJECTION_CAUSE["MAX_PSR_OUTRNG"]
@@ -214,48 +287,48 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
         # Check data gaps
         # ----------------------------------------------------------
         # Compute gap between previous and current observation
-        DeltaT = Epoch - PrevPreproObsInfo[SatLabel]["PrevEpoch"]
+        DeltaT = Epoch - SatPrev[PREV_EPOCH]
         # If there is a gap
-        if (DeltaT > Conf["SAMPLING_RATE"]):
+        if (DeltaT > Params.SamplingRate):
             # Increment gap counter
-            PrevPreproObsInfo[SatLabel]["GapCounter"] = DeltaT
+            SatPrev[GAP_COUNTER] = DeltaT
 
             # If the length of the gap is larger than the allowed value
-            if PrevPreproObsInfo[SatLabel]["GapCounter"] > \
-                Conf["HATCH_GAP_TH"]:
+            if SatPrev[GAP_COUNTER] > \
+                Params.HatchGapTh:
                 # Raise Smoothing filter reset flag
-                PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 1
+                SatPrev[RESET_HATCH] = 1
 
                 # Reset gap counter
-                PrevPreproObsInfo[SatLabel]["GapCounter"] = 0
+                SatPrev[GAP_COUNTER] = 0
                 
                 # Indicate the rejection cause
                 # PreproObs["ValidL1"] = 0
-                if(PrevPreproObsInfo[SatLabel]["PrevRej"] != REJECTION_CAUSE["MASKANGLE"]):
+                if(SatPrev[PREV_REJ] != REJECTION_CAUSE["MASKANGLE"]):
                     PreproObs["RejectionCause"] = REJECTION_CAUSE["DATA_GAP"]
 
         else:
             # Reset gap counter
-            PrevPreproObsInfo[SatLabel]["GapCounter"] = 0
+            SatPrev[GAP_COUNTER] = 0
 
         # Cycle Slips (CS) detection
         # ----------------------------------------------------------
         # If CS detection is activated
-        if (not PrevPreproObsInfo[SatLabel]["ResetHatchFilter"]) and \
-            (Conf["MIN_NCS_TH"][FLAG] == 1):
+        if (not SatPrev[RESET_HATCH]) and \
+            Params.MinNcsOn:
             # Get current and previous phase measurements 
             CP_n = PreproObs["L1"]
-            CP_n_1 = PrevPreproObsInfo[SatLabel]["L1_n_1"]
-            CP_n_2 = PrevPreproObsInfo[SatLabel]["L1_n_2"]
-            CP_n_3 = PrevPreproObsInfo[SatLabel]["L1_n_3"]
+            CP_n_1 = SatPrev[L1_N_1]
+            CP_n_2 = SatPrev[L1_N_2]
+            CP_n_3 = SatPrev[L1_N_3]
 
             # Get Previous measurements' epochs deltas
-            dt1 = Epoch - PrevPreproObsInfo[SatLabel]["t_n_1"]
-            dt2 = PrevPreproObsInfo[SatLabel]["t_n_1"] - PrevPreproObsInfo[SatLabel]["t_n_2"]
-            dt3 = PrevPreproObsInfo[SatLabel]["t_n_2"] - PrevPreproObsInfo[SatLabel]["t_n_3"]
+            dt1 = Epoch - SatPrev[T_N_1]
+            dt2 = SatPrev[T_N_1] - SatPrev[T_N_2]
+            dt3 = SatPrev[T_N_2] - SatPrev[T_N_3]
 
             # If t-3 is available
-            if PrevPreproObsInfo[SatLabel]["t_n_3"] > 0:
+            if SatPrev[T_N_3] > 0:
                 # Compute residual coefficients
                 l1 = float((dt1+dt2)*(dt1+dt2+dt3))/(dt2*(dt2+dt3))
                 l2 = float(-dt1*(dt1+dt2+dt3))/(dt2*dt3)
@@ -270,10 +343,10 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
                 # print("CSRESIDUAL %5d %5s %15.3f %15.3f %10.4lf " % (Epoch, SatLabel, CP_n, CP_prop, CsResidual))
 
                 # Compute CS flag
-                CsFlag = CsResidual > float(Conf["MIN_NCS_TH"][TH])
+                CsFlag = CsResidual > Params.MinNcsTh
                 
                 # Update CS detector buffer
-                PrevPreproObsInfo[SatLabel]["CsBuff"][PrevPreproObsInfo[SatLabel]["CsIdx"]] = CsFlag
+                SatPrev[CS_BUFF + int(SatPrev[CS_IDX])] = CsFlag
 
                 # If residual is above the threshold
                 if CsFlag == True:
@@ -286,105 +359,105 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
 
                     # A CS is declared if it was detected Conf["MIN_NCS_TH"][CSNEPOCHS]
                     # consecutive times (recommended value is 3)
-                    if np.sum(PrevPreproObsInfo[SatLabel]["CsBuff"]) == Conf["MIN_NCS_TH"][CSNEPOCHS]:
+                    if sum(SatPrev[CS_BUFF:]) == Params.MinNcsEpochs:
                         # Indicate the rejection cause
                         PreproObs["RejectionCause"] = REJECTION_CAUSE["CYCLE_SLIP"]
 
                         # Upper reset smoothing flag
-                        PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 1
+                        SatPrev[RESET_HATCH] = 1
 
                     else:
                         # Update index of CS detector buffer
-                        PrevPreproObsInfo[SatLabel]["CsIdx"] = \
-                            (PrevPreproObsInfo[SatLabel]["CsIdx"] + 1) % \
-                                int(Conf["MIN_NCS_TH"][CSNEPOCHS])
+                        SatPrev[CS_IDX] = \
+                            (SatPrev[CS_IDX] + 1) % \
+                                Params.MinNcsEpochs
 
                         continue
 
-                    # End of if np.sum(PrevPreproObsInfo[SatLabel]["CsBuff"]) == Conf["MIN_NCS_TH"][CSNEPOCHS]:
+                    # End of if sum(SatPrev[CS_BUFF:]) == Params.MinNcsEpochs:
 
                 # End of if CsFlag == True:
 
-            # End of if PrevPreproObsInfo[SatLabel]["t_n_3"] > 0:
+            # End of if SatPrev[T_N_3] > 0:
 
             # Update index of CS detector buffer
-            PrevPreproObsInfo[SatLabel]["CsIdx"] = \
-                (PrevPreproObsInfo[SatLabel]["CsIdx"] + 1) % \
-                    int(Conf["MIN_NCS_TH"][CSNEPOCHS])
+            SatPrev[CS_IDX] = \
+                (SatPrev[CS_IDX] + 1) % \
+                    Params.MinNcsEpochs
 
             # If CS flag was not True in the Conf["MIN_NCS_TH"][CSNEPOCHS] previous epochs
-            if np.sum(PrevPreproObsInfo[SatLabel]["CsBuff"]) == 0:
+            if sum(SatPrev[CS_BUFF:]) == 0:
                 # Update previous values for next temporal iteration
-                PrevPreproObsInfo[SatLabel]["L1_n_1"] = CP_n
-                PrevPreproObsInfo[SatLabel]["L1_n_2"] = CP_n_1
-                PrevPreproObsInfo[SatLabel]["L1_n_3"] = CP_n_2
-                PrevPreproObsInfo[SatLabel]["t_n_3"] = PrevPreproObsInfo[SatLabel]["t_n_2"]
-                PrevPreproObsInfo[SatLabel]["t_n_2"] = PrevPreproObsInfo[SatLabel]["t_n_1"]
-                PrevPreproObsInfo[SatLabel]["t_n_1"] = Epoch
+                SatPrev[L1_N_1] = CP_n
+                SatPrev[L1_N_2] = CP_n_1
+                SatPrev[L1_N_3] = CP_n_2
+                SatPrev[T_N_3] = SatPrev[T_N_2]
+                SatPrev[T_N_2] = SatPrev[T_N_1]
+                SatPrev[T_N_1] = Epoch
 
-        # End of if (Conf["MIN_NCS_TH"][FLAG] == 1):
+        # End of if Params.MinNcsOn:
 
         # Hatch filter (re)initialization
         # ----------------------------------------------------------
         # If Hatch filter shall be reset
-        if PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] == 1:
+        if SatPrev[RESET_HATCH] == 1:
             # Reset gap counter
-            PrevPreproObsInfo[SatLabel]["GapCounter"] = 0
+            SatPrev[GAP_COUNTER] = 0
 
             # Ksmooth: Time index -> is equal to 1 at the beginning and is increasing linearly up
-            PrevPreproObsInfo[SatLabel]["Ksmooth"] = 1
+            SatPrev[KSMOOTH] = 1
 
             # Initialize smoothed values
             PreproObs["SmoothC1"] = PreproObs["C1"]
-            PrevPreproObsInfo[SatLabel]["PrevSmoothC1"] = \
+            SatPrev[PREV_SMOOTH_C1] = \
                 PreproObs["SmoothC1"]
 
             # Update previous Phase measurement
-            PrevPreproObsInfo[SatLabel]["PrevL1"] = PreproObs["L1"]
+            SatPrev[PREV_L1] = PreproObs["L1"]
 
             # Update previous epoch
-            PrevPreproObsInfo[SatLabel]["PrevEpoch"] = Epoch
+            SatPrev[PREV_EPOCH] = Epoch
 
             # Update previous range rate 
-            PrevPreproObsInfo[SatLabel]["PrevRangeRateL1"] = -9999.9
+            SatPrev[PREV_RANGE_RATE_L1] = -9999.9
 
             # Update previous phase rate 
-            PrevPreproObsInfo[SatLabel]["PrevPhaseRateL1"] = -9999.9
+            SatPrev[PREV_PHASE_RATE_L1] = -9999.9
 
             # Lower Smoothing filter reset flag
-            PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 0
+            SatPrev[RESET_HATCH] = 0
 
             # Update Smoothing status
             PreproObs["Status"] = 0
 
             # Reinitialize CS detection
-            PrevPreproObsInfo[SatLabel]["L1_n_1"] = 0.0
-            PrevPreproObsInfo[SatLabel]["L1_n_2"] = 0.0
-            PrevPreproObsInfo[SatLabel]["L1_n_3"] = 0.0
-            PrevPreproObsInfo[SatLabel]["t_n_1"] = 0.0
-            PrevPreproObsInfo[SatLabel]["t_n_2"] = 0.0
-            PrevPreproObsInfo[SatLabel]["t_n_3"] = 0.0
-            PrevPreproObsInfo[SatLabel]["CsBuff"] = [0] * int(Conf["MIN_NCS_TH"][CSNEPOCHS])
+            SatPrev[L1_N_1] = 0.0
+            SatPrev[L1_N_2] = 0.0
+            SatPrev[L1_N_3] = 0.0
+            SatPrev[T_N_1] = 0.0
+            SatPrev[T_N_2] = 0.0
+            SatPrev[T_N_3] = 0.0
+            SatPrev[CS_BUFF:] = [0.0] * Params.MinNcsEpochs
 
             continue
 
-        # End of if PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] == 1:
+        # End of if SatPrev[RESET_HATCH] == 1:
 
         # Code Carrier Smoothing with a Hatch Filter
         # ----------------------------------------------------------
         # Update Smoothing iterator
-        PrevPreproObsInfo[SatLabel]["Ksmooth"] = \
-                PrevPreproObsInfo[SatLabel]["Ksmooth"] + DeltaT
+        SatPrev[KSMOOTH] = \
+                SatPrev[KSMOOTH] + DeltaT
 
         # Smoothing Time computation
         # Smoothing Time is equal to the time index if the time index 
         # is lower than the Hatch filter and equal to the Hatch filter 
         # time constant otherwise
         SmoothingTime = \
-        (PrevPreproObsInfo[SatLabel]["Ksmooth"] <= Conf["HATCH_TIME"]) * \
-                        PrevPreproObsInfo[SatLabel]["Ksmooth"] + \
-        (PrevPreproObsInfo[SatLabel]["Ksmooth"] > Conf["HATCH_TIME"]) * \
-                        Conf["HATCH_TIME"]
+        (SatPrev[KSMOOTH] <= Params.HatchTime) * \
+                        SatPrev[KSMOOTH] + \
+        (SatPrev[KSMOOTH] > Params.HatchTime) * \
+                        Params.HatchTime
 
         # Weighting factor of the Smoothing filter
         Alpha = float(DeltaT) / \
@@ -394,44 +467,44 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
         PreproObs["SmoothC1"] = \
             Alpha * PreproObs["C1"] + \
             (1-Alpha) * \
-                (PrevPreproObsInfo[SatLabel]["PrevSmoothC1"] + \
-                    (PreproObs["L1"] - PrevPreproObsInfo[SatLabel]["PrevL1"]) * \
+                (SatPrev[PREV_SMOOTH_C1] + \
+                    (PreproObs["L1"] - SatPrev[PREV_L1]) * \
                         Const.GPS_L1_WAVE)
 
         # Check Phase Rate (only if activated in conf)
         # --------------------------------------------------------------------------------------------------------------------
         # Compute Phase Rate in meters/second
         PreproObs["PhaseRateL1"] = \
-            (PreproObs["L1"] - PrevPreproObsInfo[SatLabel]["PrevL1"]) / \
+            (PreproObs["L1"] - SatPrev[PREV_L1]) / \
                 DeltaT * Const.GPS_L1_WAVE
 
         # Check Phase Rate
-        if (Conf["MAX_PHASE_RATE"][FLAG] == 1) and \
-            (abs(PreproObs["PhaseRateL1"]) > Conf["MAX_PHASE_RATE"][VALUE]):
+        if Params.MaxPhaseRateOn and \
+            (abs(PreproObs["PhaseRateL1"]) > Params.MaxPhaseRate):
             # Lower status and indicate the rejection cause
             PreproObs["ValidL1"] = 0
             PreproObs["RejectionCause"] = REJECTION_CAUSE["MAX_PHASE_RATE"]
             # Raise Smoothing filter reset flag
-            PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 1
+            SatPrev[RESET_HATCH] = 1
             continue
 
         # If there are enough samples
-        if (PrevPreproObsInfo[SatLabel]["PrevPhaseRateL1"] != -9999.9):
+        if (SatPrev[PREV_PHASE_RATE_L1] != -9999.9):
             # Check Phase Rate Step (only if activated in conf)
             # ----------------------------------------------------------
             # Compute Phase Rate Step in meters/second^2
             PreproObs["PhaseRateStepL1"] = \
                 (PreproObs["PhaseRateL1"] - \
-                        PrevPreproObsInfo[SatLabel]["PrevPhaseRateL1"]) / DeltaT
+                        SatPrev[PREV_PHASE_RATE_L1]) / DeltaT
 
-            if (Conf["MAX_PHASE_RATE_STEP"][FLAG] == 1) and \
+            if Params.MaxPhaseRateStepOn and \
                     (abs(PreproObs["PhaseRateStepL1"]) > \
-                            Conf["MAX_PHASE_RATE_STEP"][VALUE]):
+                            Params.MaxPhaseRateStep):
                 # Lower status and indicate the rejection cause
                 PreproObs["ValidL1"] = 0
                 PreproObs["RejectionCause"] = REJECTION_CAUSE["MAX_PHASE_RATE_STEP"]
                 # Raise Smoothing filter reset flag
-                PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 1
+                SatPrev[RESET_HATCH] = 1
                 continue
 
         # Check Code Step (only if activated in conf)
@@ -439,42 +512,42 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
         # Compute Code Rate in meters/second
         PreproObs["RangeRateL1"] = \
             (PreproObs["SmoothC1"] - \
-                PrevPreproObsInfo[SatLabel]["PrevSmoothC1"]) / DeltaT
+                SatPrev[PREV_SMOOTH_C1]) / DeltaT
 
         # Check Code Rate
-        if (Conf["MAX_CODE_RATE"][FLAG] == 1) and \
-            (abs(PreproObs["RangeRateL1"]) > Conf["MAX_CODE_RATE"][VALUE]):
+        if Params.MaxCodeRateOn and \
+            (abs(PreproObs["RangeRateL1"]) > Params.MaxCodeRate):
             # Lower status and indicate the rejection cause
             PreproObs["ValidL1"] = 0
             PreproObs["RejectionCause"] = REJECTION_CAUSE["MAX_CODE_RATE"]
             # Raise Smoothing filter reset flag
-            PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 1
+            SatPrev[RESET_HATCH] = 1
             continue
         
         # If there are enough samples
-        if (PrevPreproObsInfo[SatLabel]["PrevRangeRateL1"] != -9999.9):
+        if (SatPrev[PREV_RANGE_RATE_L1] != -9999.9):
             # Compute Code Rate Step in meters/second^2
             PreproObs["RangeRateStepL1"] = \
                 (PreproObs["RangeRateL1"] - \
-                        PrevPreproObsInfo[SatLabel]["PrevRangeRateL1"]) / DeltaT
+                        SatPrev[PREV_RANGE_RATE_L1]) / DeltaT
 
             # Check Code Rate Step (only if activated in conf)
             # ----------------------------------------------------------
-            if (Conf["MAX_CODE_RATE_STEP"][FLAG] == 1) and \
+            if Params.MaxCodeRateStepOn and \
                     (abs(PreproObs["RangeRateStepL1"]) > \
-                            Conf["MAX_CODE_RATE_STEP"][VALUE]):
+                            Params.MaxCodeRateStep):
                 # Lower status and indicate the rejection cause
                 PreproObs["ValidL1"] = 0
                 PreproObs["RejectionCause"] = REJECTION_CAUSE["MAX_CODE_RATE_STEP"]
                 # Raise Smoothing filter reset flag
-                PrevPreproObsInfo[SatLabel]["ResetHatchFilter"] = 1
+                SatPrev[RESET_HATCH] = 1
                 continue
 
         # Set Status flag
         # ----------------------------------------------------------
         # 1 if convergence was reached, 0 otherwise
-        if(PrevPreproObsInfo[SatLabel]["Ksmooth"] > \
-            Conf["HATCH_STATE_F"] * Conf["HATCH_TIME"]) and \
+        if(SatPrev[KSMOOTH] > \
+            Params.HatchConvTime) and \
               (PreproObs["ValidL1"] != 0) :
             PreproObs["Status"] = 1
         else: 
@@ -482,17 +555,20 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
 
         # Update previous values
         # ----------------------------------------------------------
-        PrevPreproObsInfo[SatLabel]["PrevSmoothC1"] = PreproObs["SmoothC1"]
-        PrevPreproObsInfo[SatLabel]["PrevL1"] = PreproObs["L1"]
-        PrevPreproObsInfo[SatLabel]["PrevEpoch"] = Epoch
-        PrevPreproObsInfo[SatLabel]["PrevRangeRateL1"] = PreproObs["RangeRateL1"]
-        PrevPreproObsInfo[SatLabel]["PrevPhaseRateL1"] = PreproObs["PhaseRateL1"]
-        PrevPreproObsInfo[SatLabel]["PrevRej"] = PreproObs["RejectionCause"]
+        SatPrev[PREV_SMOOTH_C1] = PreproObs["SmoothC1"]
+        SatPrev[PREV_L1] = PreproObs["L1"]
+        SatPrev[PREV_EPOCH] = Epoch
+        SatPrev[PREV_RANGE_RATE_L1] = PreproObs["RangeRateL1"]
+        SatPrev[PREV_PHASE_RATE_L1] = PreproObs["PhaseRateL1"]
+        SatPrev[PREV_REJ] = PreproObs["RejectionCause"]
 
     # End of for SatLabel, PreproObs in PreproObsInfo.items():
 
     # Loop over satellites
     for SatLabel, PreproObs in PreproObsInfo.items():
+        # Get satellite state row
+        SatPrev = SatsPrev[SatLabel]
+
         # Compute Iono Mapping Function
         PreproObs["Mpp"] = computeIonoMappingFunction(PreproObs["Elevation"])
 
@@ -508,13 +584,13 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
             PreproObs["GeomFree"] =  PreproObs["GeomFree"] / (1 - Const.GPS_GAMMA_L1L2)
 
             # If valid Previous Geometry-Free Observable
-            if PrevPreproObsInfo[SatLabel]["PrevGeomFree"] > 0:
+            if SatPrev[PREV_GEOM_FREE] > 0:
                 # Compute the VTEC Rate
                 # ----------------------------------------------------------
                 # Compute the STEC Gradient
                 DeltaStec =  \
-                    (PreproObs["GeomFree"] - PrevPreproObsInfo[SatLabel]["PrevGeomFree"]) /\
-                        (PreproObs["Sod"] - PrevPreproObsInfo[SatLabel]["PrevGeomFreeEpoch"])
+                    (PreproObs["GeomFree"] - SatPrev[PREV_GEOM_FREE]) /\
+                        (PreproObs["Sod"] - SatPrev[PREV_GEOM_FREE_EPOCH])
 
                 # Compute VTEC Gradient
                 DeltaVtec =  DeltaStec / PreproObs["Mpp"]
@@ -529,8 +605,12 @@ def runPreProcMeas(Conf, Rcvr, ObsInfo, PrevPreproObsInfo):
                 PreproObs["iAATR"] =  PreproObs["VtecRate"] / PreproObs["Mpp"]
 
             # Update previous Geometry-Free Observable
-            PrevPreproObsInfo[SatLabel]["PrevGeomFree"] = PreproObs["GeomFree"]
-            PrevPreproObsInfo[SatLabel]["PrevGeomFreeEpoch"] = PreproObs["Sod"]
+            SatPrev[PREV_GEOM_FREE] = PreproObs["GeomFree"]
+            SatPrev[PREV_GEOM_FREE_EPOCH] = PreproObs["Sod"]
+
+    # Store satellite state rows back in the table
+    for SatLabel, SatPrev in SatsPrev.items():
+        PrevPreproObsInfo[SatLabel[0]][int(SatLabel[1:]) - 1] = SatPrev
 
     return PreproObsInfo
 
@@ -0,0 +1,609 @@
+#!/usr/bin/env python
+
+########################################################################
+# ScenGen.py:
+# This is the Synthetic Scenario Generator Module of PETRUS tool
+#
+#  Project:        PETRUS
+#  File:           ScenGen.py
+#  Date(YY/MM/DD): 01/02/21
+#
+#   Author: GNSS Academy
+#   Copyright 2021 GNSS Academy
+#
+# -----------------------------------------------------------------
+# Date       | Author             | Action
+# -----------------------------------------------------------------
+#
+# Usage:
+#   ScenGen.py $SCENARIO $NRCVR [$NDAYS [$NSATS [$SAMPLING_RATE [$NEVENTS [$NJOBS]]]]]
+#
+# Writes a synthetic scenario (CFG/petrus.cfg, INP/RCVR, INP/OBS,
+# OUT/SAT and OUT/LOS) to be processed by Petrus.py, for NRCVR
+# receivers (1), NDAYS days (1) from GEN_INI_DATE, a GPS constellation
+# of NSATS satellites (24) and observations every SAMPLING_RATE seconds
+# (1). NEVENTS (2) cycle slips and data gaps are injected per
+# receiver-day and NEVENTS UDREI>=12 periods per day. Receiver-days are
+# generated by NJOBS processes (1; 0: as many as available CPUs).
+# The generated files are reproducible (see GEN_SEED)
+########################################################################
+
+
+# Import External and Internal functions and Libraries
+#----------------------------------------------------------------------
+import sys, os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from COMMON import GnssConstants as Const
+from COMMON.Dates import convertYearMonthDay2JulianDay
+from COMMON.Dates import convertJulianDay2YearMonthDay
+from COMMON.Dates import convertYearMonthDay2Doy
+from InputOutput import readRcvr
+from InputOutput import RcvrIdx, ObsIdx, SatIdx, LosIdx
+
+# Generator parameters
+#----------------------------------------------------------------------
+GEN_INI_DATE = (2019, 1, 2)             # First day (Year, Month, Day)
+GEN_SEED = 1                            # Seed of the random generators
+GEN_CHUNK_EPOCHS = 3600                 # Epochs generated together
+GEN_LON_RANGE = (-10.0, 30.0)           # Receivers longitude range [deg]
+GEN_LAT_RANGE = (35.0, 60.0)            # Receivers latitude range [deg]
+GEN_RCVR_ALT = 100.0                    # Receivers altitude [m]
+GEN_RCVR_MASK = 5.0                     # Receivers mask angle [deg]
+GEN_RCVR_CLK = 30.0                     # Receivers clock bias [m]
+GEN_MIN_ELEV = 2.0                      # Minimum elevation of the observations [deg]
+GEN_ORBIT_RADIUS = 26560e3              # Satellites orbit radius [m]
+GEN_ORBIT_INC = 55.0                    # Satellites orbit inclination [deg]
+GEN_ORBIT_PLANES = 6                    # Number of orbital planes
+GEN_CODE_NOISE = 0.3                    # Code noise sigma [m]
+GEN_CYCLE_SLIP = 7                      # Size of the cycle slips [cycles]
+GEN_GAP_RANGE = (3, 20)                 # Data gaps duration range [epochs]
+GEN_UDRE_RANGE = (100, 300)             # UDREI>=12 periods duration range [epochs]
+
+# Configuration file
+#----------------------------------------------------------------------
+ConfTemplate = "\
+INI_DATE %s\n\
+END_DATE %s\n\
+SAMPLING_RATE %d\n\
+SBAS_MODE SBASL1\n\
+GEO 123\n\
+NAV_SOLUTION GPS\n\
+GPS_FREQ L1L2\n\
+GAL_FREQ E1E5A\n\
+PREPRO_OUT 1\n\
+CORR_OUT 1\n\
+SPVT_OUT 1\n\
+PERF_OUT 1\n\
+VPEHIST_OUT 1\n\
+RCVR_INFO STAT\n\
+RCVR_FILE RCVR.dat\n\
+NCHANNELS_GPS 12\n\
+NCHANNELS_GAL 12\n\
+RCVR_MASK 5\n\
+EQUIPMENT_CLASS 2\n\
+AIR_ACC_DESIG A\n\
+ELEV_NOISE_TH 20\n\
+SIGMA_NOISE_DF 0.5\n\
+MIN_CNR 1 20\n\
+MIN_NCS_TH 1 1 3\n\
+MAX_PSR_OUTRNG 1 330000000\n\
+MAX_CODE_RATE 1 1500\n\
+MAX_CODE_RATE_STEP 1 50\n\
+MAX_PHASE_RATE 1 1500\n\
+MAX_PHASE_RATE_STEP 1 50\n\
+HATCH_GAP_TH %d\n\
+HATCH_TIME 100\n\
+HATCH_STATE_F 1\n\
+HATCH_DIV_TH 10\n\
+HATCH_DIV_TIME 3\n\
+MAX_LSQ_ITER 100\n\
+SBAS_IONO_NPA 1\n\
+PDOP_MAX 10000\n\
+OS 1 1000 1000 1000 1000 1000 99 1 15 X\n\
+APVI 1 40 50 16 20 12 99 8e-6 15 X\n\
+LPV200 1 40 35 16 4 10 99 8e-6 15 X\n\
+CATI 0 40 10 16 4 10 99 8e-6 15 X\n\
+NPA 1 556 1000 1000 1000 1000 99 1 15 X\n\
+MARITIME 0 10 1000 1000 1000 1000 99 1 15 X\n\
+CUSTOM 0 40 50 1000 1000 1000 99 1 15 X\n"
+
+# Input files formats, per column
+#----------------------------------------------------------------------
+ObsColFmt = OrderedDict({"SOD": "%05d", "DOY": "%03d", "YEAR": "%04d",
+    "CONST": "%s", "PRN": "%02d", "ELEV": "%8.3f", "AZIM": "%8.3f",
+    "C1": "%15.3f", "L1": "%15.3f", "P2": "%15.3f", "L2": "%15.3f",
+    "S1": "%6.3f", "S2": "%6.3f"})
+
+SatColFmt = OrderedDict({"SOD": "%05d", "DOY": "%03d", "CONST": "%s",
+    "PRN": "%02d", "ELEV": "%8.3f", "AZIM": "%8.3f",
+    "SAT-X": "%15.3f", "SAT-Y": "%15.3f", "SAT-Z": "%15.3f",
+    "VEL-X": "%10.3f", "VEL-Y": "%10.3f", "VEL-Z": "%10.3f",
+    "SAT-CLK": "%12.3f", "TGD": "%8.3f", "FC": "%8.3f", "LTC-B": "%8.3f",
+    "LTC-X": "%8.3f", "LTC-Y": "%8.3f", "LTC-Z": "%8.3f", "UDREI": "%2d",
+    "SIGMAUDRE": "%8.3f", "DELTAUDRE": "%8.3f", "RSS": "%d",
+    "EPS-FC": "%8.3f", "EPS-RRC": "%8.3f", "EPS-LTC": "%8.3f",
+    "EPS-ER": "%8.3f"})
+
+LosColFmt = OrderedDict({"SOD": "%05d", "DOY": "%03d", "CONST": "%s",
+    "PRN": "%02d", "ELEV": "%8.3f", "AZIM": "%8.3f", "FLAG": "%d",
+    "IPPLON": "%9.4f", "IPPLAT": "%9.4f", "INTERP": "%d"})
+for Igp in ["NE", "NW", "SW", "SE"]:
+    LosColFmt["IGP_%s_LON" % Igp] = "%9.4f"
+    LosColFmt["IGP_%s_LAT" % Igp] = "%9.4f"
+    LosColFmt["GIVD_%s" % Igp] = "%8.3f"
+    LosColFmt["GIVE_%s" % Igp] = "%8.3f"
+LosColFmt["UISD"] = "%8.3f"
+LosColFmt["SUIRE"] = "%8.3f"
+LosColFmt["STD"] = "%8.3f"
+
+# Offsets of the IGPs of the LOS file to the SW corner of the 5x5 deg cell
+IgpOffsets = OrderedDict({"NE": (5, 5), "NW": (0, 5), "SW": (0, 0), "SE": (5, 0)})
+
+#----------------------------------------------------------------------
+# INTERNAL FUNCTIONS
+#----------------------------------------------------------------------
+
+def displayUsage():
+    sys.stderr.write("ERROR: Please provide path to SCENARIO and number of receivers "\
+        "[, days [, satellites [, sampling rate [, events [, jobs]]]]] as arguments\n")
+
+def getLineFmt(ColFmt, Idx):
+
+    # Purpose: get the line format of an input file, checking that the
+    #          columns follow its layout
+
+    # Parameters
+    # ==========
+    # ColFmt: dict
+    #         Format of each column
+    # Idx: dict
+    #      Columns of the input file
+
+    # Returns
+    # =======
+    # LineFmt: str
+    #          Line format
+
+    if list(ColFmt.keys()) != list(Idx.keys()):
+        sys.stderr.write("ERROR: Generator columns do not match the input files layout\n")
+        sys.exit(1)
+
+    return " ".join(ColFmt.values()) + "\n"
+
+# End of getLineFmt()
+
+def computeSatPositions(Sods, NSats):
+
+    # Purpose: compute the ECEF positions of the satellites of a circular
+    #          Walker constellation
+
+    # Parameters
+    # ==========
+    # Sods: np.array
+    #       Seconds of day
+    # NSats: int
+    #        Number of satellites (PRN 1 to NSats)
+
+    # Returns
+    # =======
+    # SatPos: np.array
+    #         ECEF positions [m], one row per epoch and satellite
+    #         SatPos[Epoch, Prn - 1, :]
+
+    # Mean motion
+    MeanMotion = np.sqrt(Const.MU_EARTH / GEN_ORBIT_RADIUS**3)
+
+    # Plane and slot of each satellite
+    SlotsPerPlane = -(-NSats // GEN_ORBIT_PLANES)
+    Plane = np.arange(NSats) // SlotsPerPlane
+    Slot = np.arange(NSats) % SlotsPerPlane
+    Raan = np.radians(Plane * 360.0 / GEN_ORBIT_PLANES)
+    Inc = np.radians(GEN_ORBIT_INC)
+
+    # Positions in the inertial frame
+    ArgLat = np.radians(Slot * 360.0 / SlotsPerPlane + Plane * 15.0) + \
+        MeanMotion * Sods[:, np.newaxis]
+    x = GEN_ORBIT_RADIUS * np.cos(ArgLat)
+    y = GEN_ORBIT_RADIUS * np.sin(ArgLat)
+    X = x * np.cos(Raan) - y * np.cos(Inc) * np.sin(Raan)
+    Y = x * np.sin(Raan) + y * np.cos(Inc) * np.cos(Raan)
+    Z = y * np.sin(Inc)
+
+    # Rotate to the Earth-fixed frame
+    Theta = (Const.OMEGA_EARTH * Sods)[:, np.newaxis]
+
+    return np.stack([X * np.cos(Theta) + Y * np.sin(Theta),
+        -X * np.sin(Theta) + Y * np.cos(Theta), Z], axis=2)
+
+# End of computeSatPositions()
+
+def computeElevAzim(SatPos, RcvrPos, Enu):
+
+    # Purpose: compute the elevation and azimuth of the satellites seen
+    #          from a receiver
+
+    # Parameters
+    # ==========
+    # SatPos: np.array
+    #         ECEF positions of the satellites [m] (see computeSatPositions)
+    # RcvrPos: np.array
+    #          ECEF position of the receiver [m]
+    # Enu: np.array
+    #      Local East, North and Up unit vectors of the receiver, per row
+
+    # Returns
+    # =======
+    # Range: np.array
+    #        Geometrical ranges [m]
+    # Elev: np.array
+    #       Elevations [deg]
+    # Azim: np.array
+    #       Azimuths [deg]
+
+    LosVector = SatPos - RcvrPos
+    Range = np.linalg.norm(LosVector, axis=-1)
+    LosEnu = (LosVector / Range[..., np.newaxis]) @ Enu.T
+    Elev = np.degrees(np.arcsin(LosEnu[..., 2]))
+    Azim = np.degrees(np.arctan2(LosEnu[..., 0], LosEnu[..., 1])) % 360
+
+    return Range, Elev, Azim
+
+# End of computeElevAzim()
+
+def generateRcvrFile(RcvrFile, NRcvr):
+
+    # Purpose: write the RCVR Positions file with receivers spread
+    #          randomly over the service area
+
+    # Parameters
+    # ==========
+    # RcvrFile: str
+    #           Path to RCVR Positions file
+    # NRcvr: int
+    #        Number of receivers
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Display Message
+    print("INFO: Creating file: %s..." % RcvrFile)
+
+    Rng = np.random.default_rng([GEN_SEED])
+    Lons = Rng.uniform(*GEN_LON_RANGE, NRcvr)
+    Lats = Rng.uniform(*GEN_LAT_RANGE, NRcvr)
+
+    with open(RcvrFile, 'w') as f:
+        f.write("#%s\n" % " ".join(list(RcvrIdx.keys())[:RcvrIdx["XYZ"]]))
+
+        for i in range(NRcvr):
+            # Acronym made of 4 letters: AAAA, AAAB...
+            Acr = "".join(chr(ord('A') + (i // 26**k) % 26) for k in range(3, -1, -1))
+            f.write("%s 1 %d %.4f %.4f %.1f %.1f 50\n" % \
+                (Acr, i + 1, Lons[i], Lats[i], GEN_RCVR_ALT, GEN_RCVR_MASK))
+
+# End of generateRcvrFile()
+
+def generateUdreEvents(Jd, Sods, NSats, NEvents):
+
+    # Purpose: get the periods of the day when satellites are flagged
+    #          with UDREI>=12 (common to all the receivers)
+
+    # Parameters
+    # ==========
+    # Jd: int
+    #     Julian Day
+    # Sods: np.array
+    #       Seconds of day of the epochs
+    # NSats: int
+    #        Number of satellites
+    # NEvents: int
+    #          Number of UDREI>=12 periods
+
+    # Returns
+    # =======
+    # UdreEvents: list
+    #             (Start SoD, End SoD, PRN, UDREI) of each period
+
+    Rng = np.random.default_rng([GEN_SEED, Jd])
+    SamplingRate = Sods[1] - Sods[0] if len(Sods) > 1 else 1
+
+    UdreEvents = []
+    for Event in range(NEvents):
+        Start = Rng.choice(Sods)
+        End = Start + Rng.integers(*GEN_UDRE_RANGE) * SamplingRate
+        UdreEvents.append((Start, End, Rng.integers(1, NSats + 1), Rng.integers(12, 16)))
+
+    return UdreEvents
+
+# End of generateUdreEvents()
+
+def generateRcvrDay(Scen, Rcvr, RcvrInfo, Jd, Sods, NSats, NEvents, UdreEvents):
+
+    # Purpose: write the OBS, SAT and LOS files of a receiver and a day,
+    #          injecting cycle slips and data gaps
+
+    # Parameters
+    # ==========
+    # Scen: str
+    #       Path to the scenario
+    # Rcvr: str
+    #       Receiver acronym
+    # RcvrInfo: list
+    #           Receiver information, as read by readRcvr
+    # Jd: int
+    #     Julian Day
+    # Sods: np.array
+    #       Seconds of day of the epochs
+    # NSats: int
+    #        Number of satellites
+    # NEvents: int
+    #          Number of cycle slips and data gaps
+    # UdreEvents: list
+    #             UDREI>=12 periods (see generateUdreEvents)
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Get Year and DoY
+    Year, Month, Day = convertJulianDay2YearMonthDay(Jd)
+    Doy = convertYearMonthDay2Doy(Year, Month, Day)
+    FileSuffix = "%s_Y%02dD%03d.dat" % (Rcvr, Year % 100, Doy)
+
+    # Receiver position and local ENU axes
+    Lon = RcvrInfo[RcvrIdx["LON"]]
+    Lat = RcvrInfo[RcvrIdx["LAT"]]
+    RcvrPos = np.array(RcvrInfo[RcvrIdx["XYZ"]])
+    LonRad, LatRad = np.radians(Lon), np.radians(Lat)
+    Enu = np.array([[-np.sin(LonRad), np.cos(LonRad), 0],
+        [-np.sin(LatRad) * np.cos(LonRad), -np.sin(LatRad) * np.sin(LonRad), np.cos(LatRad)],
+        [np.cos(LatRad) * np.cos(LonRad), np.cos(LatRad) * np.sin(LonRad), np.sin(LatRad)]])
+
+    # Random generator of the receiver-day
+    Rng = np.random.default_rng([GEN_SEED, Jd, int(RcvrInfo[RcvrIdx["ID"]])])
+
+    # Carrier phase ambiguities per PRN
+    Ambiguities = Rng.integers(-1000000, 1000000, NSats)
+
+    # Cycle slips: (SoD, PRN) of a satellite in view
+    Slips = []
+    for Event in range(NEvents):
+        SlipSod = Rng.choice(Sods)
+        Range, Elev, Azim = computeElevAzim(computeSatPositions(np.array([SlipSod]), NSats)[0],
+            RcvrPos, Enu)
+        Visible = np.flatnonzero(Elev >= GEN_RCVR_MASK)
+        if len(Visible) > 0:
+            Slips.append((SlipSod, Rng.choice(Visible) + 1))
+
+    # Data gaps: (Start SoD, End SoD)
+    SamplingRate = Sods[1] - Sods[0] if len(Sods) > 1 else 1
+    Gaps = []
+    for Event in range(NEvents):
+        Start = Rng.choice(Sods)
+        Gaps.append((Start, Start + Rng.integers(*GEN_GAP_RANGE) * SamplingRate))
+
+    # Line formats
+    ObsLineFmt = getLineFmt(ObsColFmt, ObsIdx)
+    SatLineFmt = getLineFmt(SatColFmt, SatIdx)
+    LosLineFmt = getLineFmt(LosColFmt, LosIdx)
+
+    # Create output files
+    Files = OrderedDict({})
+    for Name, Dir, Idx in [("OBS", "/INP/OBS/", ObsIdx), ("SAT", "/OUT/SAT/", SatIdx), \
+        ("LOS", "/OUT/LOS/", LosIdx)]:
+        Path = Scen + Dir + Name + "_" + FileSuffix
+        print("INFO: Creating file: %s..." % Path)
+        Files[Name] = open(Path, 'w')
+        Files[Name].write("# %s\n" % " ".join(Idx.keys()))
+
+    # Loop over chunks of epochs
+    for Chunk in range(0, len(Sods), GEN_CHUNK_EPOCHS):
+        ChunkSods = Sods[Chunk:Chunk + GEN_CHUNK_EPOCHS]
+
+        # Satellite positions and velocities
+        SatPos = computeSatPositions(ChunkSods, NSats)
+        SatVel = computeSatPositions(ChunkSods + 1, NSats) - SatPos
+
+        # Geometry
+        Range, Elev, Azim = computeElevAzim(SatPos, RcvrPos, Enu)
+
+        # Visible satellites out of data gaps
+        Valid = Elev >= GEN_MIN_ELEV
+        for Start, End in Gaps:
+            Valid[(ChunkSods >= Start) & (ChunkSods < End), :] = False
+        EpochIdx, SatIdxs = np.nonzero(Valid)
+        NRows = len(EpochIdx)
+
+        # Get the values of the visible satellites
+        Sod = ChunkSods[EpochIdx]
+        Prn = SatIdxs + 1
+        Elev = Elev[EpochIdx, SatIdxs]
+        Azim = Azim[EpochIdx, SatIdxs]
+        Pos = SatPos[EpochIdx, SatIdxs]
+        Vel = SatVel[EpochIdx, SatIdxs]
+
+        # Satellite clock and SBAS corrections
+        Clk = 100.0 * np.sin(Prn + Sod / 5000.0)
+        Tgd = 1.0
+        Fc = 0.5 * np.cos(Prn)
+        LtcB = 0.2
+        Ltc = np.array([0.3, -0.2, 0.1])
+        Udrei = np.full(NRows, 11)
+        for Start, End, UdrePrn, UdreValue in UdreEvents:
+            Udrei[(Sod >= Start) & (Sod < End) & (Prn == UdrePrn)] = UdreValue
+
+        # Ionosphere: pierce point and surrounding IGPs
+        Mpp = (1.0 - ((Const.EARTH_RADIUS * np.cos(np.radians(Elev))) / \
+            (Const.EARTH_RADIUS + Const.IONO_HEIGHT))**2)**(-0.5)
+        IppLon = Lon + (90 - Elev) / 10.0 * np.sin(np.radians(Azim))
+        IppLat = Lat + (90 - Elev) / 10.0 * np.cos(np.radians(Azim))
+        SwLon = np.floor(IppLon / 5) * 5
+        SwLat = np.floor(IppLat / 5) * 5
+        Givd = 2.0 + 0.5 * np.sin(Sod / 3000.0)
+        Uisd = Mpp * Givd
+
+        # Troposphere
+        Std = 2.4 / np.sin(np.radians(np.maximum(Elev, 5)))
+
+        # Measurements, with code noise and cycle slips
+        Dtr = -2 * np.sum(Pos * Vel, axis=1) / Const.SPEED_OF_LIGHT
+        SatClk = Clk - Tgd + Dtr + Fc + LtcB
+        CorrRange = np.linalg.norm(Pos + Ltc - RcvrPos, axis=1)
+        Slip = np.zeros(NRows)
+        for SlipSod, SlipPrn in Slips:
+            Slip = Slip + GEN_CYCLE_SLIP * ((Sod >= SlipSod) & (Prn == SlipPrn))
+        C1 = CorrRange - SatClk + Uisd + Std + GEN_RCVR_CLK + Rng.normal(0, GEN_CODE_NOISE, NRows)
+        L1 = (CorrRange - SatClk - Uisd + Std + GEN_RCVR_CLK) / Const.GPS_L1_WAVE + \
+            Ambiguities[Prn - 1] + Slip
+        L2 = (CorrRange - SatClk - Uisd * Const.GPS_GAMMA_L1L2 + Std + GEN_RCVR_CLK) / \
+            Const.GPS_L2_WAVE + Ambiguities[Prn - 1]
+
+        # Columns of each file
+        Cols = OrderedDict({})
+        Cols["OBS"] = {"SOD": Sod, "DOY": Doy, "YEAR": Year, "CONST": "G", "PRN": Prn,
+            "ELEV": Elev, "AZIM": Azim, "C1": C1, "L1": L1, "P2": C1, "L2": L2,
+            "S1": 45.0, "S2": 40.0}
+        Cols["SAT"] = {"SOD": Sod, "DOY": Doy, "CONST": "G", "PRN": Prn,
+            "ELEV": Elev, "AZIM": Azim,
+            "SAT-X": Pos[:, 0], "SAT-Y": Pos[:, 1], "SAT-Z": Pos[:, 2],
+            "VEL-X": Vel[:, 0], "VEL-Y": Vel[:, 1], "VEL-Z": Vel[:, 2],
+            "SAT-CLK": Clk, "TGD": Tgd, "FC": Fc, "LTC-B": LtcB,
+            "LTC-X": Ltc[0], "LTC-Y": Ltc[1], "LTC-Z": Ltc[2], "UDREI": Udrei,
+            "SIGMAUDRE": 0.75, "DELTAUDRE": 1.0, "RSS": Prn % 2,
+            "EPS-FC": 0.1, "EPS-RRC": 0.05, "EPS-LTC": 0.02, "EPS-ER": 0.01}
+        Cols["LOS"] = {"SOD": Sod, "DOY": Doy, "CONST": "G", "PRN": Prn,
+            "ELEV": Elev, "AZIM": Azim, "FLAG": 1,
+            "IPPLON": IppLon, "IPPLAT": IppLat, "INTERP": 0,
+            "UISD": Uisd, "SUIRE": 1.0, "STD": Std}
+        for Igp, (DLon, DLat) in IgpOffsets.items():
+            Cols["LOS"]["IGP_%s_LON" % Igp] = SwLon + DLon
+            Cols["LOS"]["IGP_%s_LAT" % Igp] = SwLat + DLat
+            Cols["LOS"]["GIVD_%s" % Igp] = Givd + 0.1 * DLon - 0.05 * DLat
+            Cols["LOS"]["GIVE_%s" % Igp] = 1.2 + 0.01 * DLat
+
+        # Write the lines of each file
+        for (Name, f), LineFmt, Idx in zip(Files.items(), \
+            [ObsLineFmt, SatLineFmt, LosLineFmt], [ObsIdx, SatIdx, LosIdx]):
+            Values = [np.broadcast_to(Cols[Name][Col], (NRows,)).tolist() for Col in Idx]
+            f.write("".join([LineFmt % Row for Row in zip(*Values)]))
+
+    # End of for Chunk in range(0, len(Sods), GEN_CHUNK_EPOCHS):
+
+    # Close output files
+    for f in Files.values():
+        f.close()
+
+# End of generateRcvrDay()
+
+def generateScenario(Scen, NRcvr, NDays, NSats, SamplingRate, NEvents, NJobs):
+    # Purpose: write a synthetic scenario to be processed by Petrus.py
+
+    # Parameters
+    # ==========
+    # Scen: str
+    #         Scenario directory
+    # NRcvr: int
+    #         Number of receivers
+    # NDays: int
+    #         Number of days from GEN_INI_DATE
+    # NSats: int
+    #         Number of GPS satellites
+    # SamplingRate: int
+    #         Observations sampling rate [s]
+    # NEvents: int
+    #         Number of cycle slips and data gaps per receiver-day and
+    #         of UDREI>=12 periods per day
+    # NJobs: int
+    #         Number of processes (0: as many as available CPUs)
+
+    # Returns
+    # =======
+    # Nothing
+
+    # Create scenario directories
+    for Dir in ["/CFG", "/INP/RCVR", "/INP/OBS", "/OUT/SAT", "/OUT/LOS"]:
+        os.makedirs(Scen + Dir, exist_ok=True)
+
+    # Get the first and last days
+    IniDate = GEN_INI_DATE
+    EndDate = convertJulianDay2YearMonthDay( \
+        convertYearMonthDay2JulianDay(*GEN_INI_DATE) + NDays - 1)
+
+    # Get the Julian Days as processConf does, for the files to be
+    # named as Petrus.py reads them
+    IniJd = int(round(convertYearMonthDay2JulianDay(*IniDate)))
+    EndJd = int(round(convertYearMonthDay2JulianDay(*EndDate)))
+
+    # Write configuration file, the Hatch filter being reset after
+    # gaps longer than 2 epochs
+    ConfFile = Scen + '/CFG/petrus.cfg'
+    print("INFO: Creating file: %s..." % ConfFile)
+    with open(ConfFile, 'w') as f:
+        f.write(ConfTemplate % ("%02d/%02d/%04d" % IniDate[::-1],
+            "%02d/%02d/%04d" % EndDate[::-1], SamplingRate,
+            min(max(6, 2 * SamplingRate), 3600)))
+
+    # Write RCVR Positions file and read it back
+    RcvrFile = Scen + '/INP/RCVR/RCVR.dat'
+    generateRcvrFile(RcvrFile, NRcvr)
+    RcvrInfo = readRcvr(RcvrFile)
+
+    # Epochs of each day
+    Sods = np.arange(0, Const.S_IN_D, SamplingRate)
+
+    # Loop over days and receivers, sending each receiver-day to a pool
+    # of processes
+    with ProcessPoolExecutor(max_workers = NJobs if NJobs > 0 else os.cpu_count()) as Pool:
+        Jobs = []
+        for Jd in range(IniJd, EndJd + 1):
+            UdreEvents = generateUdreEvents(Jd, Sods, NSats, NEvents)
+
+            for Rcvr in RcvrInfo.keys():
+                Jobs.append(Pool.submit(generateRcvrDay, \
+                    Scen, Rcvr, RcvrInfo[Rcvr], Jd, Sods, NSats, NEvents, UdreEvents))
+
+        # Wait for the jobs, raising their errors
+        for Job in Jobs:
+            Job.result()
+
+# End of generateScenario()
+
+#######################################################
+# MAIN BODY
+#######################################################
+
+if __name__ == "__main__":
+    # Check InputOutput Arguments
+    if len(sys.argv) < 3 or len(sys.argv) > 8:
+        displayUsage()
+        sys.exit()
+
+    # Extract the arguments
+    Scen = sys.argv[1]
+    NRcvr = int(sys.argv[2])
+    NDays = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    NSats = int(sys.argv[4]) if len(sys.argv) > 4 else 24
+    SamplingRate = int(sys.argv[5]) if len(sys.argv) > 5 else 1
+    NEvents = int(sys.argv[6]) if len(sys.argv) > 6 else 2
+    NJobs = int(sys.argv[7]) if len(sys.argv) > 7 else 1
+
+    # Check the arguments
+    if not 1 <= NRcvr <= Const.MAX_NUM_RCVR or not 1 <= NSats <= Const.MAX_NUM_SATS_CONSTEL or \
+        NDays < 1 or not 1 <= SamplingRate <= Const.S_IN_D or NEvents < 0 or \
+        not 0 <= NJobs <= Const.MAX_NUM_JOBS:
+        sys.stderr.write("ERROR: Generator arguments out of range: %d receivers [1, %d], "\
+            "%d days [>=1], %d satellites [1, %d], %d s [1, %d], %d events [>=0], "\
+            "%d jobs [0, %d]\n" % \
+            (NRcvr, Const.MAX_NUM_RCVR, NDays, NSats, Const.MAX_NUM_SATS_CONSTEL,
+            SamplingRate, Const.S_IN_D, NEvents, NJobs, Const.MAX_NUM_JOBS))
+        sys.exit(1)
+
+    # Generate the scenario
+    generateScenario(Scen, NRcvr, NDays, NSats, SamplingRate, NEvents, NJobs)
+
+#######################################################
+# End of ScenGen.py
+#######################################################
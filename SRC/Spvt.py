@@ -31,7 +31,7 @@ from InputOutput import RcvrIdx, ObsIdx, CorrIdx, REJECTION_CAUSE
 from InputOutput import FLAG, VALUE, TH, CSNEPOCHS
 import numpy as np
 from COMMON.Iono import computeIonoMappingFunction
-from COMMON.Wlsq import wlsq
+from COMMON.Wlsq import wlsq, wlsqBlock
 
 # Spvt internal functions
 #-----------------------------------------------------------------------
@@ -46,9 +46,43 @@ def computeGRow(SatCorrInfo):
     return [x, y, z, 1]
 
 
+def computeNormalInverse(GMatrix, Weights):
+
+    # Invert the normal matrix G'WG through its Cholesky factor L:
+    # inv(G'WG) = inv(L)' inv(L)
+    # Works on a single G Matrix (NSats x 4) or on a stack of them
+    # (NEpochs x NSats x 4), with Weights shaped accordingly
+    GMatrixT = np.swapaxes(GMatrix, -1, -2)
+    NMatrix = np.matmul(GMatrixT * Weights[..., np.newaxis, :], GMatrix)
+    try:
+        LInv = np.linalg.inv(np.linalg.cholesky(NMatrix))
+
+    except np.linalg.LinAlgError:
+        # Near-singular geometry: the normal matrix is numerically not
+        # positive definite, so invert each matrix directly
+        return invertNormalMatrix(NMatrix)
+
+    return np.matmul(np.swapaxes(LInv, -1, -2), LInv)
+
+
+def invertNormalMatrix(NMatrix):
+
+    # Invert a normal matrix (4 x 4) or a stack of them one by one.
+    # Singular matrices are set to infinity, so that their DOPs are
+    # rejected by the PDOP threshold and no solution is computed
+    if NMatrix.ndim > 2:
+        return np.array([invertNormalMatrix(Matrix) for Matrix in NMatrix]).reshape(NMatrix.shape)
+
+    try:
+        return np.linalg.inv(NMatrix)
+
+    except np.linalg.LinAlgError:
+        return np.full(NMatrix.shape, np.inf)
+
+
 def computeDop(GMatrix, PosInfo):
     # Compute the DOP matrix
-    QMatrix = np.linalg.inv(np.dot(GMatrix.T, GMatrix))
+    QMatrix = computeNormalInverse(GMatrix, np.ones(len(GMatrix)))
     QDiag = np.diag(QMatrix)
 
     # Compute the DOPS
@@ -58,19 +92,18 @@ def computeDop(GMatrix, PosInfo):
     PosInfo["Tdop"] = np.sqrt(QDiag[3])
 
 
-def computeD(GMatrix, WMatrix):
+def computeD(GMatrix, Weights):
 
-    return np.linalg.inv(np.linalg.multi_dot([GMatrix.T, WMatrix, GMatrix]))
+    return computeNormalInverse(GMatrix, np.array(Weights))
 
 
-def computeS(GMatrix, WMatrix):
+def computeS(DMatrix, GMatrix, Weights):
 
-    return np.linalg.multi_dot([np.linalg.inv(np.linalg.multi_dot([GMatrix.T, WMatrix, GMatrix])), GMatrix.T, WMatrix])
+    return np.dot(DMatrix, GMatrix.T * Weights)
 
 
-def computePL(GMatrix, WMatrix, PosInfo):
+def computePL(DMatrix, PosInfo):
 
-    DMatrix = computeD(GMatrix, WMatrix)
     DDiag1 = np.diag(DMatrix)
     DDiag2 = np.diag(DMatrix, k = 1)
 
@@ -81,7 +114,6 @@ def computePL(GMatrix, WMatrix, PosInfo):
 def computeSpvtSolution(Conf, RcvrInfo, CorrInfo):
     
     GMatrix = []
-    WMatrix = []
     Weights = []
     
     PosInfo = OrderedDict({})
@@ -141,20 +173,20 @@ def computeSpvtSolution(Conf, RcvrInfo, CorrInfo):
         # Visible satellites
         PosInfo["NumSatVis"] = len(CorrInfo)
 
-        # Build Weight Matrix
-        WMatrix = np.diag(Weights)
-
         if PosInfo["NumSatSol"] >= Const.MIN_NUM_SATS_PVT:
 
                 computeDop(GMatrix, PosInfo)
 
-                if PosInfo["Pdop"] < float(Conf["PDOP_MAX"]):
+                if PosInfo["Pdop"] < Conf["PARAMS"].PdopMax:
+                    # Invert the weighted normal matrix once for S matrix
+                    # and protection levels
+                    DMatrix = computeD(GMatrix, Weights)
                     # Compute S matrix
-                    SMatrix = computeS(GMatrix, WMatrix)
+                    SMatrix = computeS(DMatrix, GMatrix, Weights)
                     # Call WLSQ function
                     wlsq(Conf, CorrInfo, PosInfo, SMatrix)
                     # Compute protection levels
-                    computePL(GMatrix, WMatrix, PosInfo)
+                    computePL(DMatrix, PosInfo)
                     # Compute safety indexes
                     PosInfo["Hsi"] = PosInfo["Hpe"] / PosInfo["Hpl"]
                     PosInfo["Vsi"] = PosInfo["Vpe"] / PosInfo["Vpl"]
@@ -168,3 +200,173 @@ def computeSpvtSolution(Conf, RcvrInfo, CorrInfo):
             PosInfo["Sol"] = 0
     
     return PosInfo
+
+
+def computeSpvtSolutionBlock(Conf, RcvrInfo, CorrInfoList):
+
+    # Purpose: compute the SPVT solutions of a block of epochs at once.
+    #          Satellites used in the solution are padded to the maximum
+    #          number of satellites in the block, so that DOPs, WLSQ
+    #          solution, protection levels and safety indexes are
+    #          obtained with stacked (NEpochs x 4 x 4) solves
+
+    # Parameters
+    # ==========
+    # Conf: dict
+    #         Configuration dictionary
+    # RcvrInfo: list
+    #         Receiver information: position, masking angle...
+    # CorrInfoList: list
+    #         Corrected measurements of each epoch, as given by
+    #         runCorrectMeas
+
+    # Returns
+    # =======
+    # PosInfoList: list
+    #         Position information of each epoch, as given by
+    #         computeSpvtSolution
+
+    # Initialize output
+    PosInfoList = [OrderedDict({}) for CorrInfo in CorrInfoList]
+
+    # Get the epochs with corrected measurements
+    Epochs = [Epoch for Epoch, CorrInfo in enumerate(CorrInfoList) if len(CorrInfo) > 0]
+    NEpochs = len(Epochs)
+    if NEpochs == 0:
+        return PosInfoList
+
+    # Get the satellites available for PA in each epoch
+    SatsRows = [[[SatCorrInfo["Elevation"], SatCorrInfo["Azimuth"],
+        SatCorrInfo["SigmaUere"], SatCorrInfo["SatX"], SatCorrInfo["SatY"],
+        SatCorrInfo["SatZ"], SatCorrInfo["CorrPsr"]] \
+            for SatCorrInfo in CorrInfoList[Epoch].values() if SatCorrInfo["Flag"] == 1] \
+                for Epoch in Epochs]
+
+    # Build padded satellite table and mask
+    NumSatSol = np.array([len(Rows) for Rows in SatsRows])
+    MaxSats = max(NumSatSol.max(), 4)
+    SatsTable = np.zeros((NEpochs, MaxSats, 7))
+    SatsTable[:, :, 2] = 1.0
+    for Idx, Rows in enumerate(SatsRows):
+        if len(Rows) > 0:
+            SatsTable[Idx, :len(Rows)] = Rows
+    Mask = np.arange(MaxSats) < NumSatSol[:, np.newaxis]
+
+    # Build G Matrices, padded rows are zero
+    Elev = np.deg2rad(SatsTable[:, :, 0])
+    Azim = np.deg2rad(SatsTable[:, :, 1])
+    GMatrix = np.zeros((NEpochs, MaxSats, 4))
+    GMatrix[:, :, 0] = - (np.cos(Elev) * np.sin(Azim))
+    GMatrix[:, :, 1] = - (np.cos(Elev) * np.cos(Azim))
+    GMatrix[:, :, 2] = - (np.sin(Elev))
+    GMatrix[:, :, 3] = 1
+    GMatrix[~Mask] = 0.0
+
+    # Build weights, padded weights are zero
+    Weights = np.where(Mask, 1 / np.float_power(SatsTable[:, :, 2], 2), 0.0)
+
+    # Epochs with enough satellites; the rest get an identity
+    # G Matrix to keep the stacked factorizations defined
+    Valid = NumSatSol >= Const.MIN_NUM_SATS_PVT
+    GMatrix[~Valid] = 0.0
+    GMatrix[~Valid, :4, :] = np.identity(4)
+    Weights[~Valid] = 0.0
+    Weights[~Valid, :4] = 1.0
+    DopWeights = np.where(Valid[:, np.newaxis], Mask, Weights)
+
+    # Compute the DOPs
+    QDiag = np.diagonal(computeNormalInverse(GMatrix, DopWeights), axis1=1, axis2=2)
+    Hdop = np.sqrt(QDiag[:, 0] + QDiag[:, 1])
+    Vdop = np.sqrt(QDiag[:, 2])
+    Pdop = np.sqrt(QDiag[:, 0] + QDiag[:, 1] + QDiag[:, 2])
+    Tdop = np.sqrt(QDiag[:, 3])
+
+    # Epochs to be solved
+    Solve = Valid & (Pdop < Conf["PARAMS"].PdopMax)
+
+    # Invert the weighted normal matrices once for S matrices and
+    # protection levels, only for the epochs to be solved; the rest
+    # keep an identity D Matrix
+    DMatrix = np.tile(np.identity(4), (NEpochs, 1, 1))
+    if Solve.any():
+        DMatrix[Solve] = computeNormalInverse(GMatrix[Solve], Weights[Solve])
+    SMatrix = np.matmul(DMatrix, np.swapaxes(GMatrix, 1, 2) * Weights[:, np.newaxis, :])
+
+    # Call WLSQ function
+    RcvrLlh = np.tile([float(RcvrInfo[RcvrIdx["LON"]]), float(RcvrInfo[RcvrIdx["LAT"]]),
+        float(RcvrInfo[RcvrIdx["ALT"]])], (NEpochs, 1))
+    Lon, Lat, Alt, Clk, Epe, Npe, Hpe, Vpe, Iter = \
+        wlsqBlock(Conf, SatsTable[:, :, 3:6], SatsTable[:, :, 6], RcvrLlh, SMatrix, Solve)
+    Sol = (Solve & (Iter < Conf["PARAMS"].MaxLsqIter)).astype(int)
+
+    # Compute protection levels
+    DDiag1 = np.diagonal(DMatrix, axis1=1, axis2=2)
+    DDiag2 = DMatrix[:, 0, 1]
+    Hpl = np.sqrt(((DDiag1[:, 0] + DDiag1[:, 1])/2) + np.sqrt(np.float_power((DDiag1[:, 0] - DDiag1[:, 1])/2, 2) + \
+        np.float_power(DDiag2, 2))) * Const.MOPS_KH_PA
+    Vpl = np.sqrt(DDiag1[:, 2]) * Const.MOPS_KV_PA
+
+    # Compute safety indexes
+    Hsi = Hpe / Hpl
+    Vsi = Vpe / Vpl
+
+    # Build output per epoch
+    for Idx, Epoch in enumerate(Epochs):
+        CorrInfo = CorrInfoList[Epoch]
+        FirstSat = next(iter(CorrInfo.values()))
+
+        PosInfo = {
+                "Sod": FirstSat["Sod"], # Second of day
+                "Doy": FirstSat["Doy"], # Day of year
+                "Lon": RcvrLlh[Idx, 0], # Receiver estimated longitude
+                "Lat": RcvrLlh[Idx, 1], # Receiver estimated latitude
+                "Alt": RcvrLlh[Idx, 2], # Receiver estimated altitude
+                "Clk": 0.0,             # Receiver estimated clock
+                "Sol": 0,               # 0: No solution 1: PA Sol 2: NPA Sol
+                "NumSatVis": len(CorrInfo), # Number of visible satellites
+                "NumSatSol": int(NumSatSol[Idx]), # Number of visible satellites in solution
+                "Hpe": 0.0,             # HPE 
+                "Vpe": 0.0,             # VPE 
+                "Epe": 0.0,             # EPE
+                "Npe": 0.0,             # NPE 
+                "Hpl": 0.0,             # HPL
+                "Vpl": 0.0,             # VPL
+                "Hsi": 0.0,             # Horiontal Safety Index
+                "Vsi": 0.0,             # Vertical Safety Index
+                "Hdop": 0.0,            # HDOP
+                "Vdop": 0.0,            # VDOP
+                "Pdop": 0.0,            # PDOP
+                "Tdop": 0.0,            # TDOP
+        } # End of PosInfo
+
+        # DOPs are available if there are enough satellites
+        if Valid[Idx]:
+            PosInfo["Hdop"] = Hdop[Idx]
+            PosInfo["Vdop"] = Vdop[Idx]
+            PosInfo["Pdop"] = Pdop[Idx]
+            PosInfo["Tdop"] = Tdop[Idx]
+
+        # Solution, protection levels and safety indexes are available
+        # if PDOP is below the threshold
+        if Solve[Idx]:
+            PosInfo["Lon"] = Lon[Idx]
+            PosInfo["Lat"] = Lat[Idx]
+            PosInfo["Alt"] = Alt[Idx]
+            PosInfo["Clk"] = Clk[Idx]
+            PosInfo["Sol"] = Sol[Idx]
+            PosInfo["Hpe"] = Hpe[Idx]
+            PosInfo["Vpe"] = Vpe[Idx]
+            PosInfo["Epe"] = Epe[Idx]
+            PosInfo["Npe"] = Npe[Idx]
+            PosInfo["Hpl"] = Hpl[Idx]
+            PosInfo["Vpl"] = Vpl[Idx]
+            PosInfo["Hsi"] = Hsi[Idx]
+            PosInfo["Vsi"] = Vsi[Idx]
+
+        PosInfoList[Epoch] = PosInfo
+
+    # End of for Idx, Epoch in enumerate(Epochs):
+
+    return PosInfoList
+
+# End of computeSpvtSolutionBlock()